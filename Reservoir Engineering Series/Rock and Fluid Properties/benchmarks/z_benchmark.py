@@ -0,0 +1,287 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+from function.z_corellation_function.value import calc_z, calc_z_bracketed, instrument, _calc_Tr_and_Pr, _model_args, \
+    models, QUICKSTART_TRS, EXPLICIT_MODELS
+from function.z_corellation_function.zgrid import read_csv_grid
+
+"""
+Benchmark suite of the z-factor and pseudo-critical stack.
+
+Times calc_z for every zmodel/pmodel combination (scalar latency, batch throughput over the standard 16-Tr grid and
+over the high-Pr region, and the pseudo-critical step), and checks the accuracy of the z-models: the residual of the
+model equation at the returned z, and the deviation from the golden grid of the same z-model in benchmarks/golden/.
+The solvers of the implicit
+z-models (z-space Newton/Halley, reduced-density and bracketed) are compared for iteration count, retries, failures
+and non-physical roots. Results are written as JSON, and can be compared with the results of a previous release:
+
+    python benchmarks/z_benchmark.py --output bench.json
+    python benchmarks/z_benchmark.py --output bench_new.json --compare bench.json
+
+The comparison exits with status 1 if a timing is slower than the baseline by more than ``--time-tolerance``, or if
+a z-factor changed by more than ``--z-tolerance``.
+
+The golden grids are wide CSV files (see zgrid.read_csv_grid) whose comment lines record the z-model, the solver and
+the commit they were computed with. They are regenerated, deliberately, with:
+
+    python benchmarks/z_benchmark.py --write-golden
+
+The grids in output/ are not used: they match none of the z-models (z_factors_dak.csv holds values up to 9659.9).
+"""
+
+ZMODELS = ['DAK', 'hall_yarborough', 'londono', 'kareem', 'papay', 'beggs_brill']
+PMODELS = ['piper', 'sutton']
+SOLVERS = ['newton', 'density', 'bracketed']
+
+GOLDEN_GRIDS = {zmodel: 'benchmarks/golden/z_%s.csv' % zmodel for zmodel in ZMODELS}
+"""golden wide z-factor grid of each z-model (header row: Pr, first column: Tr)"""
+
+GOLDEN_Z_RANGE = (0, 5)
+"""golden z-factors outside of this range (or nan) are non-physical, and are not compared"""
+
+# scalar gas state of the calc_z docstring examples
+SCALAR_STATE = {'sg': 0.7, 'P': 2010, 'T': 75, 'H2S': 0.07, 'CO2': 0.1}
+
+
+def _timeit(func, repeat, number=1):
+    """best and median seconds per call over ``repeat`` rounds of ``number`` calls"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - start) / number)
+    return {'best': min(times), 'median': float(np.median(times))}
+
+
+def standard_grid(Pr_min=0.2, Pr_max=30):
+    """the standard z-factor chart: 16 isotherms, Pr in steps of 0.1"""
+    Prs = np.round(np.linspace(Pr_min, Pr_max, round((Pr_max - Pr_min) * 10) + 1), 1)
+    return np.meshgrid(Prs, QUICKSTART_TRS)
+
+
+def golden_grid():
+    """the grid of the golden files: the 16 isotherms of the standard chart, Pr in steps of 0.5"""
+    Pr_grid, Tr_grid = standard_grid()
+    return Pr_grid[:, ::5], Tr_grid[:, ::5]
+
+
+def read_golden_grid(path):
+    Pr, Tr, Z = read_csv_grid(os.path.join(ROOT, path))
+    Pr_grid, Tr_grid = np.meshgrid(Pr, Tr)
+    return Pr_grid, Tr_grid, Z
+
+
+def write_golden_grids():
+    """
+    Computes the golden grid of every z-model: with the bracketed solver for the implicit models, which does not
+    depend on the guesses of calc_z, and with the correlation itself for the explicit ones.
+    """
+    Pr_grid, Tr_grid = golden_grid()
+    for zmodel, path in GOLDEN_GRIDS.items():
+        if zmodel in EXPLICIT_MODELS:
+            Z = calc_z(Pr=Pr_grid, Tr=Tr_grid, zmodel=zmodel)
+            solver = 'calc_z (explicit correlation)'
+        else:
+            Z = calc_z_bracketed(Pr=Pr_grid, Tr=Tr_grid, zmodel=zmodel)['z']
+            solver = 'calc_z_bracketed (default newton_kwargs)'
+        lines = [
+            '# golden z-factors of zmodel=%r on the 16 isotherms of the standard chart, Pr = 0.2, 0.7, ..., 29.7'
+            % zmodel,
+            '# solver: %s, commit: %s' % (solver, _git_commit()),
+            '# regenerate with: python benchmarks/z_benchmark.py --write-golden',
+            ',' + ','.join(repr(float(Pr)) for Pr in Pr_grid[0]),
+        ]
+        lines += [','.join(repr(float(x)) for x in np.concatenate([[Tr], z])) for Tr, z in zip(Tr_grid[:, 0], Z)]
+        os.makedirs(os.path.dirname(os.path.join(ROOT, path)), exist_ok=True)
+        with open(os.path.join(ROOT, path), 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+
+
+def bench_timings(repeat):
+    results = {}
+    Pr_grid, Tr_grid = standard_grid()
+    Pr_high, Tr_high = standard_grid(15, 30)
+    rng = np.random.default_rng(0)
+    batch = {
+        'sg': rng.uniform(0.6, 0.9, Pr_grid.size),
+        'P': rng.uniform(100, 10000, Pr_grid.size),
+        'T': rng.uniform(60, 300, Pr_grid.size),
+        'H2S': rng.uniform(0, 0.1, Pr_grid.size),
+        'CO2': rng.uniform(0, 0.1, Pr_grid.size),
+    }
+
+    for pmodel in PMODELS:
+        results['pseudo_critical/%s/scalar' % pmodel] = _timeit(
+            lambda: _calc_Tr_and_Pr(pmodel=pmodel, **SCALAR_STATE), repeat, number=50)
+        results['pseudo_critical/%s/batch' % pmodel] = _timeit(
+            lambda: _calc_Tr_and_Pr(pmodel=pmodel, **batch), repeat)
+        results['pseudo_critical/%s/batch' % pmodel]['points'] = Pr_grid.size
+
+        for zmodel in ZMODELS:
+            key = 'calc_z/%s/%s' % (zmodel, pmodel)
+            results[key + '/scalar'] = _timeit(
+                lambda: calc_z(pmodel=pmodel, zmodel=zmodel, **SCALAR_STATE), repeat, number=20)
+            results[key + '/batch'] = _timeit(lambda: calc_z(pmodel=pmodel, zmodel=zmodel, **batch), repeat)
+            results[key + '/batch']['points'] = Pr_grid.size
+
+    for zmodel in ZMODELS:
+        for name, (Pr, Tr) in [('grid', (Pr_grid, Tr_grid)), ('high_Pr', (Pr_high, Tr_high))]:
+            key = 'calc_z/%s/%s' % (zmodel, name)
+            results[key] = _timeit(lambda: calc_z(Pr=Pr, Tr=Tr, zmodel=zmodel), repeat)
+            results[key]['points'] = Pr.size
+
+    for timing in results.values():
+        if 'points' in timing:
+            timing['points_per_second'] = timing['points'] / timing['best']
+    return results
+
+
+def bench_accuracy():
+    results = {}
+    Pr_grid, Tr_grid = standard_grid()
+
+    for zmodel in ZMODELS:
+        Z = calc_z(Pr=Pr_grid, Tr=Tr_grid, zmodel=zmodel)
+        entry = {'z_checksum': float(np.nansum(Z)), 'z_min': float(np.nanmin(Z)), 'z_max': float(np.nanmax(Z)),
+                 'nan_points': int(np.sum(np.isnan(Z)))}
+        if zmodel not in EXPLICIT_MODELS:
+            # accuracy of the root solve: residual of the model equation at the returned z
+            residual = models[zmodel](Z.ravel(), *_model_args(zmodel, Pr_grid.ravel(), Tr_grid.ravel()))
+            entry['max_residual'] = float(np.nanmax(np.abs(residual)))
+
+        # deviation from the golden grid of the same z-model, over its physical cells
+        Pr_golden, Tr_golden, Z_golden = read_golden_grid(GOLDEN_GRIDS[zmodel])
+        physical = (Z_golden > GOLDEN_Z_RANGE[0]) & (Z_golden <= GOLDEN_Z_RANGE[1])
+        error = np.abs(calc_z(Pr=Pr_golden[physical], Tr=Tr_golden[physical], zmodel=zmodel) - Z_golden[physical])
+        entry['golden'] = {'max_abs_error': float(np.nanmax(error)), 'mean_abs_error': float(np.nanmean(error)),
+                           'points': int(physical.sum()), 'masked_points': int((~physical).sum())}
+        results[zmodel] = entry
+    return results
+
+
+def bench_solvers():
+    """solver statistics of the implicit z-models over the standard grid, with and without the smart guess"""
+    results = {}
+    Pr_grid, Tr_grid = standard_grid()
+
+    for zmodel in ZMODELS:
+        if zmodel in EXPLICIT_MODELS:
+            continue
+        for guess_name, guess_kwargs in [('smart_guess', {}), ('constant_guess', {'smart_guess': False})]:
+            for solver in SOLVERS:
+                with instrument() as stats:
+                    start = time.perf_counter()
+                    try:
+                        Z = calc_z(Pr=Pr_grid, Tr=Tr_grid, zmodel=zmodel, solver=solver, **guess_kwargs)
+                    except RuntimeError:
+                        Z = None
+                    seconds = time.perf_counter() - start
+                counters = stats.to_dict()['models'][zmodel]
+                results['%s/%s/%s' % (zmodel, guess_name, solver)] = {
+                    'seconds': seconds,
+                    'mean_iterations': counters['mean_iterations'],
+                    'retries': counters['retries'],
+                    'fallback': counters['fallback'],
+                    'failed': counters['failed'],
+                    'negative_roots': None if Z is None else int(np.sum(Z < 0)),
+                }
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=ROOT, stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(repeat=5):
+    """runs the suite and returns the results as a dict"""
+    return {
+        'metadata': {
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'repeat': repeat,
+        },
+        'timings': bench_timings(repeat),
+        'accuracy': bench_accuracy(),
+        'solvers': bench_solvers(),
+    }
+
+
+def compare(results, baseline, time_tolerance=1.25, z_tolerance=1e-9):
+    """
+    Compares the results with a baseline. Returns a list of regressions: timings slower than ``time_tolerance`` times
+    the baseline, and z-factors (checksums and errors against the golden grids) that changed by more than
+    ``z_tolerance``.
+    """
+    regressions = []
+    for key, timing in results['timings'].items():
+        if key in baseline['timings']:
+            ratio = timing['best'] / baseline['timings'][key]['best']
+            if ratio > time_tolerance:
+                regressions.append('%s: %.2fx slower than the baseline' % (key, ratio))
+
+    for zmodel, entry in results['accuracy'].items():
+        base = baseline['accuracy'].get(zmodel, {})
+        for key in ['z_checksum', 'nan_points', 'golden']:
+            if key not in base:
+                continue
+            new, old = entry[key], base[key]
+            if isinstance(new, dict):
+                new, old = new['max_abs_error'], old['max_abs_error']
+            if abs(new - old) > z_tolerance:
+                regressions.append('%s %s: changed from %r to %r' % (zmodel, key, old, new))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks of the z-factor and pseudo-critical stack')
+    parser.add_argument('--output', help='JSON file to write the results to (default: print to stdout)')
+    parser.add_argument('--repeat', type=int, default=5, help='timing rounds per benchmark (default: 5)')
+    parser.add_argument('--compare', help='JSON results of a previous run to compare with')
+    parser.add_argument('--time-tolerance', type=float, default=1.25,
+                        help='slowdown ratio reported as a regression (default: 1.25)')
+    parser.add_argument('--z-tolerance', type=float, default=1e-9,
+                        help='change of z reported as a regression (default: 1e-9)')
+    parser.add_argument('--write-golden', action='store_true',
+                        help='regenerate the golden grids of benchmarks/golden/ and exit')
+    args = parser.parse_args(argv)
+
+    if args.write_golden:
+        write_golden_grids()
+        return 0
+
+    results = run(repeat=args.repeat)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.time_tolerance, args.z_tolerance)
+        for regression in regressions:
+            print('REGRESSION: %s' % regression, file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,230 @@
+import numpy as np
+
+"""
+Compositional pseudo-critical properties, from the full gas analysis instead of the specific gravity.
+
+The mole fractions of many samples are a matrix (samples x components). Every mixing rule is a set of mole-fraction
+weighted sums of pure component properties, so all of them are obtained with one matrix product of the composition
+matrix against a component property table (components x properties). The plus fraction (C7+) is characterized
+from its molecular weight and specific gravity with the Riazi-Daubert (1987) correlations, which gives one extra
+row of the table per sample when MW and SG differ between samples.
+
+Pure component properties: GPSA Engineering Data Book (1987), as tabulated by Ahmed, T.: "Reservoir Engineering
+Handbook," Gulf Professional Publishing (2006)
+
+Kay, W.B.: "Density of Hydrocarbon Gases and Vapors," Industrial & Engineering Chemistry (1936) 28, 1014-1019
+
+Stewart, W.F., Burkhardt, S.F., and Voo, D.: "Prediction of Pseudo-Critical Parameters for Mixtures," AIChE Meeting,
+Kansas City (1959)
+
+Riazi, M.R. and Daubert, T.E.: "Characterization Parameters for Petroleum Fractions," Industrial & Engineering
+Chemistry Research (1987) 26, 755-759
+
+Wichert, E. and Aziz, K.: "Calculate Z's for Sour Gases," Hydrocarbon Processing (1972) 51, 119-122
+"""
+
+AIR_MOLECULAR_WEIGHT = 28.97
+"""apparent molecular weight of air (lbm / lbmol)"""
+
+COMPONENT_PROPERTIES = {
+    # component: (critical temperature Tc (°R), critical pressure Pc (psia), molecular weight MW (lbm/lbmol))
+    'N2': (227.49, 493.1, 28.013),
+    'CO2': (547.91, 1071.0, 44.010),
+    'H2S': (672.45, 1300.0, 34.080),
+    'C1': (343.33, 666.4, 16.043),
+    'C2': (549.92, 706.5, 30.070),
+    'C3': (666.06, 616.0, 44.097),
+    'iC4': (734.46, 527.9, 58.123),
+    'nC4': (765.62, 550.6, 58.123),
+    'iC5': (829.10, 490.4, 72.150),
+    'nC5': (845.80, 488.6, 72.150),
+    'C6': (913.60, 436.9, 86.177),
+}
+"""critical properties of the pure components of a gas analysis. ``'C6'`` takes the properties of n-hexane"""
+
+PLUS_FRACTION = 'C7+'
+"""name of the plus fraction, characterized from its molecular weight and specific gravity"""
+
+COMPONENTS = ['N2', 'CO2', 'H2S', 'C1', 'C2', 'C3', 'iC4', 'nC4', 'iC5', 'nC5', 'C6', PLUS_FRACTION]
+"""default column order of a composition matrix"""
+
+MIXING_RULES = ['SBV', 'kay']
+
+# columns of the property table: the mole-fraction weighted sums needed by the mixing rules
+_TABLE_COLUMNS = ['Tc', 'Pc', 'MW', 'Tc/Pc', 'sqrt(Tc/Pc)', 'Tc/sqrt(Pc)']
+
+# Riazi-Daubert (1987) constants of theta = a * MW^b * SG^c * exp(d * MW + e * SG + f * MW * SG)
+_RIAZI_DAUBERT = {
+    'Tc': (544.4, 0.2998, 1.0555, -1.3478e-4, -0.61641, 0.0),
+    'Pc': (4.5203e4, -0.8063, 1.6015, -1.8078e-3, -0.3084, 0.0),
+}
+
+
+def _property_rows(Tc, Pc, MW):
+    """rows of the property table, in the order of _TABLE_COLUMNS"""
+    return np.stack([Tc, Pc, MW, Tc / Pc, np.sqrt(Tc / Pc), Tc / np.sqrt(Pc)], axis=-1)
+
+
+def characterize_plus_fraction(MW, SG):
+    """
+    Calculates the critical temperature and pressure of a plus fraction (C7+) from its molecular weight and
+    specific gravity, with the Riazi-Daubert (1987) correlations.
+
+    >>> characterize_plus_fraction(MW=100, SG=0.72)
+    (969.0198045825117, 435.65156067710944)
+
+    Parameters
+    ----------
+    MW : float or array_like
+        molecular weight of the plus fraction (lbm/lbmol)
+    SG : float or array_like
+        specific gravity of the plus fraction (water = 1)
+
+    Returns
+    -------
+    tuple
+        (Tc (°R), Pc (psia))
+    """
+    MW = np.asarray(MW, dtype=float)
+    SG = np.asarray(SG, dtype=float)
+    Tc, Pc = [a * MW ** b * SG ** c * np.exp(d * MW + e * SG + f * MW * SG)
+              for a, b, c, d, e, f in (_RIAZI_DAUBERT['Tc'], _RIAZI_DAUBERT['Pc'])]
+    if Tc.ndim == 0:
+        return float(Tc), float(Pc)
+    return Tc, Pc
+
+
+def property_table(components=None):
+    """
+    Component property table of the pure components: one row per component, with the columns Tc (°R), Pc (psia),
+    MW (lbm/lbmol), Tc/Pc, sqrt(Tc/Pc) and Tc/sqrt(Pc). The row of the plus fraction is ``nan``: it depends on the
+    sample, see :func:`characterize_plus_fraction`.
+    """
+    if components is None:
+        components = COMPONENTS
+    rows = []
+    for component in components:
+        if component == PLUS_FRACTION:
+            rows.append(np.full(len(_TABLE_COLUMNS), np.nan))
+        elif component in COMPONENT_PROPERTIES:
+            rows.append(_property_rows(*np.array(COMPONENT_PROPERTIES[component])))
+        else:
+            raise KeyError('Component "%s" is not implemented. Choose from the list of available components: %s' % (
+                component, list(COMPONENT_PROPERTIES) + [PLUS_FRACTION]))
+    return np.array(rows)
+
+
+def calc_pseudo_critical(composition, components=None, MW_plus=None, SG_plus=None, mixing='SBV', acid_correction=True,
+                         normalize=True):
+    """
+    Calculates the pseudo-critical properties of gas samples from their full compositions.
+
+    **Basic usage**
+
+    >>> composition = np.array([
+    ...     # N2,  CO2,  H2S,  C1,   C2,   C3,   iC4,  nC4,  iC5,  nC5,  C6,   C7+
+    ...     [0.01, 0.02, 0.00, 0.85, 0.06, 0.03, 0.01, 0.01, 0.005, 0.003, 0.001, 0.001],
+    ...     [0.02, 0.10, 0.07, 0.70, 0.06, 0.03, 0.01, 0.005, 0.002, 0.002, 0.001, 0.0],
+    ... ])
+    >>> props = calc_pseudo_critical(composition, MW_plus=110, SG_plus=0.75)
+    >>> props['Tpc_corrected'], props['Ppc_corrected']
+    (array([382.51248438, 392.22091786]), array([671.05675777, 697.89287741]))
+
+    Parameters
+    ----------
+    composition : array_like
+        mole fractions, shape (n_samples, n_components), or (n_components,) for a single sample
+    components : list of str
+        components of the columns of ``composition``. Defaults to ``COMPONENTS``: ``['N2', 'CO2', 'H2S', 'C1',
+        'C2', 'C3', 'iC4', 'nC4', 'iC5', 'nC5', 'C6', 'C7+']``
+    MW_plus : float or array_like
+        molecular weight of the plus fraction (lbm/lbmol), one for all samples or one per sample. Required if
+        ``'C7+'`` is one of the components
+    SG_plus : float or array_like
+        specific gravity of the plus fraction (water = 1), one for all samples or one per sample. Required if
+        ``'C7+'`` is one of the components
+    mixing : str
+        mixing rule. ``'SBV'`` (default): Stewart-Burkhardt-Voo, ``'kay'``: Kay's rule (mole-fraction average of
+        the critical properties)
+    acid_correction : bool
+        ``True`` (default) to correct the pseudo-critical properties for H2S and CO2 with the Wichert-Aziz method
+    normalize : bool
+        ``True`` (default) to normalize every sample to a total of 1, e.g. for analyses in mol% or that don't add
+        up exactly. ``False`` raises a ValueError for samples whose total is not 1
+
+    Returns
+    -------
+    dict
+        arrays of shape (n_samples,), or floats for a single sample:
+
+        ``'Tpc'``, ``'Ppc'``: pseudo-critical temperature (°R) and pressure (psia) of the mixing rule
+
+        ``'J'``, ``'K'``: SBV parameters (°R/psia, °R/psia^0.5), only with ``mixing='SBV'``
+
+        ``'e_correction'``: Wichert-Aziz temperature correction (°R), 0 if ``acid_correction=False``
+
+        ``'Tpc_corrected'``, ``'Ppc_corrected'``: corrected pseudo-critical temperature (°R) and pressure (psia)
+
+        ``'MW'``: apparent molecular weight (lbm/lbmol), ``'sg'``: gas specific gravity (air = 1)
+    """
+    if components is None:
+        components = COMPONENTS
+    if mixing not in MIXING_RULES:
+        raise KeyError('Mixing rule "%s" is not implemented. Choose from: %s' % (mixing, MIXING_RULES))
+
+    X = np.asarray(composition, dtype=float)
+    single = X.ndim == 1
+    X = np.atleast_2d(X)
+    if X.ndim != 2 or X.shape[1] != len(components):
+        raise ValueError("composition has shape %s, expected (n_samples, %d) for the components %s" % (
+            np.shape(composition), len(components), list(components)))
+
+    total = X.sum(axis=1, keepdims=True)
+    if normalize:
+        X = X / total
+    elif not np.allclose(total, 1, atol=1e-6):
+        raise ValueError("the mole fractions of %d out of %d samples don't add up to 1" % (
+            np.sum(~np.isclose(total, 1, atol=1e-6)), X.shape[0]))
+
+    # mole-fraction weighted sums of the table columns: one matrix product, plus the per-sample plus fraction
+    table = property_table(components)
+    pure = np.array([component != PLUS_FRACTION for component in components])
+    sums = X[:, pure] @ table[pure]
+    if not pure.all():
+        if MW_plus is None or SG_plus is None:
+            raise TypeError("Missing required arguments, MW_plus and SG_plus (molecular weight and specific gravity "
+                            "of the %s fraction)" % PLUS_FRACTION)
+        MW_plus = np.broadcast_to(np.asarray(MW_plus, dtype=float), (X.shape[0],))
+        Tc_plus, Pc_plus = characterize_plus_fraction(MW_plus, SG_plus)
+        sums += X[:, ~pure] * _property_rows(np.broadcast_to(Tc_plus, MW_plus.shape),
+                                             np.broadcast_to(Pc_plus, MW_plus.shape), MW_plus)
+    Tc_sum, Pc_sum, MW, Tc_Pc_sum, sqrt_Tc_Pc_sum, Tc_sqrt_Pc_sum = sums.T
+
+    props = {}
+    if mixing == 'SBV':
+        J = Tc_Pc_sum / 3 + 2 / 3 * sqrt_Tc_Pc_sum ** 2
+        K = Tc_sqrt_Pc_sum
+        props['Tpc'] = K ** 2 / J
+        props['Ppc'] = props['Tpc'] / J
+        props['J'] = J
+        props['K'] = K
+    else:
+        props['Tpc'] = Tc_sum
+        props['Ppc'] = Pc_sum
+
+    # Wichert-Aziz correction for H2S (B) and CO2 + H2S (A)
+    if acid_correction:
+        B = X[:, list(components).index('H2S')] if 'H2S' in components else np.zeros(X.shape[0])
+        A = B + (X[:, list(components).index('CO2')] if 'CO2' in components else 0)
+        e_correction = 120 * (A ** 0.9 - A ** 1.6) + 15 * (B ** 0.5 - B ** 4)
+    else:
+        B = e_correction = np.zeros(X.shape[0])
+    props['e_correction'] = e_correction
+    props['Tpc_corrected'] = props['Tpc'] - e_correction
+    props['Ppc_corrected'] = props['Ppc'] * props['Tpc_corrected'] / (props['Tpc'] + B * (1 - B) * e_correction)
+    props['MW'] = MW
+    props['sg'] = MW / AIR_MOLECULAR_WEIGHT
+
+    if single:
+        return {key: float(value[0]) for key, value in props.items()}
+    return props
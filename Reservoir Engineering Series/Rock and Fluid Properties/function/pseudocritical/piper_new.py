@@ -97,7 +97,7 @@ class Piper(object):
         """
 
 
-        self._set_first_caller_attributes(inspect.stack()[0][3], locals())
+        self._set_first_caller_attributes('calc_J', locals())
         self._initialize_sg(sg)
         self._initialize_H2S(H2S)
         self._initialize_CO2(CO2)
@@ -132,7 +132,7 @@ class Piper(object):
             SBV parameter, K, (°R/psia^0.5)
         """
 
-        self._set_first_caller_attributes(inspect.stack()[0][3], locals())
+        self._set_first_caller_attributes('calc_K', locals())
         self._initialize_sg(sg)
         self._initialize_H2S(H2S)
         self._initialize_CO2(CO2)
@@ -173,7 +173,7 @@ class Piper(object):
         float
             pseudo-critical temperature, Tpc (°R)
         """
-        self._set_first_caller_attributes(inspect.stack()[0][3], locals())
+        self._set_first_caller_attributes('calc_Tpc', locals())
         self._initialize_J(J, sg=sg, H2S=H2S, CO2=CO2, N2=N2, ignore_conflict=ignore_conflict)
         self._initialize_K(K, sg=sg, H2S=H2S, CO2=CO2, N2=N2, ignore_conflict=ignore_conflict)
         self.Tpc = self.K ** 2 / self.J
@@ -209,7 +209,7 @@ class Piper(object):
             pseudo-critical pressure, Ppc (psia)
         """
 
-        self._set_first_caller_attributes(inspect.stack()[0][3], locals())
+        self._set_first_caller_attributes('calc_Ppc', locals())
 
         if Tpc is not None:
             if K is not None:
@@ -252,7 +252,7 @@ class Piper(object):
             pseudo-reduced temperature, Tr (dimensionless)
 
         """
-        self._set_first_caller_attributes(inspect.stack()[0][3], locals())
+        self._set_first_caller_attributes('calc_Tr', locals())
         self._initialize_T(T)
         self._initialize_Tpc(Tpc, sg=sg, H2S=H2S, CO2=CO2, N2=N2, J=J, K=K, ignore_conflict=ignore_conflict)
         self.Tr = self.T / self.Tpc
@@ -289,7 +289,7 @@ class Piper(object):
             pseudo-reduced pressure, Pr (dimensionless)
         """
 
-        self._set_first_caller_attributes(inspect.stack()[0][3], locals())
+        self._set_first_caller_attributes('calc_Pr', locals())
         self._initialize_P(P)
         self._initialize_Ppc(Ppc, sg=sg, H2S=H2S, CO2=CO2, N2=N2, J=J, K=K, Tpc=Tpc, ignore_conflict=ignore_conflict)
         self.Pr = self.P / self.Ppc
@@ -298,7 +298,7 @@ class Piper(object):
 
     """This function is used by z_helper.py's calc_z function to check redundant arguments for Pr and Tr"""
     def _initialize_Tr_and_Pr(self, sg=None, P=None, T=None, Tpc=None, Ppc=None, H2S=None, CO2=None, N2=None, Tr=None, Pr=None, J=None, K=None, ignore_conflict=False):
-        self._set_first_caller_attributes(inspect.stack()[0][3], locals())
+        self._set_first_caller_attributes('_initialize_Tr_and_Pr', locals())
         self._initialize_Tr(Tr, T=T, sg=sg, Tpc=Tpc, H2S=H2S, CO2=CO2, N2=N2, J=J, K=K, ignore_conflict=ignore_conflict)
         self._initialize_Pr(Pr, P=P, sg=sg, Tpc=Tpc, Ppc=Ppc, H2S=H2S, CO2=CO2, N2=N2, J=J, K=K, ignore_conflict=ignore_conflict)
         return self.Tr, self.Pr
@@ -443,4 +443,69 @@ class Piper(object):
         else:
             if ignore_conflict is False:
                 self._check_conflicting_arguments(self.calc_Tr, 'Tr')
-            self.Tr = Tr
\ No newline at end of file
+            self.Tr = Tr
+
+# mole-fraction coefficients of the SBV parameters J and K, from the critical properties of the Piper class
+_J_H2S = 0.45820 * 672.3 / 1306
+_J_CO2 = 0.90348 * 547.5 / 1071
+_J_N2 = 0.66026 * 227.16 / 492.4
+_K_H2S = 0.06534 * 672.3 / np.sqrt(1306)
+_K_CO2 = 0.42113 * 547.5 / np.sqrt(1071)
+_K_N2 = 0.91249 * 227.16 / np.sqrt(492.4)
+
+
+def piper_critical(sg, H2S=None, CO2=None, N2=None):
+    """
+    Calculates the composition-level properties of Piper's method: the SBV parameters J and K and the
+    pseudo-critical temperature and pressure. They don't depend on the gas pressure and temperature, so they can be
+    computed once per gas analysis (see :func:`piper_reduced`).
+
+    Returns
+    -------
+    dict
+        ``'Tpc'`` (°R), ``'Ppc'`` (psia), ``'J'`` (°R/psia), ``'K'`` (°R/psia^0.5)
+    """
+    H2S = 0 if H2S is None else H2S
+    CO2 = 0 if CO2 is None else CO2
+    N2 = 0 if N2 is None else N2
+
+    J = 0.11582 - _J_H2S * H2S - _J_CO2 * CO2 - _J_N2 * N2 + 0.70729 * sg - 0.099397 * sg ** 2
+    K = 3.8216 - _K_H2S * H2S - _K_CO2 * CO2 - _K_N2 * N2 + 17.438 * sg - 3.2191 * sg ** 2
+    Tpc = K ** 2 / J
+    return {'Tpc': Tpc, 'Ppc': Tpc / J, 'J': J, 'K': K}
+
+
+def piper_reduced(sg, P, T, H2S=None, CO2=None, N2=None):
+    """
+    Calculates the pseudo-critical and pseudo-reduced properties with Piper's method, as a stateless function.
+
+    Same equations as the :class:`Piper` class, without its argument-conflict checks and per-call bookkeeping, so it
+    is much cheaper per call. Inputs can be floats or NumPy arrays of broadcastable shapes.
+
+    >>> piper_reduced(sg=0.7, P=2010, T=75, H2S=0.07, CO2=0.1)['Pr']
+    2.707010666487009
+
+    Parameters
+    ----------
+    sg : float or ndarray
+        specific gravity of gas (dimensionless)
+    P : float or ndarray
+        pressure of gas (psig)
+    T : float or ndarray
+        temperature of gas (°F)
+    H2S : float or ndarray
+        mole fraction of H2S (dimensionless)
+    CO2 : float or ndarray
+        mole fraction of CO2 (dimensionless)
+    N2 : float or ndarray
+        mole fraction of N2 (dimensionless)
+
+    Returns
+    -------
+    dict
+        same keys as :attr:`Piper.ps_props`: ``'Tpc'``, ``'Ppc'``, ``'J'``, ``'K'``, ``'Tr'``, ``'Pr'``
+    """
+    ps_props = piper_critical(sg, H2S=H2S, CO2=CO2, N2=N2)
+    ps_props['Tr'] = calc_Fahrenheit_to_Rankine(T) / ps_props['Tpc']
+    ps_props['Pr'] = calc_psig_to_psia(P) / ps_props['Ppc']
+    return ps_props
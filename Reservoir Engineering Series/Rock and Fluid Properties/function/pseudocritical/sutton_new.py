@@ -98,7 +98,7 @@ class Sutton():
         float
             pseudo-critical temperature, Tpc (°R)
         """
-        self._set_first_caller_attributes(inspect.stack()[0][3], locals())
+        self._set_first_caller_attributes('calc_Tpc', locals())
         self._initialize_sg(sg)
         self.Tpc = 169.2 + 349.5 * self.sg - 74.0 * self.sg ** 2
         self.ps_props['Tpc'] = self.Tpc
@@ -118,7 +118,7 @@ class Sutton():
         float
             pseudo-critical pressure, Ppc (psia)
         """
-        self._set_first_caller_attributes(inspect.stack()[0][3], locals())
+        self._set_first_caller_attributes('calc_Ppc', locals())
         self._initialize_sg(sg)
         self.Ppc = 756.8 - 131.07 * self.sg - 3.6 * self.sg ** 2
         self.ps_props['Ppc'] = self.Ppc
@@ -140,7 +140,7 @@ class Sutton():
         float
             temperature-correction factor for acid gases, ε (°R)
         """
-        self._set_first_caller_attributes(inspect.stack()[0][3], locals())
+        self._set_first_caller_attributes('calc_e_correction', locals())
         self._initialize_A(A=None, H2S=H2S, CO2=CO2)
         self._initialize_B(B=None, H2S=H2S)
         self.e_correction = 120 * (self.A ** 0.9 - self.A ** 1.6) + 15 * (self.B ** 0.5 - self.B ** 4)
@@ -172,7 +172,7 @@ class Sutton():
             corrected pseudo-critical temperature, T'pc (°R)
 
         """
-        self._set_first_caller_attributes(inspect.stack()[0][3], locals())
+        self._set_first_caller_attributes('calc_Tpc_corrected', locals())
         self._initialize_Tpc(Tpc, sg=sg, ignore_conflict=ignore_conflict)
 
         # Correction is not needed if no sour gas is present
@@ -214,7 +214,7 @@ class Sutton():
         float
             corrected pseudo-critical pressure, P'pc (psia)
         """
-        self._set_first_caller_attributes(inspect.stack()[0][3], locals())
+        self._set_first_caller_attributes('calc_Ppc_corrected', locals())
         self._initialize_Ppc(Ppc, sg=sg, ignore_conflict=ignore_conflict)
 
         # Correction is not needed if no sour gas is present
@@ -259,7 +259,7 @@ class Sutton():
         float
             pseudo-reduced temperature, Tr (dimensionless)
         """
-        self._set_first_caller_attributes(inspect.stack()[0][3], locals())
+        self._set_first_caller_attributes('calc_Tr', locals())
         self._initialize_T(T)
         self._initialize_Tpc_corrected(Tpc_corrected, sg=sg, Tpc=Tpc, e_correction=e_correction, H2S=H2S, CO2=CO2, ignore_conflict=ignore_conflict)
         self.Tr = self.T / self.Tpc_corrected
@@ -299,7 +299,7 @@ class Sutton():
         float
             pseudo-reduced pressure, Pr (dimensionless)
         """
-        self._set_first_caller_attributes(inspect.stack()[0][3], locals())
+        self._set_first_caller_attributes('calc_Pr', locals())
         self._initialize_P(P)
         self._initialize_Ppc_corrected(Ppc_corrected, sg=sg, Tpc=Tpc, Ppc=Ppc, e_correction=e_correction, Tpc_corrected=Tpc_corrected, H2S=H2S, CO2=CO2, ignore_conflict=ignore_conflict)
         self.Pr = self.P / self.Ppc_corrected
@@ -309,7 +309,7 @@ class Sutton():
     """This function is used by z_helper.py's calc_z function to check redundant arguments for Pr and Tr"""
     def _initialize_Tr_and_Pr(self, sg=None, P=None, T=None, Tpc=None, Ppc=None, Tpc_corrected=None, Ppc_corrected=None,
                H2S=None, CO2=None, Tr=None, Pr=None, e_correction=None, ignore_conflict=False):
-        self._set_first_caller_attributes(inspect.stack()[0][3], locals())
+        self._set_first_caller_attributes('_initialize_Tr_and_Pr', locals())
         self._initialize_Tr(Tr, T, Tpc_corrected=Tpc_corrected, sg=sg, Tpc=Tpc, e_correction=e_correction, H2S=H2S,
                             CO2=CO2, ignore_conflict=ignore_conflict)
         self._initialize_Pr(Pr, P=P, Ppc_corrected=Ppc_corrected, sg=sg, Tpc=Tpc, Ppc=Ppc, e_correction=e_correction,
@@ -479,3 +479,66 @@ class Sutton():
 
 
 
+
+
+def sutton_critical(sg, H2S=None, CO2=None):
+    """
+    Calculates the composition-level properties of Sutton's method: the pseudo-critical temperature and pressure
+    and their Wichert-Aziz corrections. They don't depend on the gas pressure and temperature, so they can be
+    computed once per gas analysis (see :func:`sutton_reduced`).
+
+    Returns
+    -------
+    dict
+        ``'Tpc'``, ``'Ppc'``, ``'e_correction'``, ``'Tpc_corrected'``, ``'Ppc_corrected'``. ``'e_correction'`` is
+        ``None`` if neither H2S nor CO2 is given
+    """
+    Tpc = 169.2 + 349.5 * sg - 74.0 * sg ** 2
+    Ppc = 756.8 - 131.07 * sg - 3.6 * sg ** 2
+
+    # Correction is not needed if no sour gas is present
+    if H2S is None and CO2 is None:
+        return {'Tpc': Tpc, 'Ppc': Ppc, 'e_correction': None, 'Tpc_corrected': Tpc, 'Ppc_corrected': Ppc}
+
+    B = 0 if H2S is None else H2S
+    A = B + (0 if CO2 is None else CO2)
+    e_correction = 120 * (A ** 0.9 - A ** 1.6) + 15 * (B ** 0.5 - B ** 4)
+    Tpc_corrected = Tpc - e_correction
+    Ppc_corrected = (Ppc * Tpc_corrected) / (Tpc - B * (1 - B) * e_correction)
+    return {'Tpc': Tpc, 'Ppc': Ppc, 'e_correction': e_correction, 'Tpc_corrected': Tpc_corrected,
+            'Ppc_corrected': Ppc_corrected}
+
+
+def sutton_reduced(sg, P, T, H2S=None, CO2=None):
+    """
+    Calculates the pseudo-critical and pseudo-reduced properties with Sutton's method, as a stateless function.
+
+    Same equations as the :class:`Sutton` class, without its argument-conflict checks and per-call bookkeeping, so
+    it is much cheaper per call. Inputs can be floats or NumPy arrays of broadcastable shapes.
+
+    >>> sutton_reduced(sg=0.7, P=2010, T=75, H2S=0.07, CO2=0.1)['Pr']
+    3.222944757210385
+
+    Parameters
+    ----------
+    sg : float or ndarray
+        specific gravity of gas (dimensionless)
+    P : float or ndarray
+        pressure of gas (psig)
+    T : float or ndarray
+        temperature of gas (°F)
+    H2S : float or ndarray
+        mole fraction of H2S (dimensionless)
+    CO2 : float or ndarray
+        mole fraction of CO2 (dimensionless)
+
+    Returns
+    -------
+    dict
+        same keys as :attr:`Sutton.ps_props`: ``'Tpc'``, ``'Ppc'``, ``'e_correction'``, ``'Tpc_corrected'``,
+        ``'Ppc_corrected'``, ``'Tr'``, ``'Pr'``. ``'e_correction'`` is ``None`` if neither H2S nor CO2 is given
+    """
+    ps_props = sutton_critical(sg, H2S=H2S, CO2=CO2)
+    ps_props['Tr'] = calc_Fahrenheit_to_Rankine(T) / ps_props['Tpc_corrected']
+    ps_props['Pr'] = calc_psig_to_psia(P) / ps_props['Ppc_corrected']
+    return ps_props
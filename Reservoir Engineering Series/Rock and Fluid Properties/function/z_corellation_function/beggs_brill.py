@@ -0,0 +1,30 @@
+import numpy as np
+
+"""
+Beggs, H.D. and Brill, J.P.: "A Study of Two-Phase Flow in Inclined Pipes," Journal of Petroleum Technology (May 1973)
+607-617
+
+Explicit fit of the Standing-Katz chart, as given by Standing (1981). Accurate for 1.2 < Tr < 2, and breaks down
+above Tr = 2 at high pressures.
+"""
+
+
+def beggs_brill(Pr: float, Tr: float) -> float:
+    """
+    Calculates the z-factor using the Beggs and Brill (1973) explicit correlation.
+
+    Parameters:
+    Pr (float): Reduced pressure.
+    Tr (float): Reduced temperature.
+
+    Returns:
+    float: The calculated z-factor.
+    """
+    A = 1.39 * (Tr - 0.92) ** 0.5 - 0.36 * Tr - 0.101
+    E = 9 * (Tr - 1)
+    B = (0.62 - 0.23 * Tr) * Pr + (0.066 / (Tr - 0.86) - 0.037) * Pr ** 2 + 0.32 * Pr ** 6 / 10 ** E
+    C = 0.132 - 0.32 * np.log10(Tr)
+    F = 0.3106 - 0.49 * Tr + 0.1824 * Tr ** 2
+    D = 10 ** F
+
+    return A + (1 - A) * np.exp(-B) + C * Pr ** D
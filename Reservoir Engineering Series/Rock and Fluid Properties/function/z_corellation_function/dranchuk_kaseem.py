@@ -9,7 +9,37 @@ https://onepetro.org/JCPT/article-abstract/doi/10.2118/75-03-03
 """
 
 
-def DAK(z: float, Pr: float, Tr: float) -> float:
+def DAK_coefficients(Tr: float) -> np.ndarray:
+    """
+    Calculates the temperature-only coefficients of the DAK equation. They are the same for every pressure of
+    an isotherm, so they can be computed once and passed to the residual and its derivatives with ``coeffs``.
+
+    The residual and its derivatives only see the constants through ``coeffs``, so they evaluate any equation of
+    the DAK form, e.g. the londono equation with londono_coefficients(Tr).
+
+    Parameters:
+    Tr (float): Reduced temperature.
+
+    Returns:
+    np.ndarray: The coefficients (c1, c2, c3, c4, 0.27 / Tr, A11), stacked along the last axis.
+    """
+    # Constants
+    A1, A2, A3, A4, A5 = 0.3265, -1.0700, -0.5339, 0.01569, -0.05165
+    A6, A7, A8, A9, A10, A11 = 0.5475, -0.7361, 0.1844, 0.1056, 0.6134, 0.7210
+
+    Tr_inv = 1 / np.asarray(Tr, dtype=float)
+    Tr_inv_sq = Tr_inv ** 2
+    Tr_inv_cu = Tr_inv_sq * Tr_inv
+
+    c1 = A1 + A2 * Tr_inv + Tr_inv_cu * (A3 + Tr_inv * (A4 + A5 * Tr_inv))
+    c2 = A6 + A7 * Tr_inv + A8 * Tr_inv_sq
+    c3 = -A9 * (A7 * Tr_inv + A8 * Tr_inv_sq)
+    c4 = A10 * Tr_inv_cu
+
+    return np.stack([c1, c2, c3, c4, 0.27 * Tr_inv, np.full(Tr_inv.shape, A11)], axis=-1)
+
+
+def DAK(z: float, Pr: float, Tr: float, coeffs: np.ndarray = None) -> float:
     """
     Calculates the compressibility factor (z-factor) for natural gases
     using the Dranchuk-Abou-Kassem equation of state.
@@ -18,33 +48,154 @@ def DAK(z: float, Pr: float, Tr: float) -> float:
     z (float): Initial estimate of z-factor.
     Pr (float): Reduced pressure.
     Tr (float): Reduced temperature.
+    coeffs (np.ndarray): Optional output of DAK_coefficients(Tr), to skip the temperature-only terms.
 
     Returns:
     float: The calculated z-factor.
     """
-    # Constants
-    A1, A2, A3, A4, A5 = 0.3265, -1.0700, -0.5339, 0.01569, -0.05165
-    A6, A7, A8, A9, A10, A11 = 0.5475, -0.7361, 0.1844, 0.1056, 0.6134, 0.7210
+    if coeffs is None:
+        coeffs = DAK_coefficients(Tr)
+    c1, c2, c3, c4, c5, A11 = coeffs.T
 
     #expression components
-    Pr_Tr = (0.27 * Pr) / (z * Tr)
-    Tr_inv = 1 / Tr
+    Pr_Tr = c5 * Pr / z
     Pr_Tr_sq = Pr_Tr ** 2
-    Pr_Tr_5 = Pr_Tr ** 5
     exp_term = np.exp(-A11 * Pr_Tr_sq)
 
-    # Calculating
-    term1 = (A1 + A2 * Tr_inv + A3 * Tr_inv**3 + A4 * Tr_inv**4 + A5 * Tr_inv**5) * Pr_Tr
-    term2 = (A6 + A7 * Tr_inv + A8 * Tr_inv**2) * Pr_Tr_sq
-    term3 = -A9 * (A7 * Tr_inv + A8 * Tr_inv**2) * Pr_Tr_5
-    term4 = A10 * (1 + A11 * Pr_Tr_sq) * (Pr_Tr_sq / Tr**3) * exp_term
+    # Calculating (Horner form of term1 + term2 + term3)
+    poly = Pr_Tr * (c1 + Pr_Tr * (c2 + c3 * Pr_Tr_sq * Pr_Tr))
+    term4 = c4 * (1 + A11 * Pr_Tr_sq) * Pr_Tr_sq * exp_term
 
     #result
-    result = 1 + term1 + term2 + term3 + term4 - z
+    result = 1 + poly + term4 - z
 
     return result
 
 
+def _DAK_rho_derivatives(Pr_Tr: float, coeffs: np.ndarray, exp_term: float = None) -> tuple:
+    """
+    First and second derivatives of the right-hand side of the DAK equation with respect to the reduced
+    density, rho_r = 0.27 * Pr / (z * Tr). ``coeffs`` is the output of DAK_coefficients(Tr), and ``exp_term`` the
+    already computed c4 * exp(-A11 * rho_r**2), if any.
+    """
+    c1, c2, c3, c4, _, A11 = coeffs.T
+
+    Pr_Tr_sq = Pr_Tr ** 2
+    Pr_Tr_cu = Pr_Tr_sq * Pr_Tr
+    if exp_term is None:
+        exp_term = c4 * np.exp(-A11 * Pr_Tr_sq)
+
+    d1 = c1 + 2 * c2 * Pr_Tr + 5 * c3 * Pr_Tr_cu * Pr_Tr + \
+        exp_term * (2 * Pr_Tr + 2 * A11 * Pr_Tr_cu - 2 * A11**2 * Pr_Tr_cu * Pr_Tr_sq)
+    d2 = 2 * c2 + 20 * c3 * Pr_Tr_cu + \
+        exp_term * (2 + 2 * A11 * Pr_Tr_sq - 14 * A11**2 * Pr_Tr_sq**2 + 4 * A11**3 * Pr_Tr_cu**2)
+
+    return d1, d2
+
+
+def DAK_fprime(z: float, Pr: float, Tr: float, coeffs: np.ndarray = None) -> float:
+    """
+    Calculates the first derivative of the DAK residual with respect to z.
+
+    Parameters:
+    z (float): Estimate of z-factor.
+    Pr (float): Reduced pressure.
+    Tr (float): Reduced temperature.
+    coeffs (np.ndarray): Optional output of DAK_coefficients(Tr).
+
+    Returns:
+    float: d(residual)/dz.
+    """
+    if coeffs is None:
+        coeffs = DAK_coefficients(Tr)
+    Pr_Tr = coeffs.T[4] * Pr / z
+    d1, _ = _DAK_rho_derivatives(Pr_Tr, coeffs)
+
+    # d(rho_r)/dz = -rho_r / z
+    return -d1 * Pr_Tr / z - 1
+
+
+def DAK_fprime2(z: float, Pr: float, Tr: float, coeffs: np.ndarray = None) -> float:
+    """
+    Calculates the second derivative of the DAK residual with respect to z.
+
+    Parameters:
+    z (float): Estimate of z-factor.
+    Pr (float): Reduced pressure.
+    Tr (float): Reduced temperature.
+    coeffs (np.ndarray): Optional output of DAK_coefficients(Tr).
+
+    Returns:
+    float: d2(residual)/dz2.
+    """
+    if coeffs is None:
+        coeffs = DAK_coefficients(Tr)
+    Pr_Tr = coeffs.T[4] * Pr / z
+    d1, d2 = _DAK_rho_derivatives(Pr_Tr, coeffs)
+
+    # d2(rho_r)/dz2 = 2 * rho_r / z**2
+    return d2 * (Pr_Tr / z) ** 2 + 2 * d1 * Pr_Tr / z ** 2
+
+
+def DAK_with_derivatives(z: float, Pr: float, Tr: float, coeffs: np.ndarray = None) -> tuple:
+    """
+    Calculates the DAK residual and its first and second derivatives with respect to z in one pass, sharing the
+    reduced density and the exponential term between them.
+
+    Parameters:
+    z (float): Estimate of z-factor.
+    Pr (float): Reduced pressure.
+    Tr (float): Reduced temperature.
+    coeffs (np.ndarray): Optional output of DAK_coefficients(Tr).
+
+    Returns:
+    tuple: (residual, d(residual)/dz, d2(residual)/dz2).
+    """
+    if coeffs is None:
+        coeffs = DAK_coefficients(Tr)
+    c1, c2, c3, c4, c5, A11 = coeffs.T
+
+    Pr_Tr = c5 * Pr / z
+    Pr_Tr_sq = Pr_Tr ** 2
+    exp_term = c4 * np.exp(-A11 * Pr_Tr_sq)
+
+    poly = Pr_Tr * (c1 + Pr_Tr * (c2 + c3 * Pr_Tr_sq * Pr_Tr))
+    result = 1 + poly + (1 + A11 * Pr_Tr_sq) * Pr_Tr_sq * exp_term - z
+
+    d1, d2 = _DAK_rho_derivatives(Pr_Tr, coeffs, exp_term)
+    Pr_Tr_z = Pr_Tr / z
+
+    return result, -d1 * Pr_Tr_z - 1, d2 * Pr_Tr_z ** 2 + 2 * d1 * Pr_Tr_z / z
+
+
+def DAK_rho_with_derivatives(rho_r: float, Pr: float, Tr: float, coeffs: np.ndarray = None) -> tuple:
+    """
+    Calculates the DAK equation written in reduced density, rho_r * z(rho_r) - 0.27 * Pr / Tr, where z(rho_r) is the
+    right-hand side of the DAK equation, and its first and second derivatives with respect to rho_r in one pass.
+    Unlike the residual in z, it is a smooth polynomial-exponential function of the unknown.
+
+    Parameters:
+    rho_r (float): Estimate of the reduced density, 0.27 * Pr / (z * Tr).
+    Pr (float): Reduced pressure.
+    Tr (float): Reduced temperature.
+    coeffs (np.ndarray): Optional output of DAK_coefficients(Tr).
+
+    Returns:
+    tuple: (residual, d(residual)/d(rho_r), d2(residual)/d(rho_r)2).
+    """
+    if coeffs is None:
+        coeffs = DAK_coefficients(Tr)
+    c1, c2, c3, c4, c5, A11 = coeffs.T
+
+    rho_r_sq = rho_r ** 2
+    exp_term = c4 * np.exp(-A11 * rho_r_sq)
+    z = 1 + rho_r * (c1 + rho_r * (c2 + c3 * rho_r_sq * rho_r)) + (1 + A11 * rho_r_sq) * rho_r_sq * exp_term
+
+    d1, d2 = _DAK_rho_derivatives(rho_r, coeffs, exp_term)
+
+    # d(rho_r * z)/d(rho_r) = z + rho_r * z', d2(rho_r * z)/d(rho_r)2 = 2 * z' + rho_r * z''
+    return rho_r * z - c5 * Pr, z + rho_r * d1, 2 * d1 + rho_r * d2
+
 # Example usage (for testing purposes)
 # if __name__ == "__main__":
 #     z_initial = 0.9
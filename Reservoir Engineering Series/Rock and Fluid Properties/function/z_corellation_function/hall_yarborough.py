@@ -6,7 +6,30 @@ https://www.researchgate.net/publication/284299884_A_new_equation_of_state_for_Z
 """
 
 
-def hall_yarborough(z: float, Pr: float, Tr: float) -> float:
+def hall_yarborough_coefficients(Tr: float) -> np.ndarray:
+    """
+    Calculates the temperature-only coefficients A1..A4 of the Hall-Yarborough equation. They are the same for every
+    pressure of an isotherm, so they can be computed once and passed to the residual and its derivatives with
+    ``coeffs``.
+
+    Parameters:
+    Tr (float): Reduced temperature.
+
+    Returns:
+    np.ndarray: The coefficients (A1, A2, A3, A4), stacked along the last axis.
+    """
+    t = 1 / np.asarray(Tr, dtype=float)
+
+    # Coefficients based on reduced temperature
+    A1 = 0.06125 * t * np.exp(-1.2 * (1 - t) ** 2)
+    A2 = t * (14.76 + t * (-9.76 + 4.58 * t))
+    A3 = t * (90.7 + t * (-242.2 + 42.4 * t))
+    A4 = 2.18 + 2.82 * t
+
+    return np.stack([A1, A2, A3, A4], axis=-1)
+
+
+def hall_yarborough(z: float, Pr: float, Tr: float, coeffs: np.ndarray = None) -> float:
     """
     Calculates the Z-factor using the Hall-Yarborough equation of state.
 
@@ -14,30 +37,165 @@ def hall_yarborough(z: float, Pr: float, Tr: float) -> float:
     z (float): Initial estimate of Z-factor.
     Pr (float): Reduced pressure.
     Tr (float): Reduced temperature.
+    coeffs (np.ndarray): Optional output of hall_yarborough_coefficients(Tr), to skip the temperature-only terms.
 
     Returns:
     float: The calculated Z-factor.
     """
+    if coeffs is None:
+        coeffs = hall_yarborough_coefficients(Tr)
+    A1, A2, A3, A4 = coeffs.T
 
-    t = 1 / Tr
-
-    # Coefficients based on reduced temperature
-    A1 = 0.06125 * t * np.exp(-1.2 * (1 - t) ** 2)
-    A2 = 14.76 * t - 9.76 * t ** 2 + 4.58 * t ** 3
-    A3 = 90.7 * t - 242.2 * t ** 2 + 42.4 * t ** 3
-    A4 = 2.18 + 2.82 * t
     #component
-    A1_Pr_z = (A1 * Pr) / z
+    A1_Pr = A1 * Pr
+    A1_Pr_z = A1_Pr / z
+    A1_Pr_z_sq = A1_Pr_z ** 2
     # calculation terms
-    term1 = -A1 * Pr
-    term2 = (A1_Pr_z + A1_Pr_z ** 2 + A1_Pr_z ** 3 - A1_Pr_z ** 4) / (1 - A1_Pr_z) ** 3
-    term3 = -A2 * A1_Pr_z ** 2
+    term1 = -A1_Pr
+    term2 = (A1_Pr_z + A1_Pr_z_sq + A1_Pr_z_sq * (A1_Pr_z - A1_Pr_z_sq)) / (1 - A1_Pr_z) ** 3
+    term3 = -A2 * A1_Pr_z_sq
     term4 = A3 * A1_Pr_z ** A4
     # Return
     result = term1 + term2 + term3 + term4
 
     return result
 
+
+def _hall_yarborough_y_derivatives(y: float, coeffs: np.ndarray, y_pow: float = None) -> tuple:
+    """
+    First and second derivatives of the Hall-Yarborough equation with respect to the reduced density,
+    y = A1 * Pr / z. ``coeffs`` is the output of hall_yarborough_coefficients(Tr), and ``y_pow`` the already
+    computed A3 * A4 * y**(A4 - 2), if any.
+    """
+    _, A2, A3, A4 = coeffs.T
+
+    if y_pow is None:
+        y_pow = A3 * A4 * y ** (A4 - 2)
+
+    d1 = (1 + 4 * y + 4 * y ** 2 - 4 * y ** 3 + y ** 4) / (1 - y) ** 4 - 2 * A2 * y + y_pow * y
+    d2 = (8 + 20 * y - 4 * y ** 2) / (1 - y) ** 5 - 2 * A2 + y_pow * (A4 - 1)
+
+    return d1, d2
+
+
+def hall_yarborough_fprime(z: float, Pr: float, Tr: float, coeffs: np.ndarray = None) -> float:
+    """
+    Calculates the first derivative of the Hall-Yarborough residual with respect to z.
+
+    Parameters:
+    z (float): Estimate of Z-factor.
+    Pr (float): Reduced pressure.
+    Tr (float): Reduced temperature.
+    coeffs (np.ndarray): Optional output of hall_yarborough_coefficients(Tr).
+
+    Returns:
+    float: d(residual)/dz.
+    """
+    if coeffs is None:
+        coeffs = hall_yarborough_coefficients(Tr)
+    A1_Pr_z = coeffs.T[0] * Pr / z
+    d1, _ = _hall_yarborough_y_derivatives(A1_Pr_z, coeffs)
+
+    # dy/dz = -y / z
+    return -d1 * A1_Pr_z / z
+
+
+def hall_yarborough_fprime2(z: float, Pr: float, Tr: float, coeffs: np.ndarray = None) -> float:
+    """
+    Calculates the second derivative of the Hall-Yarborough residual with respect to z.
+
+    Parameters:
+    z (float): Estimate of Z-factor.
+    Pr (float): Reduced pressure.
+    Tr (float): Reduced temperature.
+    coeffs (np.ndarray): Optional output of hall_yarborough_coefficients(Tr).
+
+    Returns:
+    float: d2(residual)/dz2.
+    """
+    if coeffs is None:
+        coeffs = hall_yarborough_coefficients(Tr)
+    A1_Pr_z = coeffs.T[0] * Pr / z
+    d1, d2 = _hall_yarborough_y_derivatives(A1_Pr_z, coeffs)
+
+    # d2y/dz2 = 2 * y / z**2
+    return d2 * (A1_Pr_z / z) ** 2 + 2 * d1 * A1_Pr_z / z ** 2
+
+
+def hall_yarborough_with_derivatives(z: float, Pr: float, Tr: float, coeffs: np.ndarray = None) -> tuple:
+    """
+    Calculates the Hall-Yarborough residual and its first and second derivatives with respect to z in one pass,
+    sharing the reduced density and the y**A4 power term between them.
+
+    Parameters:
+    z (float): Estimate of Z-factor.
+    Pr (float): Reduced pressure.
+    Tr (float): Reduced temperature.
+    coeffs (np.ndarray): Optional output of hall_yarborough_coefficients(Tr).
+
+    Returns:
+    tuple: (residual, d(residual)/dz, d2(residual)/dz2).
+    """
+    if coeffs is None:
+        coeffs = hall_yarborough_coefficients(Tr)
+    A1, A2, A3, A4 = coeffs.T
+
+    A1_Pr = A1 * Pr
+    y = A1_Pr / z
+    y_sq = y ** 2
+    y_pow = A3 * A4 * y ** (A4 - 2)
+
+    result = -A1_Pr + (y + y_sq + y_sq * (y - y_sq)) / (1 - y) ** 3 - A2 * y_sq + y_pow * y_sq / A4
+
+    d1, d2 = _hall_yarborough_y_derivatives(y, coeffs, y_pow)
+    y_z = y / z
+
+    return result, -d1 * y_z, d2 * y_z ** 2 + 2 * d1 * y_z / z
+
+
+def hall_yarborough_y_with_derivatives(y: float, Pr: float, Tr: float, coeffs: np.ndarray = None) -> tuple:
+    """
+    Calculates the Hall-Yarborough equation in its native form, with the reduced density y = A1 * Pr / z as the
+    unknown, and its first and second derivatives with respect to y in one pass.
+
+    Parameters:
+    y (float): Estimate of the reduced density.
+    Pr (float): Reduced pressure.
+    Tr (float): Reduced temperature.
+    coeffs (np.ndarray): Optional output of hall_yarborough_coefficients(Tr).
+
+    Returns:
+    tuple: (residual, d(residual)/dy, d2(residual)/dy2).
+    """
+    if coeffs is None:
+        coeffs = hall_yarborough_coefficients(Tr)
+    A1, A2, A3, A4 = coeffs.T
+
+    y_sq = y ** 2
+    y_pow = A3 * A4 * y ** (A4 - 2)
+
+    result = -A1 * Pr + (y + y_sq + y_sq * (y - y_sq)) / (1 - y) ** 3 - A2 * y_sq + y_pow * y_sq / A4
+
+    d1, d2 = _hall_yarborough_y_derivatives(y, coeffs, y_pow)
+
+    return result, d1, d2
+
+
+def hall_yarborough_z_lower_bound(Pr: float, Tr: float) -> float:
+    """
+    Smallest physical z-factor of the Hall-Yarborough equation: the reduced density y = A1 * Pr / z must stay
+    below 1.
+
+    Parameters:
+    Pr (float): Reduced pressure.
+    Tr (float): Reduced temperature.
+
+    Returns:
+    float: The lower bound of the z-factor.
+    """
+    return hall_yarborough_coefficients(Tr).T[0] * Pr
+
+
 # Example usage (for testing purposes)
 # if __name__ == "__main__":
 #     z_initial = 0.9
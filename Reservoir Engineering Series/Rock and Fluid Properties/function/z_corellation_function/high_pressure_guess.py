@@ -0,0 +1,109 @@
+import numpy as np
+
+"""
+Initial-guess model for the implicit z-models above the working range of the explicit "kareem" smart guess (Pr > 15).
+
+In that region z is almost linear in Pr along every isotherm, z ~ intercept(Tr) + slope(Tr) * Pr. The coefficients
+below were fitted by least squares to the DAK and Londono solutions over 15 <= Pr <= 30, on isotherms 1.0 <= Tr <= 3.0
+spaced by 0.05, and are linearly interpolated in Tr. The guess is within ~0.03 of the DAK/Londono roots in that box.
+
+The table is versioned: regenerate it with build_high_pressure_guess_table() and bump HIGH_PR_GUESS_VERSION whenever
+the z-models or the fitting box change.
+"""
+
+HIGH_PR_GUESS_VERSION = '1.0'
+
+HIGH_PR_GUESS_PR_MIN = 15
+
+# Tr, intercept, slope
+HIGH_PR_GUESS_TABLE = np.array([
+    [1.00, 0.303940, 0.10006899],
+    [1.05, 0.319239, 0.09613043],
+    [1.10, 0.334193, 0.09244964],
+    [1.15, 0.348960, 0.08900326],
+    [1.20, 0.363667, 0.08576943],
+    [1.25, 0.378421, 0.08272812],
+    [1.30, 0.393298, 0.07986122],
+    [1.35, 0.408354, 0.07715259],
+    [1.40, 0.423623, 0.07458798],
+    [1.45, 0.439118, 0.07215490],
+    [1.50, 0.454833, 0.06984254],
+    [1.55, 0.470748, 0.06764158],
+    [1.60, 0.486829, 0.06554404],
+    [1.65, 0.503030, 0.06354313],
+    [1.70, 0.519296, 0.06163309],
+    [1.75, 0.535565, 0.05980903],
+    [1.80, 0.551773, 0.05806677],
+    [1.85, 0.567852, 0.05640268],
+    [1.90, 0.583739, 0.05481357],
+    [1.95, 0.599369, 0.05329658],
+    [2.00, 0.614685, 0.05184906],
+    [2.05, 0.629635, 0.05046850],
+    [2.10, 0.644174, 0.04915246],
+    [2.15, 0.658263, 0.04789854],
+    [2.20, 0.671873, 0.04670437],
+    [2.25, 0.684979, 0.04556753],
+    [2.30, 0.697567, 0.04448562],
+    [2.35, 0.709625, 0.04345621],
+    [2.40, 0.721150, 0.04247689],
+    [2.45, 0.732144, 0.04154523],
+    [2.50, 0.742612, 0.04065886],
+    [2.55, 0.752564, 0.03981541],
+    [2.60, 0.762012, 0.03901258],
+    [2.65, 0.770971, 0.03824814],
+    [2.70, 0.779458, 0.03751990],
+    [2.75, 0.787492, 0.03682579],
+    [2.80, 0.795090, 0.03616380],
+    [2.85, 0.802274, 0.03553201],
+    [2.90, 0.809063, 0.03492861],
+    [2.95, 0.815476, 0.03435188],
+    [3.00, 0.821534, 0.03380018],
+])
+
+
+def high_pressure_guess(Pr, Tr):
+    """
+    Initial guess of the z-factor for Pr > 15, from the per-isotherm linear fits of HIGH_PR_GUESS_TABLE.
+
+    Parameters:
+    Pr (float or ndarray): Reduced pressure.
+    Tr (float or ndarray): Reduced temperature. Values outside of the table are clipped to its Tr range.
+
+    Returns:
+    float or ndarray: The initial guess of the z-factor.
+    """
+    Trs, intercepts, slopes = HIGH_PR_GUESS_TABLE.T
+    intercept = np.interp(Tr, Trs, intercepts)
+    slope = np.interp(Tr, Trs, slopes)
+    return intercept + slope * Pr
+
+
+def build_high_pressure_guess_table(Trs=None, Prs=None, zmodels=('DAK', 'londono')):
+    """
+    Refits the rows of HIGH_PR_GUESS_TABLE from the solutions of the given z-models. Used to regenerate the table
+    stored in this module.
+
+    Parameters:
+    Trs (ndarray): Reduced temperatures of the fitted isotherms. Defaults to 1.0, 1.05, ..., 3.0.
+    Prs (ndarray): Reduced pressures used in the fit. Defaults to 151 points over 15 <= Pr <= 30.
+    zmodels (tuple): Names of the z-models whose solutions are fitted together.
+
+    Returns:
+    ndarray: Rows of (Tr, intercept, slope).
+    """
+    from function.z_corellation_function.value import calc_z  # deferred: value.py imports this module
+
+    if Trs is None:
+        Trs = np.round(np.arange(1.0, 3.0001, 0.05), 2)
+    if Prs is None:
+        Prs = np.linspace(HIGH_PR_GUESS_PR_MIN, 30, 151)
+
+    Pr_grid, Tr_grid = np.meshgrid(Prs, Trs)
+    Zs = np.concatenate([calc_z(Pr=Pr_grid, Tr=Tr_grid, zmodel=zmodel) for zmodel in zmodels], axis=1)
+    Pr_fit = np.tile(Pr_grid, (1, len(zmodels)))
+
+    table = np.empty((len(Trs), 3))
+    for k, Tr in enumerate(Trs):
+        slope, intercept = np.polyfit(Pr_fit[k], Zs[k], 1)
+        table[k] = Tr, intercept, slope
+    return table
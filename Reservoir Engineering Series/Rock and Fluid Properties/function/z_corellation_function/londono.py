@@ -1,4 +1,7 @@
 import numpy as np
+import sys
+sys.path.append("Reservoir Engineering Series/Rock and Fluid Properties")
+from function.z_corellation_function.dranchuk_kaseem import DAK, DAK_fprime, DAK_fprime2
 
 """
 Londono, F.E., Archer, R.A., and Blasingame, T.A.: 
@@ -9,39 +12,87 @@ https://onepetro.org/SPEGTS/proceedings/02GTS/All-02GTS/SPE-75721-MS/135705
 """
 
 
-def londono(z: float, Pr: float, Tr: float) -> float:
+def londono_coefficients(Tr: float) -> np.ndarray:
     """
-    Calculates the z-factor using the Londono et al. (2005) equation of state.
+    Calculates the temperature-only coefficients of the londono equation. They are the same for every pressure of
+    an isotherm, so they can be computed once and passed to the residual and its derivatives with ``coeffs``.
+
+    Parameters:
+    Tr (float): Reduced temperature.
+
+    Returns:
+    np.ndarray: The coefficients (c1, c2, c3, c4, 0.27 / Tr, A11), stacked along the last axis.
+    """
+    # Constants
+    A1, A2, A3, A4, A5 = 0.3024696, -1.046964, -0.1078916, -0.7694186, 0.1965439
+    A6, A7, A8, A9, A10, A11 = 0.6527819, -1.118884, 0.3951957, 0.09313593, 0.8483081, 0.7880011
+
+    Tr_inv = 1 / np.asarray(Tr, dtype=float)
+    Tr_inv_sq = Tr_inv ** 2
+    Tr_inv_cu = Tr_inv_sq * Tr_inv
+
+    c1 = A1 + A2 * Tr_inv + Tr_inv_cu * (A3 + Tr_inv * (A4 + A5 * Tr_inv))
+    c2 = A6 + A7 * Tr_inv + A8 * Tr_inv_sq
+    c3 = -A9 * (A7 * Tr_inv + A8 * Tr_inv_sq)
+    c4 = A10 * Tr_inv_cu
+
+    return np.stack([c1, c2, c3, c4, 0.27 * Tr_inv, np.full(Tr_inv.shape, A11)], axis=-1)
+
+
+def londono(z: float, Pr: float, Tr: float, coeffs: np.ndarray = None) -> float:
+    """
+    Calculates the compressibility factor (z-factor) for natural gases
+    using the Londono et al. (2005) equation of state.
 
     Parameters:
     z (float): Initial estimate of z-factor.
     Pr (float): Reduced pressure.
     Tr (float): Reduced temperature.
+    coeffs (np.ndarray): Optional output of londono_coefficients(Tr), to skip the temperature-only terms.
 
     Returns:
     float: The calculated z-factor.
     """
-    
-    # Constants from the Londono et al. equation
-    A1, A2, A3, A4, A5 = 0.3024696, -1.046964, -0.1078916, -0.7694186, 0.1965439
-    A6, A7, A8, A9, A10, A11 = 0.6527819, -1.118884, 0.3951957, 0.09313593, 0.8483081, 0.7880011
+    # the londono equation has the DAK form: only the coefficients differ
+    if coeffs is None:
+        coeffs = londono_coefficients(Tr)
+    return DAK(z, Pr, Tr, coeffs)
 
-    # Reusable components
-    Pr_Tr = (0.27 * Pr) / (z * Tr)
-    Pr_Tr_sq = Pr_Tr ** 2
-    Pr_Tr_5 = Pr_Tr ** 5
-    exp_term = np.exp(-A11 * Pr_Tr_sq)
 
-    # Calculating terms
-    term1 = (A1 + A2 / Tr + A3 / Tr ** 3 + A4 / Tr ** 4 + A5 / Tr ** 5) * Pr_Tr
-    term2 = (A6 + A7 / Tr + A8 / Tr ** 2) * Pr_Tr_sq
-    term3 = -A9 * (A7 / Tr + A8 / Tr ** 2) * Pr_Tr_5
-    term4 = A10 * (1 + A11 * Pr_Tr_sq) * (Pr_Tr_sq / Tr ** 3) * exp_term
+def londono_fprime(z: float, Pr: float, Tr: float, coeffs: np.ndarray = None) -> float:
+    """
+    Calculates the first derivative of the londono residual with respect to z.
+
+    Parameters:
+    z (float): Estimate of z-factor.
+    Pr (float): Reduced pressure.
+    Tr (float): Reduced temperature.
+    coeffs (np.ndarray): Optional output of londono_coefficients(Tr).
+
+    Returns:
+    float: d(residual)/dz.
+    """
+    if coeffs is None:
+        coeffs = londono_coefficients(Tr)
+    return DAK_fprime(z, Pr, Tr, coeffs)
 
-    # Final z-factor calculation
-    result = 1 + term1 + term2 + term3 + term4 - z
 
-    return result
+def londono_fprime2(z: float, Pr: float, Tr: float, coeffs: np.ndarray = None) -> float:
+    """
+    Calculates the second derivative of the londono residual with respect to z.
+
+    Parameters:
+    z (float): Estimate of z-factor.
+    Pr (float): Reduced pressure.
+    Tr (float): Reduced temperature.
+    coeffs (np.ndarray): Optional output of londono_coefficients(Tr).
+
+    Returns:
+    float: d2(residual)/dz2.
+    """
+    if coeffs is None:
+        coeffs = londono_coefficients(Tr)
+    return DAK_fprime2(z, Pr, Tr, coeffs)
 
 
 # Example usage (for testing purposes)
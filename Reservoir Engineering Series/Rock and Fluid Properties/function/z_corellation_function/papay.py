@@ -0,0 +1,23 @@
+import numpy as np
+
+"""
+Papay, J.: "A Termelestechnologiai Parameterek Valtozasa a Gazlelepk Muvelese Soran," OGIL MUSZ, Tud. Kuzl.,
+Budapest (1968) 267-273
+
+Explicit two-term approximation of the Standing-Katz chart. The cheapest of the z-models, accurate at moderate
+pressures (Pr < 4) and temperatures (Tr > 1.5).
+"""
+
+
+def papay(Pr: float, Tr: float) -> float:
+    """
+    Calculates the z-factor using the Papay (1968) explicit correlation.
+
+    Parameters:
+    Pr (float): Reduced pressure.
+    Tr (float): Reduced temperature.
+
+    Returns:
+    float: The calculated z-factor.
+    """
+    return 1 - 3.52 * Pr / 10 ** (0.9813 * Tr) + 0.274 * Pr ** 2 / 10 ** (0.8157 * Tr)
@@ -1,14 +1,27 @@
 from scipy import optimize
+from contextlib import contextmanager
+from functools import partial
+import json
+import time
 import numpy as np
 import matplotlib.pyplot as plt
 import sys
 sys.path.append("Reservoir Engineering Series\Rock and Fluid Properties")
-from function.pseudocritical.piper import Piper
-from function.pseudocritical.sutton import Sutton
-from function.z_corellation_function.dranchuk_kaseem import DAK
-from function.z_corellation_function.hall_yarborough import hall_yarborough
-from function.z_corellation_function.londono import londono
+from function.pseudocritical.piper_new import Piper, piper_reduced
+from function.pseudocritical.sutton_new import Sutton, sutton_reduced
+from function.pseudocritical.compositional import calc_pseudo_critical
+from function.z_corellation_function.dranchuk_kaseem import DAK, DAK_fprime, DAK_fprime2, DAK_coefficients, \
+    DAK_with_derivatives, DAK_rho_with_derivatives
+from function.z_corellation_function.hall_yarborough import hall_yarborough, hall_yarborough_fprime, hall_yarborough_fprime2, \
+    hall_yarborough_z_lower_bound, hall_yarborough_coefficients, hall_yarborough_with_derivatives, \
+    hall_yarborough_y_with_derivatives
+from function.z_corellation_function.londono import londono, londono_fprime, londono_fprime2, londono_coefficients
 from function.z_corellation_function.kareem import kareem
+from function.z_corellation_function.papay import papay
+from function.z_corellation_function.beggs_brill import beggs_brill
+from function.z_corellation_function.high_pressure_guess import high_pressure_guess, HIGH_PR_GUESS_PR_MIN
+from function.z_corellation_function.zresult import make_z_result
+from utilities import calc_Fahrenheit_to_Rankine, calc_psig_to_psia
 
 
 
@@ -17,6 +30,30 @@ models = {
     'hall_yarborough': hall_yarborough,
     'londono': londono,
     'kareem': kareem,
+    'papay': papay,
+    'beggs_brill': beggs_brill,
+}
+# explicit models: z is computed directly, without iterations or solver arguments
+EXPLICIT_MODELS = ['kareem', 'papay', 'beggs_brill']
+# analytic first and second derivatives (w.r.t. z) of the implicit models, used for Newton/Halley iterations
+MODEL_DERIVATIVES = {
+    'DAK': {'fprime': DAK_fprime, 'fprime2': DAK_fprime2},
+    'hall_yarborough': {'fprime': hall_yarborough_fprime, 'fprime2': hall_yarborough_fprime2},
+    'londono': {'fprime': londono_fprime, 'fprime2': londono_fprime2},
+}
+# temperature-only coefficients of the implicit models, computed once per isotherm and passed as the ``coeffs`` arg
+MODEL_COEFFICIENTS = {
+    'DAK': DAK_coefficients,
+    'hall_yarborough': hall_yarborough_coefficients,
+    'londono': londono_coefficients,
+}
+# reduced-density form of the implicit models, used by calc_z(solver='density'): (residual with its first and second
+# derivatives w.r.t. the density, index in ``coeffs`` of the factor k of the density k * Pr / z, physical upper bound
+# of the density). londono has the DAK form, with its own coefficients
+MODEL_DENSITY_FORMS = {
+    'DAK': (DAK_rho_with_derivatives, 4, np.inf),
+    'hall_yarborough': (hall_yarborough_y_with_derivatives, 0, 1.0),
+    'londono': (DAK_rho_with_derivatives, 4, np.inf),
 }
 MODEL_RANGES = {
     'DAK': {
@@ -35,22 +72,264 @@ MODEL_RANGES = {
         'Tr': (1, 3),
         'Pr': (0.2, 15)
     },
+    'papay': {
+        'Tr': (1.2, 3),
+        'Pr': (0.2, 15)
+    },
+    'beggs_brill': {
+        'Tr': (1.2, 2.4),
+        'Pr': (0.2, 15)
+    },
 }
+# fast-approximation tier of calc_z(zmodel='DAK', accuracy='fast'): explicit models, from the cheapest to the most
+# expensive per point
+FAST_MODELS = ['papay', 'beggs_brill', 'kareem']
+# accuracy envelopes of the fast models: maximum absolute deviation from 'DAK' in every (Tr, Pr) cell of the band
+# edges below, measured on a 30 x 50 grid per cell and rounded up to 2 significant digits
+FAST_PR_EDGES = np.array([0.2, 0.5, 1, 2, 3, 4, 6, 8, 10, 15])
+FAST_TR_EDGES = np.array([1.05, 1.1, 1.2, 1.3, 1.5, 1.7, 2, 2.5, 3])
+ACCURACY_ENVELOPES = {
+    'papay': np.array([
+        [0.016, 0.13, 0.33, 0.18, 0.27, 0.4, 0.4, 0.33, 3],
+        [0.0061, 0.065, 0.22, 0.18, 0.2, 0.31, 0.31, 0.37, 2.8],
+        [0.0077, 0.017, 0.095, 0.096, 0.08, 0.17, 0.17, 0.37, 2.4],
+        [0.0078, 0.0079, 0.04, 0.046, 0.031, 0.072, 0.11, 0.37, 2],
+        [0.0063, 0.0068, 0.0066, 0.016, 0.016, 0.033, 0.12, 0.33, 1.5],
+        [0.0032, 0.0035, 0.0031, 0.0091, 0.014, 0.033, 0.1, 0.24, 0.97],
+        [0.00094, 0.0016, 0.003, 0.005, 0.012, 0.027, 0.046, 0.12, 0.48],
+        [0.00086, 0.0014, 0.0063, 0.015, 0.026, 0.054, 0.084, 0.12, 0.17],
+    ]),
+    'beggs_brill': np.array([
+        [0.0073, 0.01, 0.065, 0.057, 0.052, 0.047, 0.032, 0.023, 0.12],
+        [0.0079, 0.013, 0.037, 0.038, 0.022, 0.017, 0.012, 0.022, 0.084],
+        [0.0076, 0.012, 0.024, 0.024, 0.02, 0.015, 0.015, 0.014, 0.029],
+        [0.0064, 0.0073, 0.02, 0.021, 0.011, 0.013, 0.014, 0.011, 0.032],
+        [0.0046, 0.0047, 0.0045, 0.0062, 0.014, 0.022, 0.022, 0.02, 0.033],
+        [0.0038, 0.006, 0.0082, 0.0082, 0.014, 0.024, 0.025, 0.023, 0.035],
+        [0.0029, 0.0062, 0.012, 0.014, 0.014, 0.029, 0.056, 0.079, 0.11],
+        [0.0056, 0.0056, 0.15, 0.54, 1.4, 4.7, 12, 23, 76],
+    ]),
+    'kareem': np.array([
+        [0.0029, 0.014, 0.16, 0.047, 0.047, 0.039, 0.02, 0.012, 0.027],
+        [0.0038, 0.015, 0.068, 0.043, 0.033, 0.03, 0.016, 0.0095, 0.02],
+        [0.0042, 0.012, 0.017, 0.014, 0.0054, 0.0058, 0.0056, 0.0056, 0.011],
+        [0.0043, 0.0055, 0.017, 0.015, 0.0081, 0.0089, 0.0088, 0.0068, 0.0037],
+        [0.004, 0.004, 0.011, 0.012, 0.0083, 0.0083, 0.0084, 0.0071, 0.0055],
+        [0.0031, 0.0031, 0.005, 0.0069, 0.0068, 0.004, 0.0056, 0.0057, 0.0054],
+        [0.0018, 0.0018, 0.002, 0.0033, 0.0034, 0.0032, 0.0021, 0.0021, 0.007],
+        [0.00053, 0.00051, 0.0013, 0.0014, 0.0014, 0.002, 0.002, 0.0017, 0.007],
+    ]),
+}
+# envelopes stacked in the order of FAST_MODELS, for the per-point model selection
+_FAST_ENVELOPES = np.stack([ACCURACY_ENVELOPES[zmodel] for zmodel in FAST_MODELS])
 
 
-def _check_working_Pr_Tr_range(Pr, Tr, zmodel_str):
-    Pr_is_in_range = np.logical_and(Pr >= MODEL_RANGES[zmodel_str]['Pr'][0], Pr <= MODEL_RANGES[zmodel_str]['Pr'][1]).all()
-    Tr_is_in_range = np.logical_and(Tr >= MODEL_RANGES[zmodel_str]['Tr'][0], Tr <= MODEL_RANGES[zmodel_str]['Tr'][1]).all()
+# (Pr_min, Pr_max, Tr_min, Tr_max) of every z-model, flattened once from MODEL_RANGES for the range checks
+_MODEL_BOUNDS = {
+    zmodel: ranges['Pr'] + ranges['Tr'] for zmodel, ranges in MODEL_RANGES.items()
+}
 
-    #print(Pr >= MODEL_RANGES[zmodel_str]['Pr'][0], Pr <= MODEL_RANGES[zmodel_str]['Pr'][1])
 
-    return Pr_is_in_range and Tr_is_in_range
+def _check_working_Pr_Tr_range(Pr, Tr, zmodel_str):
+    Pr_min, Pr_max, Tr_min, Tr_max = _MODEL_BOUNDS[zmodel_str]
+    if np.ndim(Pr) == 0 and np.ndim(Tr) == 0:
+        return bool(Pr_min <= Pr <= Pr_max and Tr_min <= Tr <= Tr_max)
+    return bool(_in_model_range(Pr, Tr, zmodel_str).all())
 
 
-zmodels_ks = '["DAK", "hall_yarborough", "londono", "kareem"]'
+zmodels_ks = '["DAK", "hall_yarborough", "londono", "kareem", "papay", "beggs_brill"]'
 pmodels_ks = '["sutton", "piper"]'
 
 
+def _in_model_range(Pr, Tr, zmodel_str):
+    """elementwise counterpart of _check_working_Pr_Tr_range"""
+    Pr_min, Pr_max, Tr_min, Tr_max = _MODEL_BOUNDS[zmodel_str]
+    return (Pr >= Pr_min) & (Pr <= Pr_max) & (Tr >= Tr_min) & (Tr <= Tr_max)
+
+
+def count_out_of_range(Pr, Tr, zmodels=None):
+    """
+    Counts the (Pr, Tr) points outside of the working range (``MODEL_RANGES``) of each z-model, i.e. the points
+    whose z-factor is extrapolated.
+
+    >>> gc.count_out_of_range(Pr=np.array([1.5, 18.0, 25.0]), Tr=1.5)
+    {'DAK': 0, 'hall_yarborough': 1, 'londono': 0, 'kareem': 2, 'papay': 2, 'beggs_brill': 2}
+
+    Parameters
+    ----------
+    Pr : float or array_like
+        pseudo-reduced pressure, Pr (dimensionless)
+    Tr : float or array_like
+        pseudo-reduced temperature, Tr (dimensionless)
+    zmodels : list of str
+        z-models to check. Defaults to all of them
+
+    Returns
+    -------
+    dict
+        number of out-of-range points, by z-model
+    """
+    if zmodels is None:
+        zmodels = list(models)
+    Pr, Tr = np.broadcast_arrays(np.asarray(Pr, dtype=float), np.asarray(Tr, dtype=float))
+    counts = {}
+    for zmodel in zmodels:
+        _get_z_model(model=zmodel)
+        counts[zmodel] = int(Pr.size - np.count_nonzero(_in_model_range(Pr, Tr, zmodel)))
+    return counts
+
+
+class ZSolverStats(object):
+    """
+    Counters and timers of the z-factor solvers, collected per z-model and per (Pr, Tr) region while
+    :func:`instrument` is active.
+
+    **Basic usage**
+
+    >>> with gc.instrument() as stats:
+    ...     gc.calc_z(Pr=np.linspace(0.2, 30, 300), Tr=1.3)
+    >>> stats.to_dict()['models']['DAK']['mean_iterations']
+    2.683333333333333
+    >>> stats.to_json('z_solver_stats.json')
+
+    Parameters
+    ----------
+    Pr_edges : tuple
+        :math:`P_r` bin edges of the regions. The regions extend to 0 and infinity
+    Tr_edges : tuple
+        :math:`T_r` bin edges of the regions. The regions extend to 0 and infinity
+    """
+
+    COUNTERS = ('points', 'iterations', 'smart_guess', 'out_of_range', 'extrapolated', 'retries', 'fallback',
+                'failed')
+    """
+    points: points solved. iterations: Newton/Halley iterations, summed over all guesses tried.
+    smart_guess: points started from the explicit 'kareem' guess. out_of_range: points outside the working range of
+    'kareem' (no smart guess). extrapolated: points outside the working range of the solved z-model itself.
+    retries: points whose first guess failed. fallback: points that reached the fallback guesses. failed: points that
+    did not converge.
+    """
+
+    def __init__(self, Pr_edges=(1, 3, 8, 15), Tr_edges=(1.2, 1.5, 2)):
+        self.Pr_edges = np.asarray(Pr_edges, dtype=float)
+        self.Tr_edges = np.asarray(Tr_edges, dtype=float)
+        self.reset()
+
+    def __repr__(self):
+        return '<ZSolverStats: %s>' % self.to_dict()['models']
+
+    def reset(self):
+        """clears all counters and timers"""
+        self._counts = {}
+        self._calls = {}
+        self._times = {}
+
+    @property
+    def _n_regions(self):
+        return (self.Pr_edges.size + 1) * (self.Tr_edges.size + 1)
+
+    def _region_labels(self):
+        def bins(edges):
+            bounds = [0] + ['%g' % edge for edge in edges] + ['inf']
+            return ['[%s, %s)' % (lo, hi) for lo, hi in zip(bounds[:-1], bounds[1:])]
+        return ['Pr%s Tr%s' % (Pr_bin, Tr_bin) for Pr_bin in bins(self.Pr_edges) for Tr_bin in bins(self.Tr_edges)]
+
+    def record(self, zmodel, Pr, Tr, seconds=0.0, **counters):
+        """
+        Adds a solver call. ``counters`` are per-point arrays (or scalars) of the ``COUNTERS``; ``points`` is
+        counted automatically.
+        """
+        Pr = np.ravel(Pr)
+        Tr = np.ravel(Tr)
+        region = np.searchsorted(self.Pr_edges, Pr, side='right') * (self.Tr_edges.size + 1) + \
+            np.searchsorted(self.Tr_edges, Tr, side='right')
+
+        table = self._counts.setdefault(zmodel, np.zeros((len(self.COUNTERS), self._n_regions)))
+        counters['points'] = 1
+        counters.setdefault('extrapolated', ~_in_model_range(Pr, Tr, zmodel))
+        for k, name in enumerate(self.COUNTERS):
+            if name in counters:
+                weights = np.broadcast_to(np.asarray(counters[name], dtype=float), region.shape)
+                table[k] += np.bincount(region, weights=weights, minlength=self._n_regions)
+
+        self._calls[zmodel] = self._calls.get(zmodel, 0) + 1
+        self.add_time(zmodel, seconds)
+
+    def add_time(self, name, seconds):
+        """adds ``seconds`` to the timer ``name``"""
+        self._times[name] = self._times.get(name, 0.0) + seconds
+
+    def to_dict(self):
+        """
+        Returns the counters as a dict: per-model totals (with ``calls``, ``seconds`` and ``mean_iterations``), the
+        same counters per non-empty (Pr, Tr) region, and the timers that are not tied to a model (e.g.
+        ``pseudo_critical``).
+        """
+        labels = self._region_labels()
+        models_ = {}
+        for zmodel, table in self._counts.items():
+            totals = {name: int(table[k].sum()) for k, name in enumerate(self.COUNTERS)}
+            totals['calls'] = self._calls[zmodel]
+            totals['seconds'] = self._times.get(zmodel, 0.0)
+            totals['mean_iterations'] = totals['iterations'] / totals['points'] if totals['points'] else 0.0
+            totals['regions'] = {
+                labels[r]: {name: int(table[k, r]) for k, name in enumerate(self.COUNTERS)}
+                for r in np.flatnonzero(table[0])
+            }
+            models_[zmodel] = totals
+
+        timers = {name: seconds for name, seconds in self._times.items() if name not in self._counts}
+        return {'models': models_, 'timers': timers}
+
+    def to_json(self, path=None, **kwargs):
+        """Returns the counters as a JSON string, and writes it to ``path`` if given. ``kwargs`` go to json.dumps"""
+        text = json.dumps(self.to_dict(), **kwargs)
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(text)
+        return text
+
+
+_active_stats = None
+
+
+@contextmanager
+def instrument(stats=None):
+    """
+    Collects solver counters and timers of every z-factor calculation inside the ``with`` block, e.g. for profiling
+    production runs. Yields the :class:`ZSolverStats` collector (a new one unless ``stats`` is given). Instrumentation
+    is off by default and costs nothing outside of this block. Calculations run in worker processes (``n_jobs``) are
+    not collected.
+    """
+    global _active_stats
+    if stats is None:
+        stats = ZSolverStats()
+    previous = _active_stats
+    _active_stats = stats
+    try:
+        yield stats
+    finally:
+        _active_stats = previous
+
+
+def _model_args(zmodel_str, Pr, Tr):
+    """
+    Solver args of an implicit z-model: (Pr, Tr, coeffs). The temperature-only coefficients are computed once per
+    distinct Tr, and reused across all pressures of an isotherm and across all iterations.
+    """
+    coefficients_func = MODEL_COEFFICIENTS.get(zmodel_str)
+    if coefficients_func is None:
+        return Pr, Tr
+    if np.ndim(Tr) == 0:
+        return Pr, Tr, coefficients_func(Tr)
+
+    Tr_unique, inverse = np.unique(Tr, return_inverse=True)
+    if Tr_unique.size == np.size(Tr):
+        return Pr, Tr, coefficients_func(Tr)
+    coeffs = coefficients_func(Tr_unique)[inverse.ravel()]
+    return Pr, Tr, coeffs.reshape(np.shape(Tr) + coeffs.shape[-1:])
+
+
 def _get_guess_constant():
     return 0.900000765321234598723486
 
@@ -65,9 +344,12 @@ def _get_z_model(model='DAK'):
     return models[model]
 
 
+_FALLBACK_GUESSES = [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0]
+
+
 def _construct_guess_list_order(guess):
     """reorder t in an order closest to the provided guess"""
-    t = [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0]
+    t = list(_FALLBACK_GUESSES)
 
     reordered = [guess]
     count = 0
@@ -83,30 +365,37 @@ def _calc_z_explicit_implicit_helper(Pr, Tr, zmodel_func, zmodel_str, guess, new
     maxiter = 50
     Z = None
     smart_guess_model = 'kareem'
+    stats = _active_stats
+    if stats is not None:
+        start = time.perf_counter()
 
     # Explicit models
-    if zmodel_str in ['kareem']:
+    if zmodel_str in EXPLICIT_MODELS:
         Z = zmodel_func(Pr=Pr, Tr=Tr)
+        if stats is not None:
+            stats.record(zmodel_str, Pr, Tr, seconds=time.perf_counter() - start)
 
     # Implicit models: they require iterative convergence
     else:
 
         if guess is None:
-            if Pr < 15:
+            if Pr < HIGH_PR_GUESS_PR_MIN:
+                # also outside of the range of the smart guess: the linear high-pressure fits do not hold below Pr=15
                 guess = 0.9
             else:
-                # Todo: z-factor after Pr shows linear trend. So fit a linear regression model for each TR and get
-                #  better estimate of initial guess for Pr range greater than 15, which is the working bound of the
-                #  explicit "kareem" model. But for now, guess = 2 gets the job done
-                guess = 2
+                # z-factor is almost linear in Pr above the working bound of the explicit "kareem" model: use the
+                # fitted per-isotherm linear trend
+                guess = high_pressure_guess(Pr, Tr)
         if smart_guess is None:
             smart_guess = True
 
         worked = False
+        in_range = False
 
         if smart_guess:
             # if Pr and Tr is in the range of the "smart_guess_model" (explicit z-model), use that to make first guess
-            if _check_working_Pr_Tr_range(Pr, Tr, smart_guess_model):
+            in_range = _check_working_Pr_Tr_range(Pr, Tr, smart_guess_model)
+            if in_range:
                 guess_zmodel_func = _get_z_model(model=smart_guess_model)
                 guess_ = guess_zmodel_func(Pr=Pr, Tr=Tr)
                 guesses = [guess_] + [guess] + _construct_guess_list_order(guess)
@@ -116,31 +405,674 @@ def _calc_z_explicit_implicit_helper(Pr, Tr, zmodel_func, zmodel_str, guess, new
         else:
             guesses = _construct_guess_list_order(guess)
 
+        # apply default value of max iteration and the analytic derivatives, unless overridden by newton_kwargs
+        solver_kwargs = {'maxiter': maxiter}
+        solver_kwargs.update(MODEL_DERIVATIVES.get(zmodel_str, {}))
+        if newton_kwargs is not None:
+            solver_kwargs.update(newton_kwargs)
+
+        args = _model_args(zmodel_str, Pr, Tr)
+        # roots below the physical bound (negative z, or y >= 1 for Hall-Yarborough) are retried from the next guess
+        z_min = float(_z_lower_bound(zmodel_str, np.asarray(Pr, dtype=float), np.asarray(Tr, dtype=float)))
+        iterations = 0
+        attempts = 0
         for guess_ in guesses:
+            attempts += 1
             try:
-                if newton_kwargs is None:  # apply default value of max iteration if newton_kwargs is not provided
-                    Z = optimize.newton(zmodel_func, guess_, args=(Pr, Tr), maxiter=maxiter)
-                else:
-                    if 'maxiter' in newton_kwargs:
-                        Z = optimize.newton(zmodel_func, guess_, args=(Pr, Tr), **newton_kwargs)
+                # iterations from a poor guess can overflow: the guess is then rejected, without warnings
+                with np.errstate(all='ignore'):
+                    if stats is None:
+                        Z = optimize.newton(zmodel_func, guess_, args=args, **solver_kwargs)
+                        worked = True
                     else:
-                        newton_kwargs.pop('maxiter', None)
-                        Z = optimize.newton(zmodel_func, guess_, args=(Pr, Tr), maxiter=maxiter, **newton_kwargs)
-                worked = True
+                        Z, result = optimize.newton(zmodel_func, guess_, args=args, full_output=True, disp=False,
+                                                    **solver_kwargs)
+                        iterations += result.iterations
+                        worked = result.converged
             except:
                 pass
+            worked = worked and Z > z_min
             if worked:
                 break
 
+        if stats is not None:
+            n_primary = 2 if in_range else 1
+            stats.record(zmodel_str, Pr, Tr, seconds=time.perf_counter() - start, iterations=iterations,
+                         smart_guess=in_range, out_of_range=bool(smart_guess) and not in_range,
+                         retries=attempts > 1, fallback=attempts > n_primary, failed=not worked)
+
         if not worked:
             raise RuntimeError("Failed to converge")
 
     return Z
 
 
+def _is_array_input(*args):
+    """True if any of the provided arguments is a non-scalar (array-like) input"""
+    return any(np.ndim(arg) > 0 for arg in args if arg is not None)
+
+
+def _parse_newton_kwargs_vectorized(newton_kwargs):
+    """
+    Extracts the convergence settings understood by :func:`_newton_vectorized` from ``newton_kwargs``.
+    Only ``maxiter``, ``tol`` and ``rtol`` are meaningful for the elementwise solver.
+    """
+    settings = {'maxiter': 50, 'tol': 1.48e-8, 'rtol': 0.0}
+    if newton_kwargs is None:
+        return settings
+
+    unsupported = [key for key in newton_kwargs if key not in settings]
+    if len(unsupported) > 0:
+        raise KeyError(
+            'newton_kwargs %s are not supported for array inputs. Supported keys: %s' % (unsupported, list(settings))
+        )
+    settings.update(newton_kwargs)
+    return settings
+
+
+def _newton_vectorized(func, x0, args=(), fprime=None, fprime2=None, tol=1.48e-8, rtol=0.0, maxiter=50,
+                       iterations=None):
+    """
+    Elementwise secant/Newton/Halley iteration that solves ``func(x, *args) = 0`` for every element of ``x0`` at once.
+
+    Mirrors ``scipy.optimize.newton`` (secant if ``fprime`` is not given, Newton-Raphson if ``fprime`` is given and
+    Halley's method if ``fprime2`` is also given, with the same stopping criterion), but keeps a per-element
+    convergence mask so that only the points that have not converged yet are evaluated in the following iterations.
+
+    Parameters
+    ----------
+    func : callable
+        residual function ``func(x, *args)`` that accepts numpy arrays
+    x0 : ndarray
+        1-D array of initial guesses
+    args : tuple
+        1-D arrays of the same size as ``x0``, passed elementwise to ``func``
+    fprime : callable or bool
+        first derivative ``fprime(x, *args)``. Secant iterations are used if not provided. ``True`` if ``func``
+        returns the residual and its derivatives in one call, like ``scipy.optimize.root_scalar``
+    fprime2 : callable or bool
+        second derivative ``fprime2(x, *args)``. Halley iterations are used if provided along with ``fprime``.
+        ``True`` if ``func`` returns ``(f, fprime, fprime2)``
+    tol : float
+        absolute tolerance on the step size
+    rtol : float
+        relative tolerance on the step size
+    maxiter : int
+        maximum number of iterations
+    iterations : ndarray
+        optional integer array of the same size as ``x0``, incremented by the number of iterations of every element
+
+    Returns
+    -------
+    x : ndarray
+        solution array. Elements that did not converge hold the last iterate
+    converged : ndarray
+        boolean array, ``True`` where the iteration converged
+    """
+    x = np.array(x0, dtype=float)
+    args = tuple(np.asarray(arg, dtype=float) for arg in args)
+    converged = np.zeros(x.size, dtype=bool)
+
+    if fprime is None:
+        # secant starting points, same as scipy.optimize.newton
+        x_prev = x.copy()
+        f_prev = func(x_prev, *args)
+        eps = 1e-4
+        x = x_prev * (1 + eps) + np.where(x_prev >= 0, eps, -eps)
+
+    active = np.arange(x.size)
+    for _ in range(maxiter):
+        if active.size == 0:
+            break
+
+        p = x[active]
+        active_args = tuple(arg[active] for arg in args)
+        if iterations is not None:
+            iterations[active] += 1
+        # iterates that overflow or leave the domain of the model are dropped below, and retried by the callers
+        with np.errstate(all='ignore'):
+            if fprime is True:
+                # residual and derivatives from a single call, which shares their intermediate terms
+                q, fder, *fder2 = func(p, *active_args)
+            else:
+                q = func(p, *active_args)
+
+            if fprime is None:
+                p_prev = x_prev[active]
+                q_prev = f_prev[active]
+                p_new = p - q * (p - p_prev) / (q - q_prev)
+                x_prev[active] = p
+                f_prev[active] = q
+            else:
+                if fprime is not True:
+                    fder = fprime(p, *active_args)
+                step = q / fder
+                if fprime2 is not None:
+                    fder2 = fder2[0] if fprime2 is True else fprime2(p, *active_args)
+                    # Halley's correction, applied only where it is a moderate adjustment (as in scipy)
+                    adj = step * fder2 / fder / 2
+                    step = np.where(np.abs(adj) < 1, step / (1 - adj), step)
+                p_new = p - step
+
+            finite = np.isfinite(p_new)
+            done = finite & (np.abs(p_new - p) <= tol + rtol * np.abs(p_new))
+
+        x[active] = p_new
+        converged[active[done]] = True
+
+        # drop converged points, and points that blew up (they are left for the fallback guesses)
+        x[active[~finite]] = p[~finite]
+        active = active[finite & ~done]
+
+    return x, converged
+
+
+def _initial_guesses_vectorized(Pr, Tr, guess, smart_guess, smart_z=None):
+    """
+    Default initial guesses of the vectorized solvers for flat Pr, Tr arrays. Returns the user (or default) guess,
+    and the first guess to try, which is the "smart_guess_model" wherever (Pr, Tr) is in its range. ``smart_z`` is
+    an already computed z of the "smart_guess_model".
+    """
+    smart_guess_model = 'kareem'
+
+    if guess is None:
+        # as in the scalar helper, 0.9 below Pr=15 even outside of the range of the smart guess
+        guess = np.where(Pr < HIGH_PR_GUESS_PR_MIN, 0.9, high_pressure_guess(Pr, Tr))
+    if smart_guess is None:
+        smart_guess = True
+
+    first_guess = guess
+    if smart_guess:
+        # same rule as the scalar helper, applied per point: use the "smart_guess_model" where (Pr, Tr) is in its range
+        in_range = _in_model_range(Pr, Tr, smart_guess_model)
+        if in_range.any():
+            first_guess = np.array(np.broadcast_to(guess, Pr.shape), dtype=float)
+            if smart_z is None:
+                # only in range: the explicit model can overflow or take powers of negative numbers outside of it
+                guess_zmodel_func = _get_z_model(model=smart_guess_model)
+                first_guess[in_range] = guess_zmodel_func(Pr=Pr[in_range], Tr=Tr[in_range])
+            else:
+                first_guess[in_range] = smart_z[in_range]
+
+    return guess, first_guess
+
+
+def _calc_z_vectorized_helper(Pr, Tr, zmodel_func, zmodel_str, guess, newton_kwargs, smart_guess):
+    """
+    Array counterpart of :func:`_calc_z_explicit_implicit_helper`. Solves all (Pr, Tr) points in one elementwise
+    iteration, and only re-solves the points that failed with the fallback guesses.
+    """
+    stats = _active_stats
+    if stats is not None:
+        start = time.perf_counter()
+
+    Pr, Tr = np.broadcast_arrays(np.asarray(Pr, dtype=float), np.asarray(Tr, dtype=float))
+    shape = Pr.shape
+    Pr = Pr.ravel()
+    Tr = Tr.ravel()
+
+    # Explicit models
+    if zmodel_str in EXPLICIT_MODELS:
+        Z = zmodel_func(Pr=Pr, Tr=Tr)
+        if stats is not None:
+            stats.record(zmodel_str, Pr, Tr, seconds=time.perf_counter() - start)
+        return Z.reshape(shape)
+
+    # Implicit models: they require iterative convergence
+    settings = _parse_newton_kwargs_vectorized(newton_kwargs)
+
+    settings.update(MODEL_DERIVATIVES.get(zmodel_str, {}))
+
+    if guess is not None:
+        guess = np.broadcast_to(np.asarray(guess, dtype=float), shape).ravel()
+    guess, first_guess = _initial_guesses_vectorized(Pr, Tr, guess, smart_guess)
+
+    guesses = [guess] + [np.full(Pr.size, guess_) for guess_ in _FALLBACK_GUESSES]
+    if first_guess is not guess:
+        guesses = [first_guess] + guesses
+
+    args = _model_args(zmodel_str, Pr, Tr)
+    Z = np.full(Pr.size, np.nan)
+    pending = np.arange(Pr.size)
+    if stats is not None:
+        iterations = np.zeros(Pr.size, dtype=int)
+        attempts = np.zeros(Pr.size, dtype=int)
+    for guess_ in guesses:
+        pending_args = args if pending.size == Pr.size else tuple(arg[pending] for arg in args)
+        if stats is None:
+            z, converged = _newton_vectorized(zmodel_func, guess_[pending], args=pending_args, **settings)
+        else:
+            attempts[pending] += 1
+            pending_iterations = np.zeros(pending.size, dtype=int)
+            z, converged = _newton_vectorized(zmodel_func, guess_[pending], args=pending_args,
+                                              iterations=pending_iterations, **settings)
+            iterations[pending] += pending_iterations
+        # non-physical roots are retried from the next guess, as in _calc_z_density_helper
+        converged &= z > _z_lower_bound(zmodel_str, Pr[pending], Tr[pending])
+        Z[pending[converged]] = z[converged]
+        pending = pending[~converged]
+        if pending.size == 0:
+            break
+
+    if stats is not None:
+        smart = first_guess is not guess
+        in_range = _in_model_range(Pr, Tr, 'kareem')
+        failed = np.zeros(Pr.size, dtype=bool)
+        failed[pending] = True
+        stats.record(zmodel_str, Pr, Tr, seconds=time.perf_counter() - start, iterations=iterations,
+                     smart_guess=smart & in_range, out_of_range=(smart_guess is not False) & ~in_range,
+                     retries=attempts > 1, fallback=attempts > np.where(smart & in_range, 2, 1), failed=failed)
+
+    if pending.size > 0:
+        raise RuntimeError("Failed to converge for %d out of %d points" % (pending.size, Pr.size))
+
+    return Z.reshape(shape)
+
+
+def _calc_z_density_helper(Pr, Tr, zmodel_func, zmodel_str, guess, newton_kwargs, smart_guess):
+    """
+    Counterpart of :func:`_calc_z_vectorized_helper` that iterates on the reduced density of the implicit models
+    (``MODEL_DENSITY_FORMS``) instead of z. The initial guesses of z are converted to densities, and roots with a
+    non-physical density (negative, or above the packing limit) are rejected and re-solved from the next guess.
+    """
+    if zmodel_str not in MODEL_DENSITY_FORMS:
+        return _calc_z_vectorized_helper(Pr, Tr, zmodel_func, zmodel_str, guess, newton_kwargs, smart_guess)
+
+    stats = _active_stats
+    if stats is not None:
+        start = time.perf_counter()
+
+    Pr, Tr = np.broadcast_arrays(np.asarray(Pr, dtype=float), np.asarray(Tr, dtype=float))
+    shape = Pr.shape
+    Pr = Pr.ravel()
+    Tr = Tr.ravel()
+
+    settings = _parse_newton_kwargs_vectorized(newton_kwargs)
+    density_func, scale_index, density_max = MODEL_DENSITY_FORMS[zmodel_str]
+
+    if guess is not None:
+        guess = np.broadcast_to(np.asarray(guess, dtype=float), shape).ravel()
+    guess, first_guess = _initial_guesses_vectorized(Pr, Tr, guess, smart_guess)
+
+    guesses = [guess] + [np.full(Pr.size, guess_) for guess_ in _FALLBACK_GUESSES]
+    if first_guess is not guess:
+        guesses = [first_guess] + guesses
+
+    args = _model_args(zmodel_str, Pr, Tr)
+    # the density is scale / z
+    scale = args[2].T[scale_index] * Pr
+    density = np.full(Pr.size, np.nan)
+    pending = np.arange(Pr.size)
+    if stats is not None:
+        iterations = np.zeros(Pr.size, dtype=int)
+        attempts = np.zeros(Pr.size, dtype=int)
+    for guess_ in guesses:
+        pending_args = args if pending.size == Pr.size else tuple(arg[pending] for arg in args)
+        pending_iterations = None
+        if stats is not None:
+            attempts[pending] += 1
+            pending_iterations = np.zeros(pending.size, dtype=int)
+        rho, converged = _newton_vectorized(density_func, scale[pending] / guess_[pending], args=pending_args,
+                                            fprime=True, fprime2=True, iterations=pending_iterations, **settings)
+        if stats is not None:
+            iterations[pending] += pending_iterations
+        converged &= (rho >= 0) & (rho < density_max)
+        density[pending[converged]] = rho[converged]
+        pending = pending[~converged]
+        if pending.size == 0:
+            break
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Z = np.where(density > 0, scale / density, 1.0)
+
+    if stats is not None:
+        smart = first_guess is not guess
+        in_range = _in_model_range(Pr, Tr, 'kareem')
+        failed = np.zeros(Pr.size, dtype=bool)
+        failed[pending] = True
+        stats.record(zmodel_str, Pr, Tr, seconds=time.perf_counter() - start, iterations=iterations,
+                     smart_guess=smart & in_range, out_of_range=(smart_guess is not False) & ~in_range,
+                     retries=attempts > 1, fallback=attempts > np.where(smart & in_range, 2, 1), failed=failed)
+
+    if pending.size > 0:
+        raise RuntimeError("Failed to converge for %d out of %d points" % (pending.size, Pr.size))
+
+    if len(shape) == 0:
+        return Z[0]
+    return Z.reshape(shape)
+
+
+Z_SOLVER_STATUS = {
+    0: 'converged',
+    1: 'maximum number of iterations reached',
+    2: 'no bracket of the physical root found',
+    3: 'non-finite residual',
+}
+"""status codes returned by calc_z_bracketed"""
+
+
+def _z_lower_bound(zmodel_str, Pr, Tr):
+    """smallest physical z of the implicit models: z > 0, and reduced density y < 1 for Hall-Yarborough"""
+    if zmodel_str == 'hall_yarborough':
+        return hall_yarborough_z_lower_bound(Pr, Tr)
+    return np.zeros(Pr.shape)
+
+
+def _bracket_z_root(func, args, z_min, maxiter=30):
+    """
+    Finds z_lo < z_hi with func(z_lo) > 0 > func(z_hi) for every point. The residuals of the implicit models go to
+    +inf at their lower bound ``z_min`` (infinite reduced density) and are negative for large z (ideal-gas limit),
+    so the bracket isolates the physical root from the spurious negative-z roots.
+
+    Returns z_lo, z_hi and a boolean mask of the points where a bracket was found.
+    """
+    with np.errstate(all='ignore'):
+        z_lo = z_min + 0.01
+        f_lo = func(z_lo, *args)
+        for _ in range(maxiter):
+            shrink = ~(f_lo > 0)
+            if not shrink.any():
+                break
+            z_lo[shrink] = z_min[shrink] + (z_lo[shrink] - z_min[shrink]) / 4
+            f_lo[shrink] = func(z_lo[shrink], *(arg[shrink] for arg in args))
+
+        z_hi = np.maximum(z_lo, 1) * 2
+        f_hi = func(z_hi, *args)
+        for _ in range(maxiter):
+            expand = ~(f_hi < 0)
+            if not expand.any():
+                break
+            z_hi[expand] = z_hi[expand] * 2
+            f_hi[expand] = func(z_hi[expand], *(arg[expand] for arg in args))
+
+    return z_lo, z_hi, (f_lo > 0) & (f_hi < 0)
+
+
+def _bracketed_newton_vectorized(func, x0, lo, hi, args=(), fprime=None, fprime2=None, tol=1.48e-8, rtol=0.0,
+                                 maxiter=50):
+    """
+    Safeguarded Newton/Halley iteration on a bracket, for every element at once. ``func`` must be positive at ``lo``
+    and negative at ``hi``. Each evaluation shrinks the bracket; steps that leave the bracket (or are not finite)
+    are replaced by bisection, so every point converges to a root inside its bracket.
+
+    Returns
+    -------
+    x : ndarray
+        solution array
+    iterations : ndarray
+        number of residual evaluations of every point
+    status : ndarray
+        status codes of every point, see ``Z_SOLVER_STATUS``
+    """
+    lo = np.array(lo, dtype=float)
+    hi = np.array(hi, dtype=float)
+    x = np.array(x0, dtype=float)
+    args = tuple(np.asarray(arg, dtype=float) for arg in args)
+
+    outside = ~((x > lo) & (x < hi))
+    x[outside] = (lo[outside] + hi[outside]) / 2
+
+    iterations = np.zeros(x.size, dtype=int)
+    status = np.ones(x.size, dtype=int)
+    active = np.arange(x.size)
+    for _ in range(maxiter):
+        if active.size == 0:
+            break
+
+        p = x[active]
+        active_args = tuple(arg[active] for arg in args)
+        with np.errstate(all='ignore'):
+            q = func(p, *active_args)
+        iterations[active] += 1
+
+        nonfinite = ~np.isfinite(q)
+        status[active[nonfinite]] = 3
+
+        # the root lies above points with a positive residual, and below points with a negative one
+        positive = q > 0
+        lo[active[positive]] = p[positive]
+        hi[active[q < 0]] = p[q < 0]
+        a_lo = lo[active]
+        a_hi = hi[active]
+
+        with np.errstate(all='ignore'):
+            if fprime is None:
+                step = np.full(p.shape, np.nan)
+            else:
+                fder = fprime(p, *active_args)
+                step = q / fder
+                if fprime2 is not None:
+                    adj = step * fprime2(p, *active_args) / fder / 2
+                    step = np.where(np.abs(adj) < 1, step / (1 - adj), step)
+            p_new = p - step
+
+        # the bracket was just moved to p, so a converged step lands on its endpoint: accept steps within tolerance
+        small = np.abs(p_new - p) <= tol + rtol * np.abs(p_new)
+        bisect = ~(np.isfinite(p_new) & (small | ((p_new > a_lo) & (p_new < a_hi))))
+        p_new[bisect] = (a_lo[bisect] + a_hi[bisect]) / 2
+        p_new[q == 0] = p[q == 0]
+        x[active] = p_new
+
+        done = ((small & ~bisect) | (a_hi - a_lo <= tol) | (q == 0)) & ~nonfinite
+        status[active[done]] = 0
+        active = active[~done & ~nonfinite]
+
+    return x, iterations, status
+
+
+def _calc_z_bracketed_helper(Pr, Tr, zmodel_func, zmodel_str, guess, newton_kwargs, smart_guess):
+    """
+    Solves every (Pr, Tr) point with the bracketed solver. Returns z, iterations, residuals and status codes, all
+    with the broadcast shape of Pr and Tr.
+    """
+    stats = _active_stats
+    if stats is not None:
+        start = time.perf_counter()
+
+    Pr, Tr = np.broadcast_arrays(np.asarray(Pr, dtype=float), np.asarray(Tr, dtype=float))
+    shape = Pr.shape
+    Pr = Pr.ravel()
+    Tr = Tr.ravel()
+
+    # Explicit models
+    if zmodel_str in EXPLICIT_MODELS:
+        Z = zmodel_func(Pr=Pr, Tr=Tr)
+        iterations = np.zeros(Pr.size, dtype=int)
+        residual = np.zeros(Pr.size)
+        status = np.where(np.isfinite(Z), 0, 3)
+        if stats is not None:
+            stats.record(zmodel_str, Pr, Tr, seconds=time.perf_counter() - start, failed=status != 0)
+        return tuple(arr.reshape(shape) for arr in (Z, iterations, residual, status))
+
+    # Implicit models
+    settings = _parse_newton_kwargs_vectorized(newton_kwargs)
+    settings.update(MODEL_DERIVATIVES.get(zmodel_str, {}))
+
+    if guess is not None:
+        guess = np.broadcast_to(np.asarray(guess, dtype=float), shape).ravel()
+    _, first_guess = _initial_guesses_vectorized(Pr, Tr, guess, smart_guess)
+
+    args = _model_args(zmodel_str, Pr, Tr)
+    z_lo, z_hi, bracketed = _bracket_z_root(zmodel_func, args, _z_lower_bound(zmodel_str, Pr, Tr))
+
+    Z = np.full(Pr.size, np.nan)
+    iterations = np.zeros(Pr.size, dtype=int)
+    status = np.full(Pr.size, 2)
+    if bracketed.any():
+        Z[bracketed], iterations[bracketed], status[bracketed] = _bracketed_newton_vectorized(
+            zmodel_func, first_guess[bracketed], z_lo[bracketed], z_hi[bracketed],
+            args=tuple(arg[bracketed] for arg in args), **settings
+        )
+
+    with np.errstate(all='ignore'):
+        residual = zmodel_func(Z, *args)
+
+    if stats is not None:
+        in_range = _in_model_range(Pr, Tr, 'kareem')
+        smart = smart_guess is not False
+        stats.record(zmodel_str, Pr, Tr, seconds=time.perf_counter() - start, iterations=iterations,
+                     smart_guess=smart & in_range, out_of_range=smart & ~in_range, failed=status != 0)
+
+    return tuple(arr.reshape(shape) for arr in (Z, iterations, residual, status))
+
+
+def _calc_z_bracketed_z_only_helper(Pr, Tr, zmodel_func, zmodel_str, guess, newton_kwargs, smart_guess):
+    """z-only form of :func:`_calc_z_bracketed_helper` for calc_z(solver='bracketed')"""
+    Z, _, _, status = _calc_z_bracketed_helper(Pr, Tr, zmodel_func, zmodel_str, guess, newton_kwargs, smart_guess)
+    failed = status != 0
+    if failed.any():
+        raise RuntimeError("Failed to converge for %d out of %d points" % (np.sum(failed), np.size(status)))
+    if np.ndim(Z) == 0:
+        return Z[()]
+    return Z
+
+
+def _select_fast_model(Pr, Tr, tol):
+    """
+    index in FAST_MODELS of the cheapest fast model whose accuracy envelope meets ``tol`` at every point of 1-D Pr
+    and Tr. -1 where none does, or outside of the envelopes
+    """
+    i_Pr = np.searchsorted(FAST_PR_EDGES, Pr, side='right') - 1
+    i_Tr = np.searchsorted(FAST_TR_EDGES, Tr, side='right') - 1
+    # the upper edges belong to the last bands
+    i_Pr[Pr == FAST_PR_EDGES[-1]] -= 1
+    i_Tr[Tr == FAST_TR_EDGES[-1]] -= 1
+    inside = (i_Pr >= 0) & (i_Pr < FAST_PR_EDGES.size - 1) & (i_Tr >= 0) & (i_Tr < FAST_TR_EDGES.size - 1)
+
+    choice = np.full(Pr.size, -1)
+    accurate = _FAST_ENVELOPES[:, i_Tr[inside], i_Pr[inside]] <= tol
+    choice[inside] = np.where(accurate.any(axis=0), accurate.argmax(axis=0), -1)
+    return choice
+
+
+def _get_z_helper(zmodel, solver, accuracy, fast_tol, array_input=True):
+    """
+    z-helper of calc_z for the ``solver`` and ``accuracy`` options, with the signature (Pr, Tr, zmodel_func,
+    zmodel_str, guess, newton_kwargs, smart_guess). Raises KeyError for options that are not implemented.
+    """
+    # array inputs are solved all at once with the elementwise solver
+    if solver == 'bracketed':
+        z_helper = _calc_z_bracketed_z_only_helper
+    elif solver == 'density':
+        z_helper = _calc_z_density_helper
+    elif solver != 'newton':
+        raise KeyError('Solver "%s" is not implemented. Choose from: ["newton", "bracketed", "density"]' % solver)
+    elif array_input:
+        z_helper = _calc_z_vectorized_helper
+    else:
+        z_helper = _calc_z_explicit_implicit_helper
+    return _apply_accuracy(z_helper, zmodel, accuracy, fast_tol)
+
+
+def _apply_accuracy(z_helper, zmodel, accuracy, fast_tol):
+    """
+    Wraps the z-helper of calc_z into the fast tier for ``accuracy='fast'``. The accuracy envelopes are measured
+    against 'DAK' only, so the fast models can't substitute for any other zmodel.
+    """
+    if accuracy == 'exact':
+        return z_helper
+    if accuracy != 'fast':
+        raise KeyError('Accuracy "%s" is not implemented. Choose from: ["exact", "fast"]' % accuracy)
+    if zmodel != 'DAK':
+        raise KeyError('Accuracy "fast" is only implemented for zmodel "DAK", the reference of ACCURACY_ENVELOPES. '
+                       'Got zmodel "%s"' % zmodel)
+    return partial(_calc_z_fast_helper, z_helper, fast_tol)
+
+
+def _calc_z_fast_helper(exact_helper, tol, Pr, Tr, zmodel_func, zmodel_str, guess, newton_kwargs, smart_guess):
+    """
+    calc_z(accuracy='fast'): every point is computed with the cheapest fast model whose accuracy envelope meets
+    ``tol``, and with ``exact_helper``, the regular solver of the z-model, where none does
+    """
+    scalar = np.ndim(Pr) == 0 and np.ndim(Tr) == 0
+    Pr_flat, Tr_flat = np.broadcast_arrays(np.asarray(Pr, dtype=float), np.asarray(Tr, dtype=float))
+    shape = Pr_flat.shape
+    Pr_flat = Pr_flat.ravel()
+    Tr_flat = Tr_flat.ravel()
+
+    choice = _select_fast_model(Pr_flat, Tr_flat, tol)
+    if scalar and choice[0] < 0:
+        return exact_helper(Pr, Tr, zmodel_func, zmodel_str, guess, newton_kwargs, smart_guess)
+
+    stats = _active_stats
+    Z = np.empty(Pr_flat.size)
+    for k, fast_model in enumerate(FAST_MODELS):
+        selected = choice == k
+        if not selected.any():
+            continue
+        if stats is not None:
+            start = time.perf_counter()
+        Z[selected] = models[fast_model](Pr=Pr_flat[selected], Tr=Tr_flat[selected])
+        if stats is not None:
+            stats.record(fast_model, Pr_flat[selected], Tr_flat[selected], seconds=time.perf_counter() - start)
+
+    exact = choice < 0
+    if exact.any():
+        if guess is not None and np.ndim(guess) > 0:
+            guess = np.broadcast_to(np.asarray(guess, dtype=float), shape).ravel()[exact]
+        Z[exact] = exact_helper(Pr_flat[exact], Tr_flat[exact], zmodel_func, zmodel_str, guess, newton_kwargs,
+                                smart_guess)
+
+    if scalar:
+        return Z[0]
+    return Z.reshape(shape)
+
+
+def _check_explicit_model_arguments(zmodel, guess, newton_kwargs, smart_guess):
+    """explicit models don't iterate, so they don't accept any of the solver arguments"""
+    if zmodel in EXPLICIT_MODELS:
+        if guess is not None:
+            raise KeyError('calc_z(model="%s") got an unexpected argument "guess"' % zmodel)
+        if newton_kwargs is not None:
+            raise KeyError('calc_z(model="%s") got an unexpected argument "newton_kwargs"' % zmodel)
+        if smart_guess is not None:
+            raise KeyError('calc_z(model="%s") got an unexpected argument "smart_guess"' % zmodel)
+
+
+def _calc_Tr_and_Pr(sg=None, P=None, T=None, H2S=None, CO2=None, N2=None, Pr=None, Tr=None, pmodel='piper',
+                    ignore_conflict=False, **kwargs):
+    """
+    Pseudo-critical step of calc_z. Returns Tr, Pr and the dict of pseudo-critical properties (``ps_props``) of the
+    pseudo-critical model.
+
+    The common case (sg, P and T given, no pseudo-critical overrides) goes through the stateless functions
+    piper_reduced/sutton_reduced. The Piper/Sutton classes are only used to validate the other combinations of
+    arguments.
+    """
+    stats = _active_stats
+    if stats is not None:
+        start = time.perf_counter()
+
+    if pmodel not in ['piper', 'sutton']:
+        raise KeyError(
+            'Pseudo-critical model "%s" is not implemented. Choose from the list of available models: %s' % (pmodel, pmodels_ks)
+        )
+    if pmodel == 'sutton' and N2 is not None:
+        raise KeyError('pmodel="sutton" does not support N2 as input. Set N2=None')
+
+    if not kwargs and Pr is None and Tr is None and sg is not None and P is not None and T is not None:
+        if pmodel == 'piper':
+            ps_props = piper_reduced(sg, P, T, H2S=H2S, CO2=CO2, N2=N2)
+        else:
+            ps_props = sutton_reduced(sg, P, T, H2S=H2S, CO2=CO2)
+        Tr, Pr = ps_props['Tr'], ps_props['Pr']
+    elif pmodel == 'piper':
+        pc_instance = Piper()
+        Tr, Pr = pc_instance._initialize_Tr_and_Pr(sg=sg, P=P, T=T, Tr=Tr, Pr=Pr, H2S=H2S, CO2=CO2, N2=N2, ignore_conflict=ignore_conflict, **kwargs)
+        ps_props = pc_instance.ps_props
+    else:
+        pc_instance = Sutton()
+        Tr, Pr = pc_instance._initialize_Tr_and_Pr(sg=sg, P=P, T=T, Tr=Tr, Pr=Pr, H2S=H2S, CO2=CO2, ignore_conflict=ignore_conflict, **kwargs)
+        ps_props = pc_instance.ps_props
+
+    if stats is not None:
+        stats.add_time('pseudo_critical', time.perf_counter() - start)
+    return Tr, Pr, ps_props
+
 
 def calc_z(sg=None, P=None, T=None, H2S=None, CO2=None, N2=None, Pr=None, Tr=None, pmodel='piper', zmodel='DAK',
-           guess=None, newton_kwargs=None, smart_guess=None, ps_props=False, ignore_conflict=False, **kwargs):
+           guess=None, newton_kwargs=None, smart_guess=None, ps_props=False, ignore_conflict=False, solver='newton',
+           accuracy='exact', fast_tol=0.005, **kwargs):
     """
     Calculates the gas compressibility factor, :math:`Z`.
 
@@ -172,25 +1104,32 @@ def calc_z(sg=None, P=None, T=None, H2S=None, CO2=None, N2=None, Pr=None, Tr=Non
     >>> gc.calc_z(sg=0.7, T=75, P=2010, ps_props=True)
     {'z': 0.7366562810878984, 'Tpc': 371.4335560823552, 'Ppc': 660.6569792741872, 'J': 0.56221847, 'K': 14.450840999999999, 'Tr': 1.4394768357478496, 'Pr': 3.0646766226921294}
 
+    **Array inputs (solved all at once, returns an array of the broadcast input shape)**
+
+    >>> gc.calc_z(sg=0.7, T=75, P=np.array([1000, 2010, 5000]))
+    array([0.83183139, 0.73665628, 0.95325628])
+
+    >>> gc.calc_z(Pr=np.linspace(0.5, 10, 4), Tr=np.array([[1.2], [1.5]])).shape
+    (2, 4)
 
 
     Parameters
     ----------
-    sg : float
+    sg : float or array_like
         specific gravity of gas (dimensionless)
-    P : float
+    P : float or array_like
         pressure of gas (psig)
-    T : float
+    T : float or array_like
         temperature of gas (°F)
-    H2S : float
+    H2S : float or array_like
         mole fraction of H2S (dimensionless)
-    CO2 : float
+    CO2 : float or array_like
         mole fraction of CO2 (dimensionless)
-    N2 : float
+    N2 : float or array_like
         mole fraction of N2 (dimensionless). Available only when ``pmodel='piper'`` (default)
-    Pr : float
+    Pr : float or array_like
         pseudo-reduced pressure, Pr (dimensionless)
-    Tr : float
+    Tr : float or array_like
         pseudo-reduced temperature, Tr (dimensionless)
     pmodel : str
         choice of a pseudo-critical model.
@@ -205,12 +1144,16 @@ def calc_z(sg=None, P=None, T=None, H2S=None, CO2=None, N2=None, Pr=None, Tr=Non
     zmodel : str
         choice of a z-correlation model.
         Check :ref:`Theories 2: Z-Factor Correlation Models <theories:2. Z-Factor Correlation Models>` for more information.
-        Accepted inputs: ``'DAK'`` | ``'hall_yarborough'`` | ``'londono'`` |``'kareem'``
+        Accepted inputs: ``'DAK'`` | ``'hall_yarborough'`` | ``'londono'`` |``'kareem'`` | ``'papay'`` | ``'beggs_brill'``
     guess : float
         initial guess of z-value for z-correlation models using iterative convergence (``'DAK'`` | ``'hall_yarborough'`` | ``'londono'``).
-        NOT RECOMMENDED to manually set this parameter unless the computed :math:`P_r` exceeds 15. If so a default ``guess=2`` is applied, which
-        is a good estimate for high-pressure scenarios. Otherwise for :math:`P_r < 15`, the built-in ``smart_guess`` takes over to
-        automatically provide a good initial guess that's fast and accurate.
+        NOT RECOMMENDED to manually set this parameter. If the computed :math:`P_r` exceeds 15, a default guess is
+        taken from per-isotherm linear fits of the z-factor (``high_pressure_guess``), which is a good estimate for
+        high-pressure scenarios. Otherwise for :math:`P_r < 15`, the built-in ``smart_guess`` takes over to
+        automatically provide a good initial guess that's fast and accurate. Below :math:`P_r = 15` but outside of
+        the working range of ``smart_guess`` (:math:`T_r < 1`, :math:`T_r > 3` or :math:`P_r < 0.2`), the first
+        guess is 0.9: z is not linear in :math:`P_r` there, so the high-pressure fits do not apply, and below the
+        critical temperature they lead to another root.
     newton_kwargs : dict
         dictonary of keyword-arguments used by ``scipy.optimize.newton`` method for z-correlation models that use
         iterative convergence (``'DAK'`` | ``'hall_yarborough'`` | ``'londono'``).
@@ -221,16 +1164,54 @@ def calc_z(sg=None, P=None, T=None, H2S=None, CO2=None, N2=None, Pr=None, Tr=Non
         See Also
         ----------
         `scipy.optimize.newton <https://docs.scipy.org/doc/scipy/reference/generated/scipy.optimize.newton.html>`_.
+
+        The analytic first and second derivatives of the implicit models (``MODEL_DERIVATIVES``) are passed as
+        ``fprime`` and ``fprime2`` by default, so Halley's method is used. They can be overridden here, e.g.
+        ``newton_kwargs={'fprime2': None}`` for plain Newton-Raphson. The residual and its derivatives are called as
+        ``f(z, Pr, Tr, coeffs)``, where ``coeffs`` holds the temperature-only terms of the model
+        (``MODEL_COEFFICIENTS``), computed once per distinct :math:`T_r`.
+
+        For array inputs, the elementwise solver only accepts ``maxiter``, ``tol`` and ``rtol``.
     smart_guess : bool
         ``True`` by default. Prevents rare corner cases where ``scipy.optimize.newton`` fails to converge to a true
         solution, and improves speed. It provides *"smart"* initial guess with explicit z-models (like ``zmodel='kareem'``)
-        for :math:`P_r < 15`. For :math:`P_r > 15`, smart guess is turned off and uses a fixed value of ``guess=2``,
-        which is shown to work well. Check :ref:`Theories 2.6: Caveats <theories:2.6. Caveats>` for more information.
-    ps_props : bool
+        for :math:`P_r < 15`. For :math:`P_r > 15`, smart guess is turned off and the fitted high-pressure guess is
+        used instead. Check :ref:`Theories 2.6: Caveats <theories:2.6. Caveats>` for more information.
+    ps_props : bool or str
         set this to `True` to return a dictionary of all associated pseudo-critical properties computed during calculation
-        of the z-factor.
+        of the z-factor. ``'record'`` returns the same values as a compact record instead (see ``zresult``): a
+        ``ZResult`` object with ``__slots__`` for scalar inputs, and a NumPy structured array with the columns
+        ``z, Tpc, Ppc, J, K, Tr, Pr, e_correction`` (``Z_RESULT_DTYPE``) for array inputs, which keeps per-point
+        properties of large batches in one contiguous block.
+
+        >>> gc.calc_z(sg=0.7, T=75, P=np.array([1000, 2010]), ps_props='record')['z']
+        array([0.83183139, 0.73665628])
     ignore_conflict : bool
         set this to True to override calculated variables with input keyword arguments.
+    solver : str
+        ``'newton'`` (default) runs Newton/Halley iterations from a list of initial guesses. ``'bracketed'`` brackets
+        the physical root first and runs safeguarded Newton/Halley iterations inside the bracket, which needs no
+        fallback guesses. See :ref:`calc_z_bracketed <calc_z_bracketed>` for per-point convergence diagnostics.
+        ``'density'`` runs Halley iterations on the reduced density of the implicit models (:math:`\\rho_r` of
+        ``'DAK'`` and ``'londono'``, :math:`y` of ``'hall_yarborough'``, see ``MODEL_DENSITY_FORMS``), in which the
+        equations are smooth polynomial-exponential functions, and converts the solution back to z. It needs fewer
+        iterations at high :math:`P_r` and never returns non-physical (negative) roots.
+        Accepted inputs: ``'newton'`` | ``'bracketed'`` | ``'density'``
+    accuracy : str
+        ``'exact'`` (default) computes every point with ``zmodel``. ``'fast'`` is a low-latency tier of ``'DAK'``
+        for large batches where a small error is acceptable: every point is computed with the cheapest explicit model
+        of ``FAST_MODELS`` (``'papay'``, then ``'beggs_brill'``, then ``'kareem'``) whose measured accuracy envelope
+        (``ACCURACY_ENVELOPES``, the maximum deviation from ``'DAK'`` per :math:`(T_r, P_r)` band) meets
+        ``fast_tol``. Points where none does, or outside of the envelopes (:math:`1.05 \\le T_r \\le 3`,
+        :math:`0.2 \\le P_r \\le 15`), are solved with ``'DAK'`` and ``solver`` as usual. The envelopes are only
+        measured against ``'DAK'``, so ``'fast'`` requires ``zmodel='DAK'``.
+
+        >>> gc.calc_z(Pr=np.array([0.3, 1.5, 3.0, 20]), Tr=np.array([2.5, 1.8, 1.3, 1.5]), accuracy='fast')
+        array([0.9965064 , 0.93054748, 0.62429829, 1.84496496])
+
+        Accepted inputs: ``'exact'`` | ``'fast'``
+    fast_tol : float
+        maximum absolute error of the z-factor accepted by ``accuracy='fast'``. Default 0.005
     kwargs : dict
         optional kwargs used by pseudo-critical models (:doc:`Sutton <sutton>` | :doc:`Piper <piper>`) that allow direct calculation of
         z-factor from pseudo-critical properties instead of specific gravity correlation. Consider the below code example
@@ -252,24 +1233,24 @@ def calc_z(sg=None, P=None, T=None, H2S=None, CO2=None, N2=None, Pr=None, Tr=Non
 
     Returns
     -------
-    float
-        gas compressibility factor, :math:`Z` (dimensionless)
+    float or ndarray
+        gas compressibility factor, :math:`Z` (dimensionless). An array with the broadcast shape of the inputs is
+        returned if any of the inputs is array-like.
 
     """
 
-    if zmodel in ['kareem']:
-        if guess is not None:
-            raise KeyError('calc_z(model="%s") got an unexpected argument "guess"' % zmodel)
-        if newton_kwargs is not None:
-            raise KeyError('calc_z(model="%s") got an unexpected argument "newton_kwargs"' % zmodel)
-        if smart_guess is not None:
-            raise KeyError('calc_z(model="%s") got an unexpected argument "smart_guess"' % zmodel)
+    _check_explicit_model_arguments(zmodel, guess, newton_kwargs, smart_guess)
 
     z_model = _get_z_model(model=zmodel)
 
+    z_helper = _get_z_helper(zmodel, solver, accuracy, fast_tol,
+                             array_input=_is_array_input(sg, P, T, H2S, CO2, N2, Pr, Tr))
+
     # Pr and Tr are already provided:
     if Pr is not None and Tr is not None:
-        Z = _calc_z_explicit_implicit_helper(Pr, Tr, z_model, zmodel, guess, newton_kwargs, smart_guess)
+        Z = z_helper(Pr, Tr, z_model, zmodel, guess, newton_kwargs, smart_guess)
+        if ps_props == 'record':
+            return make_z_result(Z, {'Pr': Pr, 'Tr': Tr})
         if ps_props is True:
             ps_props = {'z': Z, 'Pr': Pr, 'Tr': Tr}
             return ps_props
@@ -277,24 +1258,16 @@ def calc_z(sg=None, P=None, T=None, H2S=None, CO2=None, N2=None, Pr=None, Tr=Non
             return Z
 
     # Pr and Tr are NOT provided:
-    if pmodel == 'piper':
-        pc_instance = Piper()
-        Tr, Pr = pc_instance._initialize_Tr_and_Pr(sg=sg, P=P, T=T, Tr=Tr, Pr=Pr, H2S=H2S, CO2=CO2, N2=N2, ignore_conflict=ignore_conflict, **kwargs)
-    elif pmodel == 'sutton':
-        if N2 is not None:
-            raise KeyError('pmodel="sutton" does not support N2 as input. Set N2=None')
-        pc_instance = Sutton()
-        Tr, Pr = pc_instance._initialize_Tr_and_Pr(sg=sg, P=P, T=T, Tr=Tr, Pr=Pr, H2S=H2S, CO2=CO2, ignore_conflict=ignore_conflict, **kwargs)
-    else:
-        raise KeyError(
-            'Pseudo-critical model "%s" is not implemented. Choose from the list of available models: %s' % (pmodel, pmodels_ks)
-        )
+    Tr, Pr, pc_props = _calc_Tr_and_Pr(sg=sg, P=P, T=T, H2S=H2S, CO2=CO2, N2=N2, Pr=Pr, Tr=Tr, pmodel=pmodel,
+                                       ignore_conflict=ignore_conflict, **kwargs)
 
-    Z = _calc_z_explicit_implicit_helper(Pr, Tr, z_model, zmodel, guess, newton_kwargs, smart_guess)
+    Z = z_helper(Pr, Tr, z_model, zmodel, guess, newton_kwargs, smart_guess)
 
+    if ps_props == 'record':
+        return make_z_result(Z, dict(pc_props, Tr=Tr, Pr=Pr))
     if ps_props is True:
         ps_props = {'z': Z}
-        ps_props.update(pc_instance.ps_props)
+        ps_props.update(pc_props)
         ps_props['Tr'] = Tr
         ps_props['Pr'] = Pr
         return ps_props
@@ -302,6 +1275,477 @@ def calc_z(sg=None, P=None, T=None, H2S=None, CO2=None, N2=None, Pr=None, Tr=Non
         return Z
 
 
+def calc_z_bracketed(sg=None, P=None, T=None, H2S=None, CO2=None, N2=None, Pr=None, Tr=None, pmodel='piper',
+                     zmodel='DAK', guess=None, newton_kwargs=None, smart_guess=None, ignore_conflict=False, **kwargs):
+    """
+    Calculates the z-factor with the bracketed solver and returns per-point convergence diagnostics.
+
+    The physical root of the implicit models is bracketed first (:math:`z > 0`, and reduced density below 1 for
+    ``'hall_yarborough'``). Safeguarded Newton/Halley iterations then run from the usual initial guess, falling back
+    to bisection whenever a step leaves the bracket. Every bracketed point converges in a single solve, so no fallback
+    guesses are needed: on a 100 x 300 grid of 1.05 <= Tr <= 3 and 0.2 <= Pr <= 15, the mean number of residual
+    evaluations is 2.2-2.4 (at most 5 for ``'DAK'``, 4 for ``'hall_yarborough'`` and 11 for ``'londono'``).
+
+    >>> gc.calc_z_bracketed(Pr=np.array([1.5, 25]), Tr=np.array([1.5, 1.05]), zmodel='londono')
+    {'z': array([0.85908632, 2.73382734]), 'iterations': array([3, 3]), 'residual': array([ 0.0000000e+00, -4.4408921e-16]), 'status': array([0, 0])}
+
+    Parameters
+    ----------
+    sg, P, T, H2S, CO2, N2, Pr, Tr, pmodel, zmodel, guess, smart_guess, ignore_conflict, kwargs
+        same as :ref:`calc_z <calc_z>`
+    newton_kwargs : dict
+        ``maxiter``, ``tol`` and ``rtol`` of the bracketed solver
+
+    Returns
+    -------
+    dict
+        ``'z'``: gas compressibility factor, :math:`Z` (dimensionless). ``nan`` where no bracket was found
+
+        ``'iterations'``: number of residual evaluations of every point
+
+        ``'residual'``: residual of the z-model at the returned z
+
+        ``'status'``: status code of every point. 0 = converged, 1 = maximum number of iterations reached,
+        2 = no bracket of the physical root found, 3 = non-finite residual (``Z_SOLVER_STATUS``)
+
+        All values have the broadcast shape of the inputs.
+    """
+    _check_explicit_model_arguments(zmodel, guess, newton_kwargs, smart_guess)
+    z_model = _get_z_model(model=zmodel)
+
+    if Pr is None or Tr is None:
+        Tr, Pr, _ = _calc_Tr_and_Pr(sg=sg, P=P, T=T, H2S=H2S, CO2=CO2, N2=N2, Pr=Pr, Tr=Tr, pmodel=pmodel,
+                                    ignore_conflict=ignore_conflict, **kwargs)
+
+    Z, iterations, residual, status = _calc_z_bracketed_helper(Pr, Tr, z_model, zmodel, guess, newton_kwargs,
+                                                               smart_guess)
+    return {'z': Z, 'iterations': iterations, 'residual': residual, 'status': status}
+
+
+def calc_z_compositional(composition, P=None, T=None, components=None, MW_plus=None, SG_plus=None, mixing='SBV',
+                         acid_correction=True, zmodel='DAK', ps_props=False, **kwargs):
+    """
+    Calculates the z-factor of gas samples from their full compositions (e.g. separator gas analyses), instead of
+    their specific gravity. The pseudo-critical properties of all the samples are computed at once by
+    :func:`~compositional.calc_pseudo_critical`, and the z-factors by the vectorized solver of
+    :ref:`calc_z <calc_z>`.
+
+    >>> composition = np.array([
+    ...     # N2,  CO2,  H2S,  C1,   C2,   C3,   iC4,  nC4,  iC5,  nC5,  C6,   C7+
+    ...     [0.01, 0.02, 0.00, 0.85, 0.06, 0.03, 0.01, 0.01, 0.005, 0.003, 0.001, 0.001],
+    ...     [0.02, 0.10, 0.07, 0.70, 0.06, 0.03, 0.01, 0.005, 0.002, 0.002, 0.001, 0.0],
+    ... ])
+    >>> gc.calc_z_compositional(composition, P=np.array([2000, 3500]), T=180, MW_plus=110, SG_plus=0.75)
+    array([0.85575664, 0.86183395])
+
+    Parameters
+    ----------
+    composition, components, MW_plus, SG_plus, mixing, acid_correction
+        see :func:`~compositional.calc_pseudo_critical`. ``composition`` has shape (n_samples, n_components)
+    P : float or array_like
+        pressure of gas (psig), broadcast against the samples
+    T : float or array_like
+        temperature of gas (°F), broadcast against the samples
+    zmodel : str
+        same as :ref:`calc_z <calc_z>`
+    ps_props : bool or str
+        set this to `True` to also return the pseudo-critical properties of the samples, or ``'record'`` for a compact
+        record, same as :ref:`calc_z <calc_z>`
+    kwargs : dict
+        solver arguments of :ref:`calc_z <calc_z>` (``guess``, ``newton_kwargs``, ``smart_guess``, ``solver``,
+        ``accuracy``, ``fast_tol``)
+
+    Returns
+    -------
+    float or ndarray
+        gas compressibility factor, :math:`Z` (dimensionless), with the broadcast shape of the samples, P and T. A
+        dict with ``'z'``, the pseudo-critical properties of :func:`~compositional.calc_pseudo_critical`, ``'Tr'``
+        and ``'Pr'`` if ``ps_props=True``. A ``ZResult`` or a structured array if ``ps_props='record'``, where
+        ``'Tpc'`` and ``'Ppc'`` are the uncorrected values of the mixing rule
+    """
+    if P is None:
+        raise TypeError("Missing a required argument, P (gas pressure, psig)")
+    if T is None:
+        raise TypeError("Missing a required argument, T (gas temperature, °F)")
+
+    props = calc_pseudo_critical(composition, components=components, MW_plus=MW_plus, SG_plus=SG_plus, mixing=mixing,
+                                 acid_correction=acid_correction)
+    Tr = calc_Fahrenheit_to_Rankine(np.asarray(T, dtype=float)) / props['Tpc_corrected']
+    Pr = calc_psig_to_psia(np.asarray(P, dtype=float)) / props['Ppc_corrected']
+    Z = calc_z(Pr=Pr, Tr=Tr, zmodel=zmodel, **kwargs)
+
+    if ps_props == 'record':
+        return make_z_result(Z, dict(props, Tr=Tr, Pr=Pr))
+    if ps_props is True:
+        ps_props = {'z': Z}
+        ps_props.update(props)
+        ps_props['Tr'] = Tr
+        ps_props['Pr'] = Pr
+        return ps_props
+    return Z
+
+
+def calc_z_all_models(sg=None, P=None, T=None, H2S=None, CO2=None, N2=None, Pr=None, Tr=None, pmodel='piper',
+                      zmodels=None, newton_kwargs=None, ignore_conflict=False, **kwargs):
+    """
+    Calculates the z-factor with several z-models on the same inputs, for model comparison and QC reports.
+
+    The pseudo-critical properties and the initial guesses are computed once. The explicit ``'kareem'`` model is both
+    a result and the first guess of the implicit models, and the temperature-only coefficients are computed once per
+    distinct :math:`T_r`. ``'DAK'`` and ``'londono'`` share the same functional form with different constants, so
+    they are solved together, as one stacked system, with the DAK residual. Each iteration evaluates the residual and
+    its derivatives in one pass, sharing the reduced density and the exponential/power terms.
+
+    >>> res = gc.calc_z_all_models(Pr=np.array([1.5, 3.0]), Tr=np.array([1.5, 1.2]))
+    >>> res['models']
+    ['DAK', 'hall_yarborough', 'londono', 'kareem']
+    >>> res['z']
+    array([[0.85931438, 0.53023979],
+           [0.85812321, 0.53054333],
+           [0.85908632, 0.52580428],
+           [0.85319605, 0.53307155]])
+    >>> res['spread']
+    array([0.00611833, 0.00726727])
+
+    Parameters
+    ----------
+    sg, P, T, H2S, CO2, N2, Pr, Tr, pmodel, ignore_conflict, kwargs
+        same as :ref:`calc_z <calc_z>`
+    zmodels : list of str
+        z-models to compare. Defaults to ``['DAK', 'hall_yarborough', 'londono', 'kareem']``. The other explicit
+        models (``FAST_MODELS``) are compared only on request
+    newton_kwargs : dict
+        ``maxiter``, ``tol`` and ``rtol`` of the elementwise solver
+
+    Returns
+    -------
+    dict
+        ``'models'``: the z-models, in the order of the first axis of ``'z'``
+
+        ``'z'``: gas compressibility factors, :math:`Z` (dimensionless), shape (number of models, ...) where ... is
+        the broadcast shape of the inputs
+
+        ``'mean'``, ``'std'``, ``'min'``, ``'max'``: statistics across the models, with the broadcast shape of the
+        inputs
+
+        ``'spread'``: ``max - min`` across the models
+
+        ``'out_of_range'``: boolean array, same shape as ``'z'``, ``True`` where the point is outside of the working
+        range of the model (extrapolated z-factor). ``res['out_of_range'].sum(axis=-1)`` gives the counts per model
+        of 1-D inputs
+    """
+    if zmodels is None:
+        zmodels = ['DAK', 'hall_yarborough', 'londono', 'kareem']
+    for zmodel in zmodels:
+        _get_z_model(model=zmodel)
+
+    if Pr is None or Tr is None:
+        Tr, Pr, _ = _calc_Tr_and_Pr(sg=sg, P=P, T=T, H2S=H2S, CO2=CO2, N2=N2, Pr=Pr, Tr=Tr, pmodel=pmodel,
+                                    ignore_conflict=ignore_conflict, **kwargs)
+
+    Pr, Tr = np.broadcast_arrays(np.asarray(Pr, dtype=float), np.asarray(Tr, dtype=float))
+    shape = Pr.shape
+    Pr = Pr.ravel()
+    Tr = Tr.ravel()
+    settings = _parse_newton_kwargs_vectorized(newton_kwargs)
+
+    # the explicit models are computed once: 'kareem' is both a result and the first guess of the implicit models
+    Z = {'kareem': kareem(Pr=Pr, Tr=Tr)}
+    for zmodel in zmodels:
+        if zmodel in EXPLICIT_MODELS and zmodel not in Z:
+            Z[zmodel] = models[zmodel](Pr=Pr, Tr=Tr)
+    _, first_guess = _initial_guesses_vectorized(Pr, Tr, None, None, smart_z=Z['kareem'])
+
+    Tr_unique, inverse = np.unique(Tr, return_inverse=True)
+    inverse = inverse.ravel()
+
+    # implicit models grouped by residual: londono is solved with the DAK residual and its own coefficients
+    groups = [(DAK_with_derivatives, [zmodel for zmodel in ['DAK', 'londono'] if zmodel in zmodels]),
+              (hall_yarborough_with_derivatives, [zmodel for zmodel in ['hall_yarborough'] if zmodel in zmodels])]
+    for func, group in groups:
+        if not group:
+            continue
+        coeffs = np.concatenate([MODEL_COEFFICIENTS[zmodel](Tr_unique)[inverse] for zmodel in group])
+        args = (np.tile(Pr, len(group)), np.tile(Tr, len(group)), coeffs)
+        z, converged = _newton_vectorized(func, np.tile(first_guess, len(group)), args=args, fprime=True,
+                                          fprime2=True, **settings)
+
+        for i, zmodel in enumerate(group):
+            Z[zmodel] = z[i * Pr.size:(i + 1) * Pr.size]
+            # points that failed from the first guess, or reached a non-physical root, go through the regular guesses
+            failed = ~(converged[i * Pr.size:(i + 1) * Pr.size] & (Z[zmodel] > _z_lower_bound(zmodel, Pr, Tr)))
+            if failed.any():
+                Z[zmodel][failed] = _calc_z_vectorized_helper(Pr[failed], Tr[failed], models[zmodel], zmodel, None,
+                                                              newton_kwargs, None)
+
+    Z = np.stack([Z[zmodel] for zmodel in zmodels])
+    Z_min = Z.min(axis=0)
+    Z_max = Z.max(axis=0)
+    return {
+        'models': list(zmodels),
+        'z': Z.reshape((len(zmodels),) + shape),
+        'mean': Z.mean(axis=0).reshape(shape),
+        'std': Z.std(axis=0).reshape(shape),
+        'min': Z_min.reshape(shape),
+        'max': Z_max.reshape(shape),
+        'spread': (Z_max - Z_min).reshape(shape),
+        'out_of_range': np.stack([~_in_model_range(Pr, Tr, zmodel) for zmodel in zmodels]).reshape(
+            (len(zmodels),) + shape),
+    }
+
+
+def calc_z_sweep(sg=None, P=None, T=None, H2S=None, CO2=None, N2=None, Pr=None, Tr=None, pmodel='piper',
+                 zmodel='DAK', extrapolate=True, newton_kwargs=None, ignore_conflict=False, **kwargs):
+    """
+    Calculates the z-factor along isotherm or isobar sweeps with continuation (warm start): each point is solved
+    starting from the converged z of the previous point of the sweep, optionally extrapolated linearly from the two
+    previous points. Neighboring points of a sweep have close z-factors, so this takes fewer iterations than the
+    independent guesses of :ref:`calc_z <calc_z>`, and it follows the same root branch along the sweep. Points whose
+    warm start fails, or converges to a non-physical root (:math:`z \\le 0`), are re-solved with the regular guesses.
+
+    The sweep runs along the last axis of the (broadcast) inputs. Leading axes hold independent sweeps, which are
+    advanced together, one step at a time.
+
+    **Isotherms of the standard z-factor chart**
+
+    >>> Prs = np.linspace(0.2, 30, 299)
+    >>> Trs = np.array([1.05, 1.1, 1.2, 1.3, 1.4, 1.5, 1.6, 1.7, 1.8, 1.9, 2.0, 2.2, 2.4, 2.6, 2.8, 3.0])
+    >>> Z = gc.calc_z_sweep(Pr=Prs, Tr=Trs[:, None])
+    >>> Z.shape
+    (16, 299)
+
+    **Pressure sweep of a gas at reservoir temperature**
+
+    >>> gc.calc_z_sweep(sg=0.7, T=180, P=np.linspace(500, 8000, 4))
+    array([0.95360359, 0.88084415, 1.03758159, 1.2567154 ])
+
+    Parameters
+    ----------
+    sg, P, T, H2S, CO2, N2, Pr, Tr, pmodel, zmodel, ignore_conflict, kwargs
+        same as :ref:`calc_z <calc_z>`. The sweep runs along the last axis of the broadcast inputs
+    extrapolate : bool
+        ``True`` (default) to start each point from the linear extrapolation of the two previous points instead of
+        the previous point
+    newton_kwargs : dict
+        ``maxiter``, ``tol`` and ``rtol`` of the elementwise solver
+
+    Returns
+    -------
+    ndarray
+        gas compressibility factor, :math:`Z` (dimensionless), with the broadcast shape of the inputs
+    """
+    if Pr is None or Tr is None:
+        Tr, Pr, _ = _calc_Tr_and_Pr(sg=sg, P=P, T=T, H2S=H2S, CO2=CO2, N2=N2, Pr=Pr, Tr=Tr, pmodel=pmodel,
+                                    ignore_conflict=ignore_conflict, **kwargs)
+
+    Pr, Tr = np.broadcast_arrays(np.atleast_1d(np.asarray(Pr, dtype=float)), np.atleast_1d(np.asarray(Tr, dtype=float)))
+    shape = Pr.shape
+
+    z_model = _get_z_model(model=zmodel)
+    if zmodel in EXPLICIT_MODELS:
+        if newton_kwargs is not None:
+            raise KeyError('calc_z_sweep(model="%s") got an unexpected argument "newton_kwargs"' % zmodel)
+        return z_model(Pr=Pr, Tr=Tr)
+
+    settings = _parse_newton_kwargs_vectorized(newton_kwargs)
+    settings.update(MODEL_DERIVATIVES.get(zmodel, {}))
+
+    Pr = Pr.reshape(-1, shape[-1])
+    Tr = Tr.reshape(-1, shape[-1])
+    Z = np.empty(Pr.shape)
+    args = _model_args(zmodel, Pr, Tr)
+
+    # first point of every sweep: regular guesses
+    Z[:, 0] = _calc_z_vectorized_helper(Pr[:, 0], Tr[:, 0], z_model, zmodel, None, newton_kwargs, None)
+
+    for k in range(1, shape[-1]):
+        guess = Z[:, k - 1]
+        if extrapolate and k >= 2:
+            step = np.hypot(Pr[:, k] - Pr[:, k - 1], Tr[:, k] - Tr[:, k - 1])
+            step_prev = np.hypot(Pr[:, k - 1] - Pr[:, k - 2], Tr[:, k - 1] - Tr[:, k - 2])
+            with np.errstate(divide='ignore', invalid='ignore'):
+                ratio = np.where(step_prev > 0, step / step_prev, 0)
+            guess = guess + (Z[:, k - 1] - Z[:, k - 2]) * ratio
+
+        z, converged = _newton_vectorized(z_model, guess, args=tuple(arg[:, k] for arg in args), **settings)
+        # a non-physical root is not carried forward as the warm start of the next point
+        converged &= z > _z_lower_bound(zmodel, Pr[:, k], Tr[:, k])
+        Z[:, k] = z
+
+        # points where the warm start failed go through the regular guesses
+        if not converged.all():
+            failed = ~converged
+            Z[failed, k] = _calc_z_vectorized_helper(Pr[failed, k], Tr[failed, k], z_model, zmodel, None,
+                                                     newton_kwargs, None)
+
+    return Z.reshape(shape)
+
+
+QUICKSTART_TRS = np.array([1.05, 1.1, 1.2, 1.3, 1.4, 1.5, 1.6, 1.7, 1.8, 1.9, 2.0, 2.2, 2.4, 2.6, 2.8, 3.0])
+
+
+def calc_z_isotherms(zmodel='DAK', prmin=0.2, prmax=30, Trs=None, n_jobs=None, **kwargs):
+    """
+    Computes z-factor isotherms on a :math:`P_r` x :math:`T_r` grid, without plotting. This is the computational part
+    of :ref:`gascompressibility.quickstart <quickstart>`, usable in headless batch jobs.
+
+    The whole grid is written into one preallocated array. By default it is solved in a single vectorized
+    :ref:`calc_z <calc_z>` call; with ``n_jobs`` the grid is split into shards that are solved by a pool of worker
+    processes through shared memory (see ``calc_z_parallel``).
+
+    >>> results = gc.calc_z_isotherms(zmodel='DAK')
+    >>> results[1.05]['Z']
+    array([0.93678555, 0.90305411, ..., 3.18075264])
+
+    The default grid (16 isotherms x 299 pressures) is smaller than ``MIN_SHARD_SIZE`` (10000 points) of
+    ``calc_z_parallel``, so ``n_jobs`` only pays off on finer grids, e.g. 200 isotherms (59800 points, 6 shards):
+
+    >>> results = gc.calc_z_isotherms(zmodel='DAK', Trs=np.linspace(1.05, 3, 200), n_jobs=4)
+
+    Parameters
+    ----------
+    zmodel : str
+        choice of a z-correlation model. Accepted inputs: ``'DAK'`` | ``'hall_yarborough'`` | ``'londono'`` |``'kareem'`` | ``'papay'`` | ``'beggs_brill'``
+    prmin : float
+        minimum value of the :math:`P_r` range
+    prmax : float
+        maximum value of the :math:`P_r` range
+    Trs : array_like
+        :math:`T_r` of the isotherms. Defaults to the 16 isotherms of the standard z-factor chart, ``QUICKSTART_TRS``
+    n_jobs : int
+        number of worker processes used to solve the grid in parallel. ``-1`` uses all CPUs. ``None``
+        (default) solves the whole grid in the current process, as do grids of less than ``MIN_SHARD_SIZE`` points
+    kwargs : dict
+        optional kwargs used by :ref:`gascompressibility.calc_z <calc_z>`. With ``n_jobs``, only the solver
+        arguments (``guess``, ``newton_kwargs``, ``smart_guess``, ``solver``, ``accuracy``, ``fast_tol``) are
+        supported
+
+    Returns
+    -------
+    results: dict
+        dictionary of the simulation result, with the same structure as the ``results`` returned by
+        :ref:`gascompressibility.quickstart <quickstart>`. ``results[Tr]['Z']`` are rows of a single
+        ``(len(Trs), len(Prs))`` array.
+    """
+    if prmin <= 0:
+        raise TypeError("Value of prmin must be greater than 0. Try prmin=0.1")
+
+    Prs = np.linspace(prmin, prmax, round(prmax * 10 + 1))
+    Prs = np.round(Prs, 1)
+
+    Trs = QUICKSTART_TRS if Trs is None else np.asarray(Trs, dtype=float)
+
+    Pr_grid, Tr_grid = np.meshgrid(Prs, Trs)
+    if n_jobs is None:
+        Zs = calc_z(Pr=Pr_grid, Tr=Tr_grid, zmodel=zmodel, **kwargs)
+    else:
+        # deferred: zparallel.py imports this module
+        from function.z_corellation_function.zparallel import calc_z_parallel
+        Zs = calc_z_parallel(Pr=Pr_grid, Tr=Tr_grid, zmodel=zmodel, n_jobs=n_jobs, **kwargs)
+
+    results = {Tr: {
+        'Pr': Prs,
+        'Z': Zs[k],
+    } for k, Tr in enumerate(Trs)}
+
+    return results
+
+
+def plot_z_isotherms(
+        results,
+        zmodel='DAK',
+        figsize=(8, 5),
+        title_bold=None,
+        title_plain=None,
+        title_underline_loc=0.93,
+        disable_tr_annotation=False,
+):
+    """
+    Plots z-factor isotherms computed by :func:`calc_z_isotherms`. This is the plotting part of
+    :ref:`gascompressibility.quickstart <quickstart>`.
+
+    >>> results = gc.calc_z_isotherms(zmodel='londono')
+    >>> fig, ax = gc.plot_z_isotherms(results, zmodel='londono')
+
+    Parameters
+    ----------
+    results : dict
+        isotherms returned by :func:`calc_z_isotherms`
+    zmodel : str
+        name of the z-correlation model, shown in the plot annotation
+    figsize : tuple
+        matplotlib figure size
+    title_bold : str
+        string of the bold (left) portion of the figure title
+    title_plain : str
+        string of the plain (right) portion of the figure title
+    title_underline_loc : float
+        vertical location of the horizontal bar under the title
+    disable_tr_annotation : bool
+        set this to ``True`` to not display :math:`T_r` text annotations
+
+    Returns
+    -------
+    fig : `Figure <https://matplotlib.org/stable/api/_as_gen/matplotlib.pyplot.subplots.html>`_
+        Matplotlib figure object
+    ax : `Axis <https://matplotlib.org/stable/api/axis_api.html#axis-objects>`_
+        Matplotlib axis object
+    """
+    label_fontsize = 12
+
+    fig, ax = plt.subplots(figsize=figsize)
+    for Tr, result in results.items():
+
+        Prs = result['Pr']
+        Zs = result['Z']
+        idx_min = np.argmin(Zs)
+
+        p = ax.plot(Prs, Zs)
+
+        if not disable_tr_annotation:
+            if Tr == 1.05:
+                t = ax.text(Prs[idx_min] - 0.5, Zs[idx_min] - 0.005, '$T_{r}$ = 1.05', color=p[0].get_color())
+                t.set_bbox(dict(facecolor='white', alpha=0.9, edgecolor='white', pad=1))
+            else:
+                t = ax.text(Prs[idx_min] - 0.2, Zs[idx_min] - 0.005, Tr, color=p[0].get_color())
+                t.set_bbox(dict(facecolor='white', alpha=0.9, edgecolor='white', pad=1))
+
+    Prs = next(iter(results.values()))['Pr']
+    ax.set_xlim(Prs[0], Prs[-1])
+
+    ax.minorticks_on()
+    ax.grid(alpha=0.5)
+    ax.grid(visible=True, which='minor', alpha=0.1)
+    ax.spines.top.set_visible(False)
+    ax.spines.right.set_visible(False)
+
+    ax.set_ylabel('Compressibility Factor, $Z$', fontsize=label_fontsize)
+    ax.set_xlabel('Pseudo-Reduced Pressure, $P_{r}$', fontsize=label_fontsize)
+    ax.text(0.57, 0.08, '$T_{r}$ = Pseudo-Reduced Temperature', fontsize=11, transform=ax.transAxes,
+            bbox=dict(facecolor='white'))
+    ax.text(0.05, 0.9, "zmodel = '%s'" % zmodel, fontsize=11, transform=ax.transAxes,
+            bbox=dict(facecolor='white'), va='center', ha='left')
+
+    def setbold(txt):
+        return ' '.join([r"$\bf{" + item + "}$" for item in txt.split(' ')])
+
+    if title_bold is None:
+        title_bold = setbold('Gas Compressibility Factor - Z')
+    else:
+        title_bold = setbold(title_bold)
+
+    if title_plain is None:
+        title_plain = ', computed with GasCompressiblityFactor-py '
+
+    fig.suptitle(title_bold + title_plain, verticalalignment='top', x=0, horizontalalignment='left', fontsize=12)
+    ax.annotate('', xy=(0.01, title_underline_loc), xycoords='figure fraction', xytext=(1.02, title_underline_loc),
+                arrowprops=dict(arrowstyle="-", color='k'))
+
+    fig.tight_layout()
+
+    return fig, ax
+
+
 def quickstart(
         zmodel='DAK',
         prmin=0.2,
@@ -311,6 +1755,7 @@ def quickstart(
         title_plain=None,
         title_underline_loc=0.93,
         disable_tr_annotation=False,
+        n_jobs=None,
         **kwargs
 ):
     """
@@ -374,7 +1819,7 @@ def quickstart(
     zmodel : str
         choice of a z-correlation model.
         Check :ref:`Theories 2: Z-Factor Correlation Models <theories:2. Z-Factor Correlation Models>` for more information.
-        Accepted inputs: ``'DAK'`` | ``'hall_yarborough'`` | ``'londono'`` |``'kareem'``
+        Accepted inputs: ``'DAK'`` | ``'hall_yarborough'`` | ``'londono'`` |``'kareem'`` | ``'papay'`` | ``'beggs_brill'``
     prmin : float
         minimum value of the :math:`P_r` range
     prmax : float
@@ -390,6 +1835,8 @@ def quickstart(
         title underline looks off
     disable_tr_annotation : bool
         set this to ``True`` to not display :math:`T_r` text annotations
+    n_jobs : int
+        number of worker processes used to solve the isotherms in parallel. See :func:`calc_z_isotherms`
     kwargs : dict
         optional kwargs used py :ref:`gascompressibility.calc_z <calc_z>`.
     Returns
@@ -422,80 +1869,10 @@ def quickstart(
     ax : `Axis <https://matplotlib.org/stable/api/axis_api.html#axis-objects>`_
         Matplotlib axis object
     """
-    if prmin <= 0:
-        raise TypeError("Value of prmin must be greater than 0. Try prmin=0.1")
-
-    Prs = np.linspace(prmin, prmax, round(prmax * 10 + 1))
-    Prs = np.array([round(Pr, 1) for Pr in Prs])
-
-    Trs = np.array([1.05, 1.1, 1.2, 1.3, 1.4, 1.5, 1.6, 1.7, 1.8, 1.9, 2.0, 2.2, 2.4, 2.6, 2.8, 3.0])
-
-    results = {Tr: {
-        'Pr': np.array([]),
-        'Z': np.array([])
-    } for Tr in Trs}
-
-    for Tr in Trs:
-        for Pr in Prs:
-
-            if zmodel == 'kareem':
-                z = calc_z(Tr=Tr, Pr=Pr, zmodel=zmodel, **kwargs)
-            else:
-                z = calc_z(Tr=Tr, Pr=Pr, zmodel=zmodel, newton_kwargs={'maxiter': 50}, **kwargs)
-
-            results[Tr]['Z'] = np.append(results[Tr]['Z'], [z], axis=0)
-            results[Tr]['Pr'] = np.append(results[Tr]['Pr'], [Pr], axis=0)
-
-    label_fontsize = 12
-
-    fig, ax = plt.subplots(figsize=figsize)
-    for Tr in Trs:
-
-        Zs = results[Tr]['Z']
-        idx_min = np.where(Zs == min(Zs))[0][0]
-
-        p = ax.plot(Prs, Zs)
-
-        if not disable_tr_annotation:
-            if Tr == 1.05:
-                t = ax.text(Prs[idx_min] - 0.5, min(Zs) - 0.005, '$T_{r}$ = 1.05', color=p[0].get_color())
-                t.set_bbox(dict(facecolor='white', alpha=0.9, edgecolor='white', pad=1))
-                pass
-            else:
-                t = ax.text(Prs[idx_min] - 0.2, min(Zs) - 0.005, Tr, color=p[0].get_color())
-                t.set_bbox(dict(facecolor='white', alpha=0.9, edgecolor='white', pad=1))
-                pass
-
-    ax.set_xlim(prmin, prmax)
-
-    ax.minorticks_on()
-    ax.grid(alpha=0.5)
-    ax.grid(visible=True, which='minor', alpha=0.1)
-    ax.spines.top.set_visible(False)
-    ax.spines.right.set_visible(False)
-
-    ax.set_ylabel('Compressibility Factor, $Z$', fontsize=label_fontsize)
-    ax.set_xlabel('Pseudo-Reduced Pressure, $P_{r}$', fontsize=label_fontsize)
-    ax.text(0.57, 0.08, '$T_{r}$ = Pseudo-Reduced Temperature', fontsize=11, transform=ax.transAxes,
-            bbox=dict(facecolor='white'))
-    ax.text(0.05, 0.9, "zmodel = '%s'" % zmodel, fontsize=11, transform=ax.transAxes,
-            bbox=dict(facecolor='white'), va='center', ha='left')
-
-    def setbold(txt):
-        return ' '.join([r"$\bf{" + item + "}$" for item in txt.split(' ')])
-
-    if title_bold is None:
-        title_bold = setbold('Gas Compressibility Factor - Z')
-    else:
-        title_bold = setbold(title_bold)
-
-    if title_plain is None:
-        title_plain = ', computed with GasCompressiblityFactor-py '
-
-    fig.suptitle(title_bold + title_plain, verticalalignment='top', x=0, horizontalalignment='left', fontsize=12)
-    ax.annotate('', xy=(0.01, title_underline_loc), xycoords='figure fraction', xytext=(1.02, title_underline_loc),
-                arrowprops=dict(arrowstyle="-", color='k'))
-
-    fig.tight_layout()
+    results = calc_z_isotherms(zmodel=zmodel, prmin=prmin, prmax=prmax, n_jobs=n_jobs, **kwargs)
+    fig, ax = plot_z_isotherms(
+        results, zmodel=zmodel, figsize=figsize, title_bold=title_bold, title_plain=title_plain,
+        title_underline_loc=title_underline_loc, disable_tr_annotation=disable_tr_annotation,
+    )
 
-    return results, fig, ax
\ No newline at end of file
+    return results, fig, ax
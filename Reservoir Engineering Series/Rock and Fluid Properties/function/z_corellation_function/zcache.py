@@ -0,0 +1,390 @@
+from collections import OrderedDict
+import numpy as np
+import sys
+sys.path.append("Reservoir Engineering Series/Rock and Fluid Properties")
+from function.z_corellation_function.value import calc_z, _calc_Tr_and_Pr, _check_explicit_model_arguments, \
+    _is_array_input, pmodels_ks
+from function.z_corellation_function.zresult import make_z_result
+from function.pseudocritical.piper_new import piper_critical
+from function.pseudocritical.sutton_new import sutton_critical
+from utilities import calc_Fahrenheit_to_Rankine, calc_psig_to_psia
+
+"""
+Opt-in memoization layer for calc_z.
+
+Workflows like material balance and well-test analysis evaluate the same gas states over and over. ZCache keeps two
+bounded LRU caches:
+
+    1. gas state (sg, P, T, impurities, pmodel)  ->  (Tr, Pr, pseudo-critical properties)
+    2. (zmodel, quantized Pr, quantized Tr)       ->  z
+
+A repeated gas state is answered from both caches, skipping the pseudo-critical step and the root solve.
+
+Fields with a few gas analyses evaluated at many pressure/temperature states are served by PseudoCriticalCache
+instead, keyed by composition only:
+
+    (pmodel, sg, H2S, CO2, N2)  ->  Tpc, Ppc and the other composition-level properties
+
+so that every state only computes Tr = T / Tpc and Pr = P / Ppc, for scalar and array inputs alike.
+"""
+
+_MISSING = object()
+
+
+class _LRUCache(object):
+    """Bounded mapping that evicts the least recently used entry, with hit/miss/eviction counters"""
+
+    def __init__(self, maxsize):
+        if maxsize < 1:
+            raise ValueError("maxsize must be a positive integer")
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        value = self._data.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._data.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hit_rate': self.hits / lookups if lookups > 0 else 0.0,
+        }
+
+
+def _freeze(value):
+    """hashable form of a calc_z keyword argument"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+class ZCache(object):
+    """
+    Memoizing wrapper around :ref:`calc_z <calc_z>` for repeated scalar evaluations.
+
+    **Basic usage**
+
+    >>> cache = ZCache(maxsize=10000, Pr_resolution=1e-4, Tr_resolution=1e-4)
+    >>> cache.calc_z(sg=0.7, T=75, P=2010)  # solved at the quantized Pr=3.0647, Tr=1.4395
+    0.7366716759064491
+    >>> cache.calc_z(sg=0.7, T=75, P=2010)  # served from the cache
+    0.7366716759064491
+    >>> cache.stats()
+    {'pseudo_critical': {'hits': 1, 'misses': 1, 'evictions': 0, 'size': 1, 'maxsize': 10000, 'hit_rate': 0.5},
+     'z': {'hits': 1, 'misses': 1, 'evictions': 0, 'size': 1, 'maxsize': 10000, 'hit_rate': 0.5},
+     'bypassed': 0}
+
+    Parameters
+    ----------
+    maxsize : int
+        maximum number of entries of each of the two caches. The least recently used entry is evicted first
+    Pr_resolution : float
+        quantization step of :math:`P_r` in the z cache. z is solved at the quantized :math:`P_r`, so that every
+        input that maps to the same cache entry gets the same value. ``None`` (default) disables quantization
+    Tr_resolution : float
+        quantization step of :math:`T_r` in the z cache. ``None`` (default) disables quantization
+    """
+
+    def __init__(self, maxsize=65536, Pr_resolution=None, Tr_resolution=None):
+        self.Pr_resolution = Pr_resolution
+        self.Tr_resolution = Tr_resolution
+        self._pseudo_critical_cache = _LRUCache(maxsize)
+        self._z_cache = _LRUCache(maxsize)
+        self.bypassed = 0
+        """number of calls that bypassed the cache (array inputs)"""
+
+    def __repr__(self):
+        return '<ZCache: %s>' % self.stats()
+
+    @staticmethod
+    def _quantize(x, resolution):
+        if resolution is None:
+            return x, float(x)
+        index = int(round(x / resolution))
+        return index, index * resolution
+
+    def _cached_z(self, Pr, Tr, zmodel, guess, newton_kwargs, smart_guess, solver, accuracy, fast_tol):
+        Pr_key, Pr_q = self._quantize(Pr, self.Pr_resolution)
+        Tr_key, Tr_q = self._quantize(Tr, self.Tr_resolution)
+        key = (zmodel, Pr_key, Tr_key, guess, _freeze(newton_kwargs), smart_guess, solver, accuracy, fast_tol)
+
+        Z = self._z_cache.get(key)
+        if Z is _MISSING:
+            Z = calc_z(Pr=Pr_q, Tr=Tr_q, zmodel=zmodel, guess=guess, newton_kwargs=newton_kwargs,
+                       smart_guess=smart_guess, solver=solver, accuracy=accuracy, fast_tol=fast_tol)
+            self._z_cache.put(key, Z)
+        return Z
+
+    def calc_z(self, sg=None, P=None, T=None, H2S=None, CO2=None, N2=None, Pr=None, Tr=None, pmodel='piper',
+               zmodel='DAK', guess=None, newton_kwargs=None, smart_guess=None, ps_props=False, ignore_conflict=False,
+               solver='newton', accuracy='exact', fast_tol=0.005, **kwargs):
+        """
+        Same arguments and return values as :ref:`calc_z <calc_z>`. Scalar calls are memoized, separately for every
+        ``solver``, ``accuracy`` and ``fast_tol``; array inputs are passed to :ref:`calc_z <calc_z>` unchanged.
+        """
+        if _is_array_input(sg, P, T, H2S, CO2, N2, Pr, Tr):
+            self.bypassed += 1
+            return calc_z(sg=sg, P=P, T=T, H2S=H2S, CO2=CO2, N2=N2, Pr=Pr, Tr=Tr, pmodel=pmodel, zmodel=zmodel,
+                          guess=guess, newton_kwargs=newton_kwargs, smart_guess=smart_guess, ps_props=ps_props,
+                          ignore_conflict=ignore_conflict, solver=solver, accuracy=accuracy, fast_tol=fast_tol,
+                          **kwargs)
+
+        _check_explicit_model_arguments(zmodel, guess, newton_kwargs, smart_guess)
+
+        # Pr and Tr are already provided:
+        if Pr is not None and Tr is not None:
+            Z = self._cached_z(Pr, Tr, zmodel, guess, newton_kwargs, smart_guess, solver, accuracy, fast_tol)
+            if ps_props == 'record':
+                return make_z_result(Z, {'Pr': Pr, 'Tr': Tr})
+            if ps_props is True:
+                return {'z': Z, 'Pr': Pr, 'Tr': Tr}
+            return Z
+
+        # Pr and Tr are NOT provided:
+        key = (pmodel, sg, P, T, H2S, CO2, N2, Pr, Tr, ignore_conflict, _freeze(kwargs))
+        cached = self._pseudo_critical_cache.get(key)
+        if cached is _MISSING:
+            Tr, Pr, pc_props = _calc_Tr_and_Pr(sg=sg, P=P, T=T, H2S=H2S, CO2=CO2, N2=N2, Pr=Pr, Tr=Tr,
+                                               pmodel=pmodel, ignore_conflict=ignore_conflict, **kwargs)
+            cached = (Tr, Pr, dict(pc_props))
+            self._pseudo_critical_cache.put(key, cached)
+        Tr, Pr, props = cached
+
+        Z = self._cached_z(Pr, Tr, zmodel, guess, newton_kwargs, smart_guess, solver, accuracy, fast_tol)
+
+        if ps_props == 'record':
+            return make_z_result(Z, dict(props, Tr=Tr, Pr=Pr))
+        if ps_props is True:
+            ps_props = {'z': Z}
+            ps_props.update(props)
+            ps_props['Tr'] = Tr
+            ps_props['Pr'] = Pr
+            return ps_props
+        return Z
+
+    def stats(self):
+        """hit/miss/eviction counters of the pseudo-critical and z caches, for monitoring"""
+        return {
+            'pseudo_critical': self._pseudo_critical_cache.stats(),
+            'z': self._z_cache.stats(),
+            'bypassed': self.bypassed,
+        }
+
+    def clear(self):
+        """empties both caches and resets the counters"""
+        self._pseudo_critical_cache.clear()
+        self._z_cache.clear()
+        self.bypassed = 0
+
+
+# composition-level function of every pseudo-critical model: (function, composition arguments, keys of the
+# pseudo-critical temperature and pressure that T and P are reduced with)
+_COMPOSITION_MODELS = {
+    'piper': (piper_critical, ('sg', 'H2S', 'CO2', 'N2'), 'Tpc', 'Ppc'),
+    'sutton': (sutton_critical, ('sg', 'H2S', 'CO2'), 'Tpc_corrected', 'Ppc_corrected'),
+}
+
+
+def _group_rows(columns, max_groups):
+    """
+    labels of the distinct rows of equal-size 1-D columns, and the index of the first row of every label. Each
+    distinct row costs one pass over the columns, so (None, None) is returned as soon as there are more than
+    ``max_groups`` distinct rows
+    """
+    labels = np.full(columns[0].size, -1)
+    first = []
+    while len(first) < max_groups:
+        unlabeled = labels < 0
+        i = int(np.argmax(unlabeled))
+        if not unlabeled[i]:
+            return labels, first
+        match = unlabeled
+        for column in columns:
+            match &= column == column[i]
+        # NaN rows never compare equal: they form a group of their own
+        match[i] = True
+        labels[match] = len(first)
+        first.append(i)
+    if (labels < 0).any():
+        return None, None
+    return labels, first
+
+
+class PseudoCriticalCache(object):
+    """
+    Composition-keyed cache of the pseudo-critical step of :ref:`calc_z <calc_z>`.
+
+    The composition-level properties (``Tpc``, ``Ppc``, ``J`` and ``K`` of Piper, the Wichert-Aziz corrected
+    values of Sutton) depend only on the gas analysis (pmodel, sg, H2S, CO2, N2). They are computed once per
+    distinct analysis and kept in a bounded LRU cache, and every call only reduces T and P with them. Array inputs
+    are grouped by distinct analysis first, so a batch of many states of a few analyses takes one cache lookup per
+    analysis.
+
+    **Basic usage**
+
+    >>> pc_cache = PseudoCriticalCache()
+    >>> sg = np.array([0.7, 0.7, 0.8, 0.8])
+    >>> pc_cache.calc_z(sg=sg, P=np.array([1000, 2000, 3000, 4000]), T=180, H2S=0.07, CO2=0.1)
+    array([0.92198682, 0.87463391, 0.82540827, 0.86939631])
+    >>> pc_cache.calc_z(sg=0.7, P=5000, T=200, H2S=0.07, CO2=0.1)
+    0.9649566348105513
+    >>> pc_cache.stats()
+    {'hits': 1, 'misses': 2, 'evictions': 0, 'size': 2, 'maxsize': 1024, 'hit_rate': 0.3333333333333333, 'states': 5,
+     'bypassed': 0}
+
+    Parameters
+    ----------
+    maxsize : int
+        maximum number of cached gas analyses. The least recently used analysis is evicted first
+    max_groups : int
+        maximum number of distinct analyses in an array call for the call to go through the cache. Calls with more
+        are computed directly, which is cheaper than grouping, and counted as ``'bypassed'``
+    """
+
+    def __init__(self, maxsize=1024, max_groups=64):
+        self.max_groups = max_groups
+        self._cache = _LRUCache(maxsize)
+        self.states = 0
+        """number of (P, T) states reduced"""
+        self.bypassed = 0
+        """number of array calls with more than ``max_groups`` distinct analyses, computed without the cache"""
+
+    def __repr__(self):
+        return '<PseudoCriticalCache: %s>' % self.stats()
+
+    def _composition_props(self, pmodel, composition):
+        """composition-level properties of one gas analysis, from the cache if it was seen before"""
+        key = (pmodel,) + composition
+        props = self._cache.get(key)
+        if props is _MISSING:
+            func, names = _COMPOSITION_MODELS[pmodel][:2]
+            props = func(**dict(zip(names, composition)))
+            self._cache.put(key, props)
+        return props
+
+    def calc_Tr_and_Pr(self, sg=None, P=None, T=None, H2S=None, CO2=None, N2=None, pmodel='piper'):
+        """
+        Pseudo-critical step of :ref:`calc_z <calc_z>` with cached composition-level properties. Inputs can be
+        floats or arrays of broadcastable shapes.
+
+        Returns
+        -------
+        tuple
+            (Tr, Pr, ps_props), where ``ps_props`` holds the same pseudo-critical properties as
+            ``calc_z(ps_props=True)``
+        """
+        if pmodel not in _COMPOSITION_MODELS:
+            raise KeyError(
+                'Pseudo-critical model "%s" is not implemented. Choose from the list of available models: %s' % (pmodel, pmodels_ks)
+            )
+        if pmodel == 'sutton' and N2 is not None:
+            raise KeyError('pmodel="sutton" does not support N2 as input. Set N2=None')
+        if sg is None:
+            raise TypeError("Missing a required argument, sg (specific gravity, dimensionless)")
+        if P is None:
+            raise TypeError("Missing a required argument, P (gas pressure, psig)")
+        if T is None:
+            raise TypeError("Missing a required argument, T (gas temperature, °F)")
+
+        _, names, Tpc_key, Ppc_key = _COMPOSITION_MODELS[pmodel]
+        given = {'sg': sg, 'H2S': H2S, 'CO2': CO2, 'N2': N2}
+        composition = [given[name] for name in names]
+
+        if not _is_array_input(*composition):
+            props = dict(self._composition_props(pmodel, tuple(composition)))
+        else:
+            # one lookup per distinct analysis. Omitted impurities stay None: they change the Sutton correction
+            present = [k for k, value in enumerate(composition) if value is not None]
+            columns = [column.ravel() for column in
+                       np.broadcast_arrays(*[np.asarray(composition[k], dtype=float) for k in present])]
+            shape = np.broadcast_shapes(*[np.shape(composition[k]) for k in present])
+            labels, first = _group_rows(columns, self.max_groups)
+
+            if labels is None:
+                # too many distinct analyses to be worth grouping: computed directly, without the cache
+                self.bypassed += 1
+                analysis = list(composition)
+                for k, column in zip(present, columns):
+                    analysis[k] = column.reshape(shape)
+                props = dict(_COMPOSITION_MODELS[pmodel][0](**dict(zip(names, analysis))))
+            else:
+                unique_props = []
+                for i in first:
+                    analysis = [None] * len(names)
+                    for k, column in zip(present, columns):
+                        analysis[k] = float(column[i])
+                    unique_props.append(self._composition_props(pmodel, tuple(analysis)))
+
+                props = {}
+                for name, value in unique_props[0].items():
+                    if value is None:
+                        props[name] = None
+                    else:
+                        props[name] = np.array([entry[name] for entry in unique_props])[labels].reshape(shape)
+
+        props['Tr'] = calc_Fahrenheit_to_Rankine(T) / props[Tpc_key]
+        props['Pr'] = calc_psig_to_psia(P) / props[Ppc_key]
+        self.states += int(np.size(props['Pr']))
+        return props['Tr'], props['Pr'], props
+
+    def calc_z(self, sg=None, P=None, T=None, H2S=None, CO2=None, N2=None, pmodel='piper', zmodel='DAK',
+               ps_props=False, **kwargs):
+        """
+        Same as :ref:`calc_z <calc_z>` for gas-analysis inputs, with the pseudo-critical step served from the cache.
+        ``kwargs`` are the solver arguments of :ref:`calc_z <calc_z>` (``guess``, ``newton_kwargs``,
+        ``smart_guess``, ``solver``, ``accuracy``, ``fast_tol``)
+        """
+        Tr, Pr, props = self.calc_Tr_and_Pr(sg=sg, P=P, T=T, H2S=H2S, CO2=CO2, N2=N2, pmodel=pmodel)
+        Z = calc_z(Pr=Pr, Tr=Tr, zmodel=zmodel, **kwargs)
+        if ps_props == 'record':
+            return make_z_result(Z, props)
+        if ps_props is True:
+            ps_props = {'z': Z}
+            ps_props.update(props)
+            return ps_props
+        return Z
+
+    def stats(self):
+        """
+        hit/miss/eviction counters of the cache, its size (number of cached gas analyses), hit rate per analysis
+        lookup, number of states reduced, and number of array calls that bypassed the cache
+        """
+        stats = self._cache.stats()
+        stats['states'] = self.states
+        stats['bypassed'] = self.bypassed
+        return stats
+
+    def clear(self):
+        """empties the cache and resets the counters"""
+        self._cache.clear()
+        self.states = 0
+        self.bypassed = 0
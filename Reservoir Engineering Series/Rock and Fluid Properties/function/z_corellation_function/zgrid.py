@@ -0,0 +1,135 @@
+import json
+import struct
+import zipfile
+import numpy as np
+
+"""
+Binary storage of z-factor and property grids.
+
+A grid file is an uncompressed ``.npz`` archive (readable with ``np.load``) holding the axes ``Pr`` and ``Tr``, any
+number of named grids of shape (n_Tr, n_Pr, ...), or (n_Tr - 1, n_Pr - 1, ...) for values per cell, and a JSON
+metadata string. Since the members are stored uncompressed, read_grid memory-maps them straight from the file:
+several processes opening the same file share one copy of the data through the page cache, and only the pages that
+are actually read are loaded.
+"""
+
+GRID_FORMAT_VERSION = '1.0'
+
+_LOCAL_HEADER_SIZE = 30  # fixed part of a zip local file header
+
+
+def write_grid(path, Pr, Tr, grids, metadata=None):
+    """
+    Writes grids on a :math:`T_r` x :math:`P_r` mesh to a binary grid file.
+
+    >>> write_grid('z_dak.npz', Pr, Tr, {'z': Z}, metadata={'zmodel': 'DAK'})
+
+    Parameters
+    ----------
+    path : str
+        output file, ``.npz``
+    Pr : array_like
+        1-D pseudo-reduced pressure axis, of size n_Pr
+    Tr : array_like
+        1-D pseudo-reduced temperature axis, of size n_Tr
+    grids : dict
+        named arrays whose first two axes are (n_Tr, n_Pr) for values at the grid nodes, e.g.
+        ``{'z': Z, 'dz_dPr': dz_dPr}``, or (n_Tr - 1, n_Pr - 1) for values per grid cell
+    metadata : dict
+        JSON-serializable description of the grids (model, units, ...)
+    """
+    Pr = np.ascontiguousarray(Pr, dtype=np.float64)
+    Tr = np.ascontiguousarray(Tr, dtype=np.float64)
+    if Pr.ndim != 1 or Tr.ndim != 1:
+        raise ValueError("Pr and Tr must be 1-D axes")
+
+    arrays = {}
+    for name, grid in grids.items():
+        if name in ['Pr', 'Tr', 'metadata']:
+            raise KeyError('"%s" is reserved for the axes and the metadata of the grid file' % name)
+        grid = np.ascontiguousarray(grid)
+        if grid.shape[:2] not in [(Tr.size, Pr.size), (Tr.size - 1, Pr.size - 1)]:
+            raise ValueError('grid "%s" has shape %s, expected (n_Tr, n_Pr, ...) = (%d, %d, ...) for node values or '
+                             '(n_Tr - 1, n_Pr - 1, ...) for cell values' % (name, grid.shape, Tr.size, Pr.size))
+        arrays[name] = grid
+
+    metadata = dict(metadata or {})
+    metadata['format_version'] = GRID_FORMAT_VERSION
+    metadata['grids'] = list(arrays)
+    np.savez(path, Pr=Pr, Tr=Tr, metadata=np.array(json.dumps(metadata)), **arrays)
+
+
+def _memmap_member(f, path, info):
+    """memory-maps an uncompressed .npy member of a zip archive"""
+    f.seek(info.header_offset)
+    local_header = f.read(_LOCAL_HEADER_SIZE)
+    name_length, extra_length = struct.unpack('<HH', local_header[26:30])
+    f.seek(info.header_offset + _LOCAL_HEADER_SIZE + name_length + extra_length)
+
+    version = np.lib.format.read_magic(f)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+    if dtype.hasobject:
+        raise ValueError('"%s" holds Python objects, which cannot be memory-mapped' % info.filename)
+    if int(np.prod(shape)) == 0:
+        return np.empty(shape, dtype=dtype)
+
+    return np.memmap(path, dtype=dtype, mode='r', offset=f.tell(), shape=shape, order='F' if fortran_order else 'C')
+
+
+def read_grid(path, mmap=True):
+    """
+    Reads a grid file written by :func:`write_grid`.
+
+    >>> grid = read_grid('z_dak.npz')
+    >>> grid['metadata']['zmodel']
+    'DAK'
+    >>> z = grid['z'][10, 200]  # only the pages holding this value are read from disk
+
+    Parameters
+    ----------
+    path : str
+        grid file
+    mmap : bool
+        ``True`` (default) to memory-map the arrays (read-only). ``False`` loads them in memory
+
+    Returns
+    -------
+    dict
+        ``'Pr'``, ``'Tr'``, every stored grid by name, and ``'metadata'`` (dict)
+    """
+    grid = {}
+    if mmap:
+        with zipfile.ZipFile(path) as archive, open(path, 'rb') as f:
+            for info in archive.infolist():
+                name = info.filename[:-len('.npy')] if info.filename.endswith('.npy') else info.filename
+                if info.compress_type != zipfile.ZIP_STORED or name == 'metadata':
+                    with archive.open(info) as member:
+                        grid[name] = np.lib.format.read_array(member)
+                else:
+                    grid[name] = _memmap_member(f, path, info)
+    else:
+        with np.load(path) as data:
+            grid = {name: data[name] for name in data.files}
+
+    grid['metadata'] = json.loads(str(grid['metadata'])) if 'metadata' in grid else {}
+    return grid
+
+
+def read_csv_grid(path):
+    """
+    Reads a wide z-factor grid CSV file, like ``output/z_factors.csv``, whose header row holds the :math:`P_r` values
+    and whose first column holds the :math:`T_r` values. Returns (Pr, Tr, z).
+    """
+    data = np.genfromtxt(path, delimiter=',')
+    return data[0, 1:], data[1:, 0], data[1:, 1:]
+
+
+def convert_csv_grid(csv_path, path, name='z', metadata=None):
+    """Converts a wide grid CSV file (see :func:`read_csv_grid`) to a binary grid file"""
+    Pr, Tr, values = read_csv_grid(csv_path)
+    metadata = dict(metadata or {})
+    metadata.setdefault('source', csv_path)
+    write_grid(path, Pr, Tr, {name: values}, metadata=metadata)
@@ -0,0 +1,254 @@
+import numpy as np
+import sys
+sys.path.append("Reservoir Engineering Series/Rock and Fluid Properties")
+from function.z_corellation_function.value import _calc_Tr_and_Pr, _model_args, _bracketed_newton_vectorized, \
+    _parse_newton_kwargs_vectorized, _get_z_model, models, EXPLICIT_MODELS, MODEL_RANGES
+from function.z_corellation_function.dranchuk_kaseem import DAK
+from function.z_corellation_function.hall_yarborough import hall_yarborough
+from utilities import calc_Fahrenheit_to_Rankine, calc_psig_to_psia
+
+"""
+Inverse z-factor calculations: pressure from a target p/z (material balance) or from a target gas density.
+
+Both targets fix Pr / z for a given gas and temperature. The implicit z-models are equations of state written in a
+reduced density proportional to Pr / z (rho_r = 0.27 * Pr / (z * Tr) for DAK and londono, y = A1 * Pr / z for
+Hall-Yarborough), so the inverse problem is explicit for them: the density is known, z follows from the equation of
+state, and Pr = (Pr / z) * z. No root finding is needed, and arrays of targets are solved in one pass. Only the
+explicit models ('kareem', 'papay', 'beggs_brill'), which are not written in density, are inverted iteratively
+within their Pr range, and only where the target p/z is reached at a single pressure.
+"""
+
+GAS_CONSTANT = 10.7316
+"""universal gas constant, R (psia ft3 / (lbmol °R))"""
+AIR_MOLECULAR_WEIGHT = 28.97
+"""apparent molecular weight of air (lbm / lbmol)"""
+EXPLICIT_INVERSE_GRID_SIZE = 256
+"""number of Pr cells of the isotherms tabulated to bracket the inverse of the explicit z-models"""
+
+# points per (points x grid) comparison, and points of the refinement of the local extremes of the isotherms
+_EXPLICIT_INVERSE_CHUNK = 4096
+_EXPLICIT_INVERSE_REFINE = 65
+
+
+def _DAK_form_inverse(Pr_z, coeffs):
+    """z and Pr of an equation of the DAK form for known Pr / z: z is the right-hand side at rho_r = c5 * Pr / z"""
+    Z = DAK(1.0, Pr_z, None, coeffs) + 1.0
+    return Z, Pr_z * Z
+
+
+def _hall_yarborough_inverse(Pr_z, coeffs):
+    """z and Pr of Hall-Yarborough for known Pr / z: A1 * Pr is the density terms of the equation at y = A1 * Pr / z"""
+    A1 = coeffs.T[0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Pr = hall_yarborough(1.0, Pr_z, None, coeffs) / A1 + Pr_z
+        Z = np.where(Pr_z > 0, Pr / Pr_z, 1.0)
+    # reduced density above the close-packing limit y = 1: no physical solution
+    Z[A1 * Pr_z >= 1] = np.nan
+    return Z, Pr
+
+
+def _explicit_isotherms(Pr, Tr, zmodel_func):
+    """
+    Pr / z of an explicit model on the isotherms Tr (rows) at the pressures Pr (rows, or shared). Zero pressure
+    (ideal gas) is not evaluated: kareem is 0 / 0 at Pr = 0
+    """
+    with np.errstate(all='ignore'):
+        return np.where(Pr > 0, Pr / zmodel_func(Pr=np.where(Pr > 0, Pr, 1), Tr=Tr[:, None]), 0)
+
+
+def _explicit_inverse(Pr_z, Tr, zmodel_str, settings):
+    """
+    z and Pr of an explicit model for known Pr / z. Pr / z of the explicit models is not monotonic in Pr on every
+    isotherm (papay above Pr / z ~ 5, kareem below Tr ~ 1.07), so a target can have several solutions. Pr / z is
+    tabulated on the isotherms over the Pr range of the model, with the local extremes refined between the nodes.
+    Targets that cross the tabulated isotherm exactly once are solved on that cell with the bracketed solver. The
+    other targets (ambiguous, beyond the range of the model, or on isotherms where the model is not finite) and the
+    points that don't converge are nan.
+    """
+    zmodel_func = models[zmodel_str]
+
+    def residual(Pr, Pr_z, Tr, sign):
+        return sign * (Pr_z * zmodel_func(Pr=Pr, Tr=Tr) - Pr)
+
+    def residual_fprime(Pr, Pr_z, Tr, sign):
+        step = 1e-7 * np.maximum(Pr, 1)
+        return (residual(Pr + step, Pr_z, Tr, sign) - residual(Pr, Pr_z, Tr, sign)) / step
+
+    Pr_grid = np.linspace(0, MODEL_RANGES[zmodel_str]['Pr'][1], EXPLICIT_INVERSE_GRID_SIZE + 1)
+    fine_offsets = np.linspace(-1, 1, _EXPLICIT_INVERSE_REFINE) * (Pr_grid[1] - Pr_grid[0])
+
+    lo = np.full(Pr_z.size, np.nan)
+    hi = np.full(Pr_z.size, np.nan)
+    sign = np.ones(Pr_z.size)
+    for start in range(0, Pr_z.size, _EXPLICIT_INVERSE_CHUNK):
+        chunk = slice(start, start + _EXPLICIT_INVERSE_CHUNK)
+        Tr_unique, inverse = np.unique(Tr[chunk], return_inverse=True)
+        inverse = inverse.ravel()
+        target = Pr_z[chunk]
+
+        # Pr / z on the isotherms. A local extreme lies within a cell of its node: move the node onto it, so that
+        # no crossing of a target is hidden between two nodes
+        table = _explicit_isotherms(Pr_grid, Tr_unique, zmodel_func)
+        nodes = np.broadcast_to(Pr_grid, table.shape).copy()
+        slope = np.sign(np.diff(table, axis=1))
+        row, node = np.nonzero(slope[:, 1:] != slope[:, :-1])
+        node += 1
+        if row.size:
+            fine = _explicit_isotherms(Pr_grid[node, None] + fine_offsets, Tr_unique[row], zmodel_func)
+            peak = slope[row, node - 1] > 0
+            extreme = np.where(peak, np.where(np.isnan(fine), -np.inf, fine).argmax(axis=1),
+                               np.where(np.isnan(fine), np.inf, fine).argmin(axis=1))
+            table[row, node] = fine[np.arange(row.size), extreme]
+            nodes[row, node] += fine_offsets[extreme]
+        finite = np.isfinite(table).all(axis=1)
+
+        # single crossing of the target: its cell brackets the solution
+        above = table[inverse] >= target[:, None]
+        crossings = above[:, 1:] != above[:, :-1]
+        single = (crossings.sum(axis=1) == 1) & finite[inverse]
+        cell = crossings.argmax(axis=1)
+        points = np.arange(target.size)
+        lo[chunk] = np.where(single, nodes[inverse, cell], np.nan)
+        hi[chunk] = np.where(single, nodes[inverse, cell + 1], np.nan)
+        # the residual is positive at the lower end of an increasing cell, negative at the lower end of a decreasing one
+        sign[chunk] = np.where(above[points, cell + 1], 1, -1)
+
+    Pr = np.full(Pr_z.size, np.nan)
+    Z = np.full(Pr_z.size, np.nan)
+    Pr[Pr_z == 0] = 0
+    Z[Pr_z == 0] = 1
+    solve = (Pr_z > 0) & np.isfinite(lo)
+    if solve.any():
+        Pr[solve], _, status = _bracketed_newton_vectorized(
+            residual, (lo[solve] + hi[solve]) / 2, lo[solve], hi[solve], args=(Pr_z[solve], Tr[solve], sign[solve]),
+            fprime=residual_fprime, **settings
+        )
+        Z[solve] = np.where(status == 0, Pr[solve] / Pr_z[solve], np.nan)
+    return Z, Pr
+
+
+def calc_Pr_from_Pr_over_z(Pr_z, Tr, zmodel='DAK', newton_kwargs=None):
+    """
+    Solves the pseudo-reduced pressure and the z-factor from a target :math:`P_r / Z` at every point.
+
+    Parameters
+    ----------
+    Pr_z : float or array_like
+        target pseudo-reduced pressure over z-factor, :math:`P_r / Z` (dimensionless)
+    Tr : float or array_like
+        pseudo-reduced temperature, Tr (dimensionless)
+    zmodel : str
+        z-correlation model. Accepted inputs: ``'DAK'`` | ``'hall_yarborough'`` | ``'londono'`` |``'kareem'`` |
+        ``'papay'`` | ``'beggs_brill'``
+    newton_kwargs : dict
+        ``maxiter``, ``tol`` and ``rtol`` of the iterations of the explicit z-models. The inverse of the other models
+        is explicit
+
+    Returns
+    -------
+    tuple
+        (Pr, Z), with the broadcast shape of ``Pr_z`` and ``Tr``. Points without a physical solution, or for which
+        the iterations of the explicit z-models don't converge, are ``nan``. So are the targets of the explicit
+        z-models that are not reached, or reached at more than one Pr, within the Pr range of the model
+        (``MODEL_RANGES``): e.g. ``'papay'`` gives the same :math:`P_r / Z` at two pressures on most isotherms
+        below Tr = 2.2
+    """
+    _get_z_model(model=zmodel)
+    Pr_z, Tr = np.broadcast_arrays(np.asarray(Pr_z, dtype=float), np.asarray(Tr, dtype=float))
+    shape = Pr_z.shape
+    Pr_z = Pr_z.ravel()
+    Tr = Tr.ravel()
+
+    if zmodel in EXPLICIT_MODELS:
+        Z, Pr = _explicit_inverse(Pr_z, Tr, zmodel, _parse_newton_kwargs_vectorized(newton_kwargs))
+    else:
+        _, _, coeffs = _model_args(zmodel, Pr_z, Tr)
+        if zmodel == 'hall_yarborough':
+            Z, Pr = _hall_yarborough_inverse(Pr_z, coeffs)
+        else:
+            Z, Pr = _DAK_form_inverse(Pr_z, coeffs)
+
+    Pr = np.where(np.isnan(Z), np.nan, Pr)
+    if len(shape) == 0:
+        return Pr[0], Z[0]
+    return Pr.reshape(shape), Z.reshape(shape)
+
+
+def calc_P_from_p_over_z(p_over_z, sg=None, T=None, H2S=None, CO2=None, N2=None, pmodel='piper', zmodel='DAK',
+                         newton_kwargs=None, ignore_conflict=False, **kwargs):
+    """
+    Calculates the gas pressure that gives a target :math:`P / Z`, e.g. for material balance (p/z vs Gp) history
+    matching. The inverse is explicit for the implicit z-models (see the module docstring), so arrays of thousands
+    of targets are solved in one pass.
+
+    **Basic usage**
+
+    >>> res = calc_P_from_p_over_z(np.array([2000, 3500]), sg=0.7, T=180, H2S=0.07, CO2=0.1)
+    >>> res['P'], res['z']
+    (array([1750.80018959, 3028.04833533]), array([0.88275009, 0.86935667]))
+
+    Parameters
+    ----------
+    p_over_z : float or array_like
+        target absolute pressure over z-factor, :math:`P / Z` (psia)
+    sg, T, H2S, CO2, N2, pmodel, ignore_conflict, kwargs
+        same as :ref:`calc_z <calc_z>`. ``P`` is the unknown
+    zmodel : str
+        z-correlation model. Accepted inputs: ``'DAK'`` | ``'hall_yarborough'`` | ``'londono'`` |``'kareem'`` |
+        ``'papay'`` | ``'beggs_brill'``
+    newton_kwargs : dict
+        ``maxiter``, ``tol`` and ``rtol`` of the iterations of the explicit z-models. The inverse of the other models
+        is explicit
+
+    Returns
+    -------
+    dict
+        ``'P'``: gas pressure (psig), same unit as the ``P`` input of :ref:`calc_z <calc_z>`
+
+        ``'z'``: gas compressibility factor at ``'P'``, :math:`Z` (dimensionless)
+
+        ``'Pr'``, ``'Tr'``: pseudo-reduced pressure and temperature (dimensionless)
+
+        Points without a physical solution are ``nan``
+    """
+    # the pseudo-critical properties do not depend on pressure: evaluate them at a reference pressure
+    P_ref = 0
+    Tr, Pr_ref, _ = _calc_Tr_and_Pr(sg=sg, P=P_ref, T=T, H2S=H2S, CO2=CO2, N2=N2, pmodel=pmodel,
+                                    ignore_conflict=ignore_conflict, **kwargs)
+    Ppc = calc_psig_to_psia(P_ref) / Pr_ref
+
+    Pr, Z = calc_Pr_from_Pr_over_z(np.asarray(p_over_z, dtype=float) / Ppc, Tr, zmodel=zmodel,
+                                   newton_kwargs=newton_kwargs)
+    P = Pr * Ppc - (calc_psig_to_psia(P_ref) - P_ref)  # psia to psig
+    return {'P': P, 'z': Z, 'Pr': Pr, 'Tr': Tr}
+
+
+def calc_P_from_density(rho, sg=None, T=None, H2S=None, CO2=None, N2=None, pmodel='piper', zmodel='DAK',
+                        newton_kwargs=None, ignore_conflict=False, **kwargs):
+    """
+    Calculates the gas pressure that gives a target gas density, e.g. for density matching. The real gas law
+    :math:`\\rho_g = P M_a / (Z R T)`, with :math:`M_a = 28.97 \\gamma_g`, fixes :math:`P / Z`, which is then inverted
+    with :func:`calc_P_from_p_over_z`.
+
+    **Basic usage**
+
+    >>> res = calc_P_from_density(np.array([5.0, 10.0]), sg=0.7, T=180, H2S=0.07, CO2=0.1)
+
+    Parameters
+    ----------
+    rho : float or array_like
+        target gas density, :math:`\\rho_g` (lbm/ft3)
+    sg, T, H2S, CO2, N2, pmodel, zmodel, newton_kwargs, ignore_conflict, kwargs
+        same as :func:`calc_P_from_p_over_z`. ``sg`` and ``T`` are required
+
+    Returns
+    -------
+    dict
+        same as :func:`calc_P_from_p_over_z`
+    """
+    if sg is None or T is None:
+        raise TypeError("calc_P_from_density() requires sg (specific gravity) and T (gas temperature, °F)")
+    T_R = calc_Fahrenheit_to_Rankine(np.asarray(T, dtype=float))
+    p_over_z = np.asarray(rho, dtype=float) * GAS_CONSTANT * T_R / (AIR_MOLECULAR_WEIGHT * np.asarray(sg, dtype=float))
+    return calc_P_from_p_over_z(p_over_z, sg=sg, T=T, H2S=H2S, CO2=CO2, N2=N2, pmodel=pmodel, zmodel=zmodel,
+                                newton_kwargs=newton_kwargs, ignore_conflict=ignore_conflict, **kwargs)
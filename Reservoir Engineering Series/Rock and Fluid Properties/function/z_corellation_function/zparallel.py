@@ -0,0 +1,139 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import os
+import numpy as np
+import sys
+sys.path.append("Reservoir Engineering Series/Rock and Fluid Properties")
+from function.z_corellation_function.value import _calc_Tr_and_Pr, _check_explicit_model_arguments, _get_z_helper, \
+    _get_z_model
+
+"""
+Shared-memory process-pool backend for large calc_z batches.
+
+The (Pr, Tr) inputs are copied once into a shared memory block and the z-factors are written by the workers into a
+shared output block. Tasks only carry the (start, stop) indices of their shard, so no array is pickled between the
+processes, and the shards are solved in parallel with the vectorized solver.
+"""
+
+MIN_SHARD_SIZE = 10000
+"""smallest shard sent to a worker. Smaller batches are solved in the current process"""
+
+# views of the shared blocks, attached once per worker process by _attach_shared_blocks
+_worker_blocks = {}
+
+
+def _attach_shared_blocks(input_name, output_name, size):
+    """worker initializer: attaches the shared input and output blocks"""
+    input_block = shared_memory.SharedMemory(name=input_name)
+    output_block = shared_memory.SharedMemory(name=output_name)
+    _worker_blocks['blocks'] = (input_block, output_block)  # keep them open for the life of the worker
+    _worker_blocks['inputs'] = np.ndarray((2, size), dtype=np.float64, buffer=input_block.buf)
+    _worker_blocks['Z'] = np.ndarray((size,), dtype=np.float64, buffer=output_block.buf)
+
+
+def _solve_shard(start, stop, zmodel, guess, newton_kwargs, smart_guess, solver, accuracy, fast_tol):
+    """solves the points [start, stop) of the shared inputs and writes them to the shared output"""
+    Pr, Tr = _worker_blocks['inputs'][:, start:stop]
+    z_model = _get_z_model(model=zmodel)
+    z_helper = _get_z_helper(zmodel, solver, accuracy, fast_tol)
+    _worker_blocks['Z'][start:stop] = z_helper(Pr, Tr, z_model, zmodel, guess, newton_kwargs, smart_guess)
+    return stop - start
+
+
+def _resolve_n_jobs(n_jobs):
+    if n_jobs is None or n_jobs == -1:
+        return os.cpu_count() or 1
+    if n_jobs < 1:
+        raise ValueError("n_jobs must be a positive integer or -1 (all CPUs)")
+    return n_jobs
+
+
+def calc_z_parallel(sg=None, P=None, T=None, H2S=None, CO2=None, N2=None, Pr=None, Tr=None, pmodel='piper',
+                    zmodel='DAK', n_jobs=-1, shard_size=None, guess=None, newton_kwargs=None, smart_guess=None,
+                    ignore_conflict=False, solver='newton', accuracy='exact', fast_tol=0.005, **kwargs):
+    """
+    Calculates the z-factor of large batches on a pool of worker processes, sharing the inputs and the output
+    through ``multiprocessing.shared_memory``.
+
+    The pseudo-critical step runs in the current process. The (Pr, Tr) points are then split into shards that are
+    solved by the workers with the vectorized solvers of :ref:`calc_z <calc_z>`, and written straight into a shared
+    output array.
+
+    **Basic usage**
+
+    >>> Pr_grid, Tr_grid = np.meshgrid(np.linspace(0.2, 30, 3000), np.linspace(1.05, 3, 1000))
+    >>> Z = calc_z_parallel(Pr=Pr_grid, Tr=Tr_grid, zmodel='DAK', n_jobs=16)
+    >>> Z.shape
+    (1000, 3000)
+
+    Parameters
+    ----------
+    sg, P, T, H2S, CO2, N2, Pr, Tr, pmodel, zmodel, ignore_conflict
+        same as :ref:`calc_z <calc_z>`
+    kwargs : dict
+        optional kwargs of the pseudo-critical models, same as :ref:`calc_z <calc_z>`. Not supported with ``Pr`` and
+        ``Tr`` inputs
+    n_jobs : int
+        number of worker processes. ``-1`` (default) uses all CPUs
+    shard_size : int
+        number of points solved per task. Defaults to splitting the batch into 4 shards per worker, for load
+        balancing, with at least ``MIN_SHARD_SIZE`` points per shard
+    guess : float
+        initial guess of z-factor, same as :ref:`calc_z <calc_z>`. Only scalars are supported
+    newton_kwargs : dict
+        ``maxiter``, ``tol`` and ``rtol`` of the elementwise solver
+    smart_guess, solver, accuracy, fast_tol
+        same as :ref:`calc_z <calc_z>`
+
+    Returns
+    -------
+    float or ndarray
+        gas compressibility factor, :math:`Z` (dimensionless), with the broadcast shape of the inputs
+    """
+    _check_explicit_model_arguments(zmodel, guess, newton_kwargs, smart_guess)
+    if np.ndim(guess) > 0:
+        raise TypeError("calc_z_parallel() only supports a scalar guess")
+    z_model = _get_z_model(model=zmodel)
+    z_helper = _get_z_helper(zmodel, solver, accuracy, fast_tol)
+    n_jobs = _resolve_n_jobs(n_jobs)
+
+    if Pr is None or Tr is None:
+        Tr, Pr, _ = _calc_Tr_and_Pr(sg=sg, P=P, T=T, H2S=H2S, CO2=CO2, N2=N2, Pr=Pr, Tr=Tr, pmodel=pmodel,
+                                    ignore_conflict=ignore_conflict, **kwargs)
+    elif kwargs:
+        raise TypeError("calc_z_parallel() got unsupported keyword arguments for Pr and Tr inputs: %s" % list(kwargs))
+
+    Pr, Tr = np.broadcast_arrays(np.asarray(Pr, dtype=float), np.asarray(Tr, dtype=float))
+    shape = Pr.shape
+    size = Pr.size
+
+    if shard_size is None:
+        shard_size = max(MIN_SHARD_SIZE, -(-size // (4 * n_jobs)))
+    if n_jobs == 1 or size <= shard_size:
+        Z = np.asarray(z_helper(Pr, Tr, z_model, zmodel, guess, newton_kwargs, smart_guess))
+        return Z[()] if Z.ndim == 0 else Z
+
+    input_block = shared_memory.SharedMemory(create=True, size=2 * size * 8)
+    output_block = shared_memory.SharedMemory(create=True, size=size * 8)
+    try:
+        inputs = np.ndarray((2, size), dtype=np.float64, buffer=input_block.buf)
+        inputs[0] = Pr.ravel()
+        inputs[1] = Tr.ravel()
+
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_attach_shared_blocks,
+                                 initargs=(input_block.name, output_block.name, size)) as executor:
+            futures = [executor.submit(_solve_shard, start, min(start + shard_size, size), zmodel, guess,
+                                       newton_kwargs, smart_guess, solver, accuracy, fast_tol)
+                       for start in range(0, size, shard_size)]
+            for future in futures:
+                future.result()  # re-raises the errors of the workers, e.g. convergence failures
+
+        Z = np.ndarray((size,), dtype=np.float64, buffer=output_block.buf).copy()
+        del inputs
+    finally:
+        input_block.close()
+        input_block.unlink()
+        output_block.close()
+        output_block.unlink()
+
+    return Z.reshape(shape)
@@ -0,0 +1,77 @@
+import numpy as np
+
+"""
+Compact result records of calc_z(ps_props='record').
+
+A scalar call returns a ZResult, a fixed-layout object backed by __slots__ (no per-instance __dict__). A batch call
+returns a NumPy structured array with one row per point and the columns of Z_RESULT_FIELDS, stored as a single
+contiguous block of float64. Properties that the pseudo-critical model doesn't compute (J and K of Sutton,
+e_correction of Piper) are nan.
+"""
+
+Z_RESULT_FIELDS = ('z', 'Tpc', 'Ppc', 'J', 'K', 'Tr', 'Pr', 'e_correction')
+Z_RESULT_DTYPE = np.dtype([(name, np.float64) for name in Z_RESULT_FIELDS])
+"""dtype of the structured array returned for batches"""
+
+
+class ZResult(object):
+    """
+    z-factor and pseudo-critical properties of a single gas state.
+
+    >>> res = gc.calc_z(sg=0.7, T=75, P=2010, ps_props='record')
+    >>> res.z, res.Tr, res.Pr
+    (0.7366562810878986, 1.4394768357478496, 3.0646766226921294)
+    """
+    __slots__ = Z_RESULT_FIELDS
+
+    def __init__(self, z=np.nan, Tpc=np.nan, Ppc=np.nan, J=np.nan, K=np.nan, Tr=np.nan, Pr=np.nan,
+                 e_correction=np.nan):
+        self.z = z
+        """gas compressibility factor, Z (dimensionless)"""
+        self.Tpc = Tpc
+        """pseudo-critical temperature, Tpc (°R)"""
+        self.Ppc = Ppc
+        """pseudo-critical pressure, Ppc (psia)"""
+        self.J = J
+        """Stewart-Burkhardt-VOO parameter J, (°R/psia)"""
+        self.K = K
+        """Stewart-Burkhardt-VOO parameter K, (°R/psia^0.5)"""
+        self.Tr = Tr
+        """pseudo-reduced temperature, Tr (dimensionless)"""
+        self.Pr = Pr
+        """pseudo-reduced pressure, Pr (dimensionless)"""
+        self.e_correction = e_correction
+        """temperature-correction factor for acid gases, ε (°R)"""
+
+    def __repr__(self):
+        return 'ZResult(%s)' % ', '.join('%s=%r' % (name, getattr(self, name)) for name in Z_RESULT_FIELDS)
+
+    def __eq__(self, other):
+        if not isinstance(other, ZResult):
+            return NotImplemented
+        return all(np.array_equal(getattr(self, name), getattr(other, name), equal_nan=True)
+                   for name in Z_RESULT_FIELDS)
+
+    def to_dict(self):
+        """the record as a dict, keyed by Z_RESULT_FIELDS"""
+        return {name: getattr(self, name) for name in Z_RESULT_FIELDS}
+
+
+def make_z_result(z, props):
+    """
+    Packs the z-factor and the pseudo-critical properties (a ``ps_props`` dict) of calc_z into a ZResult if all of
+    them are scalars, or into a structured array of dtype Z_RESULT_DTYPE with their broadcast shape otherwise. Keys
+    of ``props`` that are not in Z_RESULT_FIELDS (e.g. Tpc_corrected) are dropped, and missing or None fields are
+    nan.
+    """
+    values = {'z': z}
+    values.update((name, value) for name, value in props.items() if name in Z_RESULT_FIELDS and value is not None)
+
+    if all(np.ndim(value) == 0 for value in values.values()):
+        return ZResult(**{name: float(value) for name, value in values.items()})
+
+    shape = np.broadcast_shapes(*[np.shape(value) for value in values.values()])
+    result = np.empty(shape, dtype=Z_RESULT_DTYPE)
+    for name in Z_RESULT_FIELDS:
+        result[name] = values.get(name, np.nan)
+    return result
@@ -0,0 +1,171 @@
+import os
+import numpy as np
+import pandas as pd
+import sys
+sys.path.append("Reservoir Engineering Series/Rock and Fluid Properties")
+from function.z_corellation_function.value import _calc_Tr_and_Pr, _calc_z_vectorized_helper, \
+    _calc_z_bracketed_helper, _check_explicit_model_arguments, _get_z_model
+
+"""
+Streaming z-factor calculation for files that do not fit in memory.
+
+calc_z_stream reads (sg, P, T, H2S, CO2, N2) rows from a CSV or Parquet file in fixed-size chunks, solves each chunk
+with the vectorized solver, and appends the results to the output file before reading the next chunk. Only one chunk
+is held in memory at a time, whatever the size of the file.
+"""
+
+INPUT_COLUMNS = ['sg', 'P', 'T', 'H2S', 'CO2', 'N2']
+"""calc_z arguments read from the input file"""
+
+
+def _file_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ['.csv', '.txt']:
+        return 'csv'
+    if extension in ['.parquet', '.pq']:
+        return 'parquet'
+    raise ValueError('Unsupported file extension "%s". Choose from: [".csv", ".txt", ".parquet", ".pq"]' % extension)
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Reading or writing Parquet files requires pyarrow. Install it with `pip install pyarrow`")
+    return pyarrow
+
+
+def _read_chunks(path, chunksize):
+    """yields the input file as DataFrames of at most ``chunksize`` rows"""
+    if _file_format(path) == 'csv':
+        for chunk in pd.read_csv(path, chunksize=chunksize):
+            yield chunk
+    else:
+        pa = _import_pyarrow()
+        for batch in pa.parquet.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+
+
+class _ChunkWriter(object):
+    """appends DataFrames to a CSV or Parquet file, writing the header/schema with the first chunk"""
+
+    def __init__(self, path):
+        self.path = path
+        self.format = _file_format(path)
+        self._parquet_writer = None
+        self._first = True
+
+    def write(self, df):
+        if self.format == 'csv':
+            df.to_csv(self.path, mode='w' if self._first else 'a', header=self._first, index=False)
+        else:
+            pa = _import_pyarrow()
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pa.parquet.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table)
+        self._first = False
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+def calc_z_stream(input_path, output_path, chunksize=1000000, columns=None, keep_columns=True, pmodel='piper',
+                  zmodel='DAK', ps_props=False, errors='raise', newton_kwargs=None, **kwargs):
+    """
+    Calculates the z-factor of every row of a CSV or Parquet file, chunk by chunk, and writes the results to another
+    CSV or Parquet file. The file formats are taken from the file extensions (``.csv``, ``.txt``, ``.parquet``,
+    ``.pq``). Parquet files require ``pyarrow``.
+
+    **Basic usage**
+
+    >>> calc_z_stream('allocation.csv', 'allocation_z.parquet', chunksize=500000, ps_props=True, errors='coerce')
+    {'rows': 25000000, 'chunks': 50, 'failed': 12}
+
+    Parameters
+    ----------
+    input_path : str
+        input file, with one gas state per row
+    output_path : str
+        output file. It is overwritten
+    chunksize : int
+        number of rows read, solved and written at a time. Memory use is proportional to ``chunksize``
+    columns : dict
+        maps calc_z arguments (``'sg'``, ``'P'``, ``'T'``, ``'H2S'``, ``'CO2'``, ``'N2'``) to column names of the input
+        file, e.g. ``{'P': 'whp_psig', 'T': 'wht_F'}``. Arguments that are not mapped are read from the column of the
+        same name, if any. Map an argument to ``None`` to ignore its column, e.g. ``{'N2': None}`` for
+        ``pmodel='sutton'``. Missing impurity columns are treated as ``None`` (not provided)
+    keep_columns : bool
+        ``True`` (default) to write the input columns along with the results
+    pmodel : str
+        pseudo-critical model, same as :ref:`calc_z <calc_z>`
+    zmodel : str
+        z-correlation model, same as :ref:`calc_z <calc_z>`
+    ps_props : bool
+        set this to True to also write the pseudo-critical properties (``Tpc``, ``Ppc``, ..., ``Tr``, ``Pr``) as
+        columns
+    errors : str
+        ``'raise'`` (default) to stop at the first chunk with a point that fails to converge. ``'coerce'`` to solve
+        with the bracketed solver (see :ref:`calc_z_bracketed <calc_z_bracketed>`) and write ``nan`` for the points
+        that fail, e.g. rows with missing values. Accepted inputs: ``'raise'`` | ``'coerce'``
+    newton_kwargs : dict
+        ``maxiter``, ``tol`` and ``rtol`` of the elementwise solver
+    kwargs : dict
+        optional kwargs used by pseudo-critical models
+
+    Returns
+    -------
+    dict
+        ``'rows'``: number of rows processed, ``'chunks'``: number of chunks, ``'failed'``: number of rows written as
+        ``nan`` (always 0 with ``errors='raise'``)
+    """
+    if errors not in ['raise', 'coerce']:
+        raise KeyError('errors="%s" is not supported. Choose from: ["raise", "coerce"]' % errors)
+    if chunksize < 1:
+        raise ValueError("chunksize must be a positive integer")
+    _check_explicit_model_arguments(zmodel, None, newton_kwargs, None)
+    z_model = _get_z_model(model=zmodel)
+
+    columns = dict(columns or {})
+    for argument in columns:
+        if argument not in INPUT_COLUMNS:
+            raise KeyError('Unknown calc_z argument "%s" in columns. Choose from: %s' % (argument, INPUT_COLUMNS))
+    for argument in INPUT_COLUMNS:
+        columns.setdefault(argument, argument)
+
+    summary = {'rows': 0, 'chunks': 0, 'failed': 0}
+    writer = _ChunkWriter(output_path)
+    try:
+        for chunk in _read_chunks(input_path, chunksize):
+            inputs = {argument: chunk[column].to_numpy(dtype=float) if column is not None and column in chunk.columns
+                      else None for argument, column in columns.items()}
+            Tr, Pr, pc_props = _calc_Tr_and_Pr(pmodel=pmodel, **inputs, **kwargs)
+
+            if errors == 'coerce':
+                Z, _, _, status = _calc_z_bracketed_helper(Pr, Tr, z_model, zmodel, None, newton_kwargs, None)
+                failed = status != 0
+                Z[failed] = np.nan
+                summary['failed'] += int(np.sum(failed))
+            else:
+                try:
+                    Z = _calc_z_vectorized_helper(Pr, Tr, z_model, zmodel, None, newton_kwargs, None)
+                except RuntimeError as e:
+                    raise RuntimeError('%s, in rows %d to %d of "%s"' % (
+                        e, summary['rows'], summary['rows'] + len(chunk) - 1, input_path))
+
+            out = chunk if keep_columns else pd.DataFrame(index=chunk.index)
+            out = out.assign(z=Z)
+            if ps_props is True:
+                props = {key: np.broadcast_to(value, Z.shape) for key, value in pc_props.items()
+                         if key not in ['Tr', 'Pr'] and value is not None}
+                out = out.assign(**props, Tr=Tr, Pr=Pr)
+            writer.write(out)
+
+            summary['rows'] += len(chunk)
+            summary['chunks'] += 1
+    finally:
+        writer.close()
+
+    return summary
@@ -0,0 +1,249 @@
+import numpy as np
+from numpy.polynomial import chebyshev
+import sys
+sys.path.append("Reservoir Engineering Series/Rock and Fluid Properties")
+from function.z_corellation_function.value import calc_z, MODEL_RANGES, MODEL_DERIVATIVES, _get_z_model
+
+"""
+Piecewise Chebyshev surrogates of the implicit z-models.
+
+A ZSurrogate splits the (Pr, Tr) box of a z-model into a tensor grid of patches, and interpolates the exact solution
+on each patch with a 2-D Chebyshev polynomial of fixed degree. Patches whose error exceeds the tolerance are bisected
+along the axis where the Chebyshev series converges the slowest, until the tolerance is met. The polynomials are
+stored in the monomial basis of the local patch coordinates, so a point costs two binary searches for its patch and
+(degree + 1) ** 2 multiply-adds, with no root finding.
+"""
+
+TR_MIN = {'DAK': 1.05, 'hall_yarborough': 1.05, 'londono': 1.08}
+"""
+default lower bound of the fitted Tr. Close to the critical temperature the isotherms of the z-models drop almost
+vertically around Pr ~ 1-2 (up to Tr ~ 1.07 for 'londono'), which no polynomial of fixed degree can follow
+"""
+
+
+def _lobatto_nodes(degree):
+    """Chebyshev-Lobatto nodes on [-1, 1], in increasing order (they include the patch edges)"""
+    return -np.cos(np.pi * np.arange(degree + 1) / degree)
+
+
+def _check_nodes(degree):
+    """midpoints (in angle) between the Lobatto nodes, where the interpolation error is the largest"""
+    return -np.cos(np.pi * (np.arange(degree) + 0.5) / degree)
+
+
+class ZSurrogate(object):
+    """
+    Piecewise 2-D Chebyshev surrogate of an implicit z-model, fitted to a chosen tolerance over a :math:`T_r` x
+    :math:`P_r` box.
+
+    **Basic usage**
+
+    >>> surrogate = ZSurrogate(zmodel='DAK', tol=1e-6)
+    >>> surrogate(Pr=np.array([1.5, 3.0]), Tr=np.array([1.5, 1.2]))
+    array([0.85931438, 0.53023979])
+    >>> surrogate.max_error <= surrogate.tol, surrogate.n_patches
+    (True, 228)
+
+    Parameters
+    ----------
+    zmodel : str
+        implicit z-correlation model to fit. Accepted inputs: ``'DAK'`` | ``'hall_yarborough'`` | ``'londono'``
+    tol : float
+        target maximum absolute error of the surrogate, measured against the exact solver between the interpolation
+        nodes of every patch. It cannot be tighter than the convergence tolerance of the solver (``newton_kwargs``)
+    degree : int
+        degree of the Chebyshev polynomial of every patch, along each axis. Evaluation costs (degree + 1) ** 2
+        multiply-adds per point
+    Pr_range : tuple
+        (min, max) of the fitted :math:`P_r`. Defaults to the working range of ``zmodel`` in ``MODEL_RANGES``
+    Tr_range : tuple
+        (min, max) of the fitted :math:`T_r`. Defaults to (``TR_MIN[zmodel]``, max of the working range of ``zmodel``)
+    max_refinements : int
+        maximum number of bisection rounds. If the tolerance is not met after them, ``converged`` is ``False`` and
+        ``max_error`` gives the accuracy actually reached
+    max_patches : int
+        maximum number of patches. Refinement stops before exceeding it, as with ``max_refinements``
+    kwargs : dict
+        optional kwargs passed to :func:`calc_z` (``guess``, ``newton_kwargs``, ``smart_guess``, ``solver``)
+    """
+
+    def __init__(self, zmodel='DAK', tol=1e-6, degree=6, Pr_range=None, Tr_range=None, max_refinements=12,
+                 max_patches=10000, **kwargs):
+
+        _get_z_model(model=zmodel)  # raises KeyError for unknown models
+        if zmodel not in MODEL_DERIVATIVES:
+            raise KeyError('ZSurrogate fits implicit z-models only. Choose from: %s' % list(MODEL_DERIVATIVES))
+        if Pr_range is None:
+            Pr_range = MODEL_RANGES[zmodel]['Pr']
+        if Tr_range is None:
+            Tr_range = (TR_MIN[zmodel], MODEL_RANGES[zmodel]['Tr'][1])
+        if degree < 1:
+            raise ValueError("degree must be a positive integer")
+
+        self.zmodel = zmodel
+        """z-correlation model fitted by the surrogate"""
+        self.tol = tol
+        """target maximum absolute error"""
+        self.degree = degree
+        """degree of the patch polynomials, along each axis"""
+        self.calc_z_kwargs = kwargs
+        """kwargs passed to calc_z when fitting the surrogate and for points outside of the fitted domain"""
+        self.Pr_breaks = np.linspace(Pr_range[0], Pr_range[1], 5)
+        """patch boundaries along Pr"""
+        self.Tr_breaks = np.linspace(Tr_range[0], Tr_range[1], 3)
+        """patch boundaries along Tr"""
+
+        # maps Chebyshev coefficients to monomial coefficients, and node values to Chebyshev coefficients
+        self._cheb_to_power = np.column_stack([
+            np.pad(chebyshev.cheb2poly(np.eye(degree + 1)[k]), (0, degree - k)) for k in range(degree + 1)
+        ])
+        self._values_to_cheb = np.linalg.inv(chebyshev.chebvander(_lobatto_nodes(degree), degree))
+
+        self.converged = False
+        """``True`` if ``max_error <= tol``"""
+        for refinement in range(max_refinements + 1):
+            error, tails = self._fit()
+            failed = error > tol
+            if not failed.any():
+                self.converged = True
+                break
+            if refinement == max_refinements:
+                break
+            Pr_breaks, Tr_breaks = self._refine(failed, tails)
+            if (Pr_breaks.size - 1) * (Tr_breaks.size - 1) > max_patches:
+                break
+            self.Pr_breaks, self.Tr_breaks = Pr_breaks, Tr_breaks
+
+        idx = np.unravel_index(np.argmax(error), error.shape)
+        self.max_error = error[idx]
+        """maximum absolute fit error measured against the exact solver"""
+        self.max_error_location = self._max_error_locations[idx]
+        """(Pr, Tr) where ``max_error`` was measured"""
+
+    def __repr__(self):
+        return '<ZSurrogate zmodel="%s": Pr=[%s, %s], Tr=[%s, %s], degree=%d, n_patches=%d, max_error=%s>' % (
+            self.zmodel, self.Pr_breaks[0], self.Pr_breaks[-1], self.Tr_breaks[0], self.Tr_breaks[-1], self.degree,
+            self.n_patches, self.max_error
+        )
+
+    def __call__(self, Pr, Tr):
+        return self.evaluate(Pr, Tr)
+
+    @property
+    def n_patches(self):
+        """number of polynomial patches"""
+        return (self.Pr_breaks.size - 1) * (self.Tr_breaks.size - 1)
+
+    def _patch_points(self, nodes):
+        """(Pr, Tr) of ``nodes`` x ``nodes`` local points in every patch, shape (n_Tr_patches, n_Pr_patches, n, n)"""
+        def local(breaks):
+            lo, hi = breaks[:-1, None], breaks[1:, None]
+            return lo + (nodes + 1) / 2 * (hi - lo)
+        Pr_local, Tr_local = local(self.Pr_breaks), local(self.Tr_breaks)
+        shape = (Tr_local.shape[0], Pr_local.shape[0], nodes.size, nodes.size)
+        Pr = np.broadcast_to(Pr_local[None, :, None, :], shape)
+        Tr = np.broadcast_to(Tr_local[:, None, :, None], Pr.shape)
+        return Pr, Tr
+
+    def _fit(self):
+        """
+        Interpolates every patch at its Chebyshev-Lobatto nodes, and returns the error of every patch at the check
+        points, and the magnitude of the last Chebyshev coefficients along (Pr, Tr) of every patch
+        """
+        Pr, Tr = self._patch_points(_lobatto_nodes(self.degree))
+        values = calc_z(Pr=Pr, Tr=Tr, zmodel=self.zmodel, **self.calc_z_kwargs)
+
+        # Chebyshev coefficients of every patch, axes (..., Tr degree, Pr degree)
+        cheb = self._values_to_cheb @ values @ self._values_to_cheb.T
+        tails = (np.abs(cheb[..., :, -1]).max(axis=-1), np.abs(cheb[..., -1, :]).max(axis=-1))
+
+        power = self._cheb_to_power @ cheb @ self._cheb_to_power.T
+        # term-major copy: each of the gathers at evaluation time reads one contiguous array
+        self._coefficients_by_term = np.ascontiguousarray(power.reshape(-1, (self.degree + 1) ** 2).T)
+
+        Pr_check, Tr_check = self._patch_points(_check_nodes(self.degree))
+        exact = calc_z(Pr=Pr_check, Tr=Tr_check, zmodel=self.zmodel, **self.calc_z_kwargs)
+        error = np.abs(self._interpolate(Pr_check.ravel(), Tr_check.ravel()).reshape(exact.shape) - exact)
+
+        flat_error = error.reshape(error.shape[:2] + (-1,))
+        worst = np.argmax(flat_error, axis=-1)[..., None]
+        self._max_error_locations = np.empty(error.shape[:2], dtype=object)
+        for (j, i), k in np.ndenumerate(worst[..., 0]):
+            self._max_error_locations[j, i] = (Pr_check[j, i].flat[k], Tr_check[j, i].flat[k])
+        return np.take_along_axis(flat_error, worst, axis=-1)[..., 0], tails
+
+    def _refine(self, failed, tails):
+        """
+        Returns the Pr and Tr breaks with the intervals of the failed patches bisected, along the axis where their
+        Chebyshev series converges the slowest
+        """
+        Pr_tail, Tr_tail = tails
+        split_Pr = np.any(failed & (Pr_tail >= Tr_tail), axis=0)
+        split_Tr = np.any(failed & (Pr_tail < Tr_tail), axis=1)
+
+        def bisect(breaks, split):
+            midpoints = (breaks[:-1] + breaks[1:])[split] / 2
+            return np.sort(np.concatenate([breaks, midpoints]))
+        return bisect(self.Pr_breaks, split_Pr), bisect(self.Tr_breaks, split_Tr)
+
+    def _interpolate(self, Pr, Tr):
+        """Evaluates the patch polynomials for points inside the fitted domain"""
+        i = np.clip(np.searchsorted(self.Pr_breaks, Pr, side='right') - 1, 0, self.Pr_breaks.size - 2)
+        j = np.clip(np.searchsorted(self.Tr_breaks, Tr, side='right') - 1, 0, self.Tr_breaks.size - 2)
+        Pr_lo, Pr_hi = self.Pr_breaks[i], self.Pr_breaks[i + 1]
+        Tr_lo, Tr_hi = self.Tr_breaks[j], self.Tr_breaks[j + 1]
+        u = (2 * Tr - Tr_lo - Tr_hi) / (Tr_hi - Tr_lo)
+        v = (2 * Pr - Pr_lo - Pr_hi) / (Pr_hi - Pr_lo)
+        cell = j * (self.Pr_breaks.size - 1) + i
+
+        # nested Horner evaluation of sum_ab c_ab * u**a * v**b, in place to limit temporaries
+        c = self._coefficients_by_term
+        n = self.degree + 1
+        Z = np.zeros(u.shape)
+        for a in range(self.degree, -1, -1):
+            row = c[n * a + self.degree][cell]
+            for b in range(self.degree - 1, -1, -1):
+                row *= v
+                row += c[n * a + b][cell]
+            Z *= u
+            Z += row
+        return Z
+
+    def in_range(self, Pr, Tr):
+        """Boolean mask of the points that lie inside the fitted domain"""
+        return (Pr >= self.Pr_breaks[0]) & (Pr <= self.Pr_breaks[-1]) & \
+            (Tr >= self.Tr_breaks[0]) & (Tr <= self.Tr_breaks[-1])
+
+    def evaluate(self, Pr, Tr):
+        """
+        Evaluates the z-factor at arbitrary (Pr, Tr) points. Points outside of the fitted domain are computed with
+        the exact solver (:func:`calc_z`).
+
+        Parameters
+        ----------
+        Pr : float or array_like
+            pseudo-reduced pressure, Pr (dimensionless)
+        Tr : float or array_like
+            pseudo-reduced temperature, Tr (dimensionless)
+
+        Returns
+        -------
+        float or ndarray
+            gas compressibility factor, :math:`Z` (dimensionless), with the broadcast shape of ``Pr`` and ``Tr``
+        """
+        Pr, Tr = np.broadcast_arrays(np.asarray(Pr, dtype=float), np.asarray(Tr, dtype=float))
+        shape = Pr.shape
+        Pr = Pr.ravel()
+        Tr = Tr.ravel()
+
+        inside = self.in_range(Pr, Tr)
+        if inside.all():
+            Z = self._interpolate(Pr, Tr)
+        else:
+            Z = np.empty(Pr.size)
+            Z[inside] = self._interpolate(Pr[inside], Tr[inside])
+            Z[~inside] = calc_z(Pr=Pr[~inside], Tr=Tr[~inside], zmodel=self.zmodel, **self.calc_z_kwargs)
+
+        if len(shape) == 0:
+            return Z[0]
+        return Z.reshape(shape)
@@ -0,0 +1,399 @@
+import numpy as np
+import sys
+sys.path.append("Reservoir Engineering Series/Rock and Fluid Properties")
+from function.z_corellation_function.value import calc_z, MODEL_RANGES, _get_z_model
+from function.z_corellation_function.zgrid import read_grid, write_grid, read_csv_grid
+from function.z_corellation_function.zsurrogate import TR_MIN
+
+"""
+Precomputed z-factor lookup tables.
+
+A ZTable solves a z-model once on a dense Pr x Tr grid and evaluates any number of (Pr, Tr) points with bicubic
+(Hermite) interpolation, without root finding at evaluation time. On uniform grids the cell of each point is found
+with index arithmetic, so the cost per point does not depend on the size of the table. ZTable.adaptive builds a
+non-uniform grid instead, refined only where the interpolation error is above a tolerance (near the critical
+region), and finds the cells with a binary search along each axis.
+"""
+
+# maps the corner values/derivatives of a unit cell to the bicubic polynomial coefficients
+_HERMITE_MATRIX = np.array([
+    [1., 0., 0., 0.],
+    [0., 0., 1., 0.],
+    [-3., 3., -2., -1.],
+    [2., -2., 1., 1.],
+])
+
+# number of sub-intervals per cell and axis where the interpolation error is measured
+_ERROR_SUBDIVISIONS = 4
+
+
+class ZTable(object):
+    """
+    Lookup table of the z-factor on a uniform :math:`T_r` x :math:`P_r` grid with bicubic interpolation.
+
+    **Basic usage**
+
+    >>> table = ZTable(zmodel='DAK')
+    >>> table(Pr=np.array([1.5, 3.0]), Tr=np.array([1.5, 1.2]))
+    array([0.85931438, 0.53023885])
+    >>> table.max_error, table.max_error_location
+    (0.0014985565134061907, (1.3691151919866444, 1.0548994974874373))
+
+    **Adaptive grid: the accuracy of the uniform grid with a fraction of the points**
+
+    >>> table = ZTable.adaptive(zmodel='DAK', tol=1e-4)
+    >>> table.z.shape, table.max_error, table.converged  # 4214 points, vs 120000 for the default uniform grid
+    ((43, 98), 6.055217094436127e-05, True)
+
+    **Reading back a stored wide grid**
+
+    >>> table = ZTable.from_csv('output/z_factors_dak.csv')
+
+    **Sharing a table between processes**
+
+    >>> ZTable(zmodel='DAK', n_Pr=3000, n_Tr=1000).save('z_dak.npz')
+    >>> table = ZTable.load('z_dak.npz')  # in each worker: memory-mapped, no rebuild, one copy in RAM
+
+    Parameters
+    ----------
+    zmodel : str
+        z-correlation model used to build the table. Accepted inputs: ``'DAK'`` | ``'hall_yarborough'`` |
+        ``'londono'`` |``'kareem'``
+    Pr_range : tuple
+        (min, max) of the tabulated :math:`P_r`. Defaults to the working range of ``zmodel`` in ``MODEL_RANGES``
+    Tr_range : tuple
+        (min, max) of the tabulated :math:`T_r`. Defaults to (``zsurrogate.TR_MIN[zmodel]``, max of the working range
+        of ``zmodel``), 1.05 for ``'kareem'``, since the isotherms drop almost vertically close to the critical
+        temperature
+    n_Pr : int
+        number of :math:`P_r` grid points
+    n_Tr : int
+        number of :math:`T_r` grid points
+    kwargs : dict
+        optional kwargs passed to :func:`calc_z` (``guess``, ``newton_kwargs``, ``smart_guess``)
+    """
+
+    def __init__(self, zmodel='DAK', Pr_range=None, Tr_range=None, n_Pr=600, n_Tr=200, **kwargs):
+
+        _get_z_model(model=zmodel)  # raises KeyError for unknown models
+        if Pr_range is None:
+            Pr_range = MODEL_RANGES[zmodel]['Pr']
+        if Tr_range is None:
+            Tr_range = (TR_MIN.get(zmodel, 1.05), MODEL_RANGES[zmodel]['Tr'][1])
+        if n_Pr < 2 or n_Tr < 2:
+            raise ValueError("A ZTable needs at least 2 grid points along each axis")
+
+        self.zmodel = zmodel
+        """z-correlation model used to build the table"""
+        self.calc_z_kwargs = kwargs
+        """kwargs passed to calc_z when building the table and for points outside of the table"""
+        self.Pr = np.linspace(Pr_range[0], Pr_range[1], n_Pr)
+        """tabulated pseudo-reduced pressures (dimensionless)"""
+        self.Tr = np.linspace(Tr_range[0], Tr_range[1], n_Tr)
+        """tabulated pseudo-reduced temperatures (dimensionless)"""
+        self.converged = None
+        """for tables built by :meth:`adaptive`: ``True`` if ``max_error <= tol``. ``None`` otherwise"""
+
+        self._build()
+
+    def _build(self):
+        """Solves the z-model on the grid, and computes the interpolation coefficients and the error"""
+        Pr_grid, Tr_grid = np.meshgrid(self.Pr, self.Tr)
+        self.z = calc_z(Pr=Pr_grid, Tr=Tr_grid, zmodel=self.zmodel, **self.calc_z_kwargs)
+        """tabulated z-factors, shape (n_Tr, n_Pr)"""
+        invalid = ~(np.isfinite(self.z) & (self.z > 0))
+        if invalid.any():
+            raise ValueError("Non-physical z-factors (z <= 0 or nan) for %d out of %d points of the table" % (
+                invalid.sum(), invalid.size))
+
+        self._build_coefficients()
+
+        self.max_error = None
+        """maximum absolute interpolation error measured against the exact solver at the quarter points of every cell"""
+        self.max_error_location = None
+        """(Pr, Tr) where ``max_error`` was measured"""
+        return self._measure_error()
+
+    def __repr__(self):
+        return '<ZTable zmodel="%s": Pr=[%s, %s] x %d, Tr=[%s, %s] x %d, max_error=%s>' % (
+            self.zmodel, self.Pr[0], self.Pr[-1], self.Pr.size, self.Tr[0], self.Tr[-1], self.Tr.size, self.max_error
+        )
+
+    def __call__(self, Pr, Tr):
+        return self.evaluate(Pr, Tr)
+
+    def _set_spacing(self):
+        """cell widths along each axis, and whether index arithmetic can locate the cells"""
+        self._dPr = np.diff(self.Pr)
+        self._dTr = np.diff(self.Tr)
+        self._uniform = np.allclose(self._dPr, self._dPr[0]) and np.allclose(self._dTr, self._dTr[0])
+
+    def _build_coefficients(self):
+        """Computes the grid derivatives and the 16 bicubic coefficients of every cell"""
+        self._set_spacing()
+        edge_order = 2 if min(self.Pr.size, self.Tr.size) > 2 else 1
+
+        self.dz_dTr, self.dz_dPr = np.gradient(self.z, self.Tr, self.Pr, edge_order=edge_order)
+        """partial derivatives of z with respect to Tr and Pr on the grid"""
+        self.d2z_dTrdPr = np.gradient(self.dz_dPr, self.Tr, axis=0, edge_order=edge_order)
+        """cross derivative of z with respect to Tr and Pr on the grid"""
+
+        def corners(g):
+            # values at the (Tr, Pr) corners (0, 0), (0, 1), (1, 0), (1, 1) of every cell, shape (..., 2, 2)
+            return np.stack([np.stack([g[:-1, :-1], g[:-1, 1:]], axis=-1),
+                             np.stack([g[1:, :-1], g[1:, 1:]], axis=-1)], axis=-2)
+
+        # derivatives in the unit-cell coordinates (u along Tr, v along Pr), scaled by the width of each cell
+        dTr = self._dTr[:, None, None, None]
+        dPr = self._dPr[None, :, None, None]
+        f = corners(self.z)
+        fu = corners(self.dz_dTr) * dTr
+        fv = corners(self.dz_dPr) * dPr
+        fuv = corners(self.d2z_dTrdPr) * dTr * dPr
+
+        F = np.concatenate([
+            np.concatenate([f, fv], axis=-1),
+            np.concatenate([fu, fuv], axis=-1),
+        ], axis=-2)
+
+        self.coefficients = _HERMITE_MATRIX @ F @ _HERMITE_MATRIX.T
+        """bicubic coefficients of every cell, shape (n_Tr - 1, n_Pr - 1, 4, 4)"""
+
+        # coefficient-major copy: each of the 16 gathers at evaluation time reads one contiguous array
+        self._coefficients_by_term = np.ascontiguousarray(self.coefficients.reshape(-1, 16).T)
+
+    def _interpolate(self, Pr, Tr):
+        """Bicubic interpolation for points inside the table"""
+        if self._uniform:
+            u = (Tr - self.Tr[0]) / self._dTr[0]
+            v = (Pr - self.Pr[0]) / self._dPr[0]
+            j = np.clip(u.astype(np.intp), 0, self.Tr.size - 2)
+            i = np.clip(v.astype(np.intp), 0, self.Pr.size - 2)
+            u -= j
+            v -= i
+        else:
+            j = np.clip(np.searchsorted(self.Tr, Tr, side='right') - 1, 0, self.Tr.size - 2)
+            i = np.clip(np.searchsorted(self.Pr, Pr, side='right') - 1, 0, self.Pr.size - 2)
+            u = (Tr - self.Tr[j]) / self._dTr[j]
+            v = (Pr - self.Pr[i]) / self._dPr[i]
+        cell = j * (self.Pr.size - 1) + i
+
+        # nested Horner evaluation of sum_ab c_ab * u**a * v**b, in place to limit temporaries
+        c = self._coefficients_by_term
+        Z = np.zeros(u.shape)
+        for a in (3, 2, 1, 0):
+            row = c[4 * a + 3][cell]
+            for b in (2, 1, 0):
+                row *= v
+                row += c[4 * a + b][cell]
+            Z *= u
+            Z += row
+        return Z
+
+    def in_range(self, Pr, Tr):
+        """Boolean mask of the points that lie inside the table"""
+        return (Pr >= self.Pr[0]) & (Pr <= self.Pr[-1]) & (Tr >= self.Tr[0]) & (Tr <= self.Tr[-1])
+
+    def evaluate(self, Pr, Tr):
+        """
+        Evaluates the z-factor at arbitrary (Pr, Tr) points. Points outside of the table are computed with the exact
+        solver (:func:`calc_z`).
+
+        Parameters
+        ----------
+        Pr : float or array_like
+            pseudo-reduced pressure, Pr (dimensionless)
+        Tr : float or array_like
+            pseudo-reduced temperature, Tr (dimensionless)
+
+        Returns
+        -------
+        float or ndarray
+            gas compressibility factor, :math:`Z` (dimensionless), with the broadcast shape of ``Pr`` and ``Tr``
+        """
+        Pr, Tr = np.broadcast_arrays(np.asarray(Pr, dtype=float), np.asarray(Tr, dtype=float))
+        shape = Pr.shape
+        Pr = Pr.ravel()
+        Tr = Tr.ravel()
+
+        inside = self.in_range(Pr, Tr)
+        if inside.all():
+            Z = self._interpolate(Pr, Tr)
+        else:
+            Z = np.empty(Pr.size)
+            Z[inside] = self._interpolate(Pr[inside], Tr[inside])
+            if self.zmodel is None:
+                Z[~inside] = np.nan
+            else:
+                Z[~inside] = calc_z(Pr=Pr[~inside], Tr=Tr[~inside], zmodel=self.zmodel, **self.calc_z_kwargs)
+
+        if len(shape) == 0:
+            return Z[0]
+        return Z.reshape(shape)
+
+    def _measure_error(self):
+        """
+        Measures the interpolation error against the exact solver at the quarter points of every cell, along both axes
+        (the 24 points of the 5 x 5 sub-grid of each cell that are not tabulated nodes). The midpoints alone miss the
+        largest error of the cells where z is strongly asymmetric, close to the critical region. The result is still
+        a sampled estimate, not a strict bound. Returns the errors on the sub-grid, shape (4 * n_Tr - 3, 4 * n_Pr - 3),
+        with zeros at the nodes.
+        """
+        def with_quarter_points(x):
+            fine = x[:-1, None] + np.diff(x)[:, None] * np.arange(_ERROR_SUBDIVISIONS) / _ERROR_SUBDIVISIONS
+            return np.append(fine.ravel(), x[-1])
+
+        Pr_grid, Tr_grid = np.meshgrid(with_quarter_points(self.Pr), with_quarter_points(self.Tr))
+        is_node = np.zeros(Pr_grid.shape, dtype=bool)
+        is_node[::_ERROR_SUBDIVISIONS, ::_ERROR_SUBDIVISIONS] = True
+        Pr_check = Pr_grid[~is_node]
+        Tr_check = Tr_grid[~is_node]
+
+        exact = calc_z(Pr=Pr_check, Tr=Tr_check, zmodel=self.zmodel, **self.calc_z_kwargs)
+        error = np.abs(self._interpolate(Pr_check, Tr_check) - exact)
+
+        idx = np.argmax(error)
+        self.max_error = error[idx]
+        self.max_error_location = (Pr_check[idx], Tr_check[idx])
+
+        errors = np.zeros(Pr_grid.shape)
+        errors[~is_node] = error
+        return errors
+
+    @classmethod
+    def adaptive(cls, zmodel='DAK', tol=1e-4, Pr_range=None, Tr_range=None, n_Pr=31, n_Tr=11, max_refinements=10,
+                 **kwargs):
+        """
+        Builds a table on a non-uniform grid, refined where the z-factor changes sharply. Starting from a coarse
+        uniform grid, the Pr and Tr intervals of every cell whose interpolation error is above ``tol`` are bisected,
+        until the error of every cell is below ``tol`` or after ``max_refinements`` rounds. A cell is bisected along
+        Pr, along Tr, or both, depending on whether its largest error is on its Pr edges, on its Tr edges or inside it.
+
+        The error is measured at the quarter points of every cell (see ``max_error``): it is a close estimate of the
+        error between these points, not a strict bound.
+
+        Parameters
+        ----------
+        zmodel, Pr_range, Tr_range, kwargs
+            same as :class:`ZTable`
+        tol : float
+            target maximum absolute interpolation error
+        n_Pr : int
+            number of :math:`P_r` grid points of the initial uniform grid
+        n_Tr : int
+            number of :math:`T_r` grid points of the initial uniform grid
+        max_refinements : int
+            maximum number of bisection rounds. If the tolerance is not met after them, ``converged`` is ``False`` and
+            ``max_error`` gives the accuracy actually reached
+        """
+        _get_z_model(model=zmodel)
+        if Pr_range is None:
+            Pr_range = MODEL_RANGES[zmodel]['Pr']
+        if Tr_range is None:
+            Tr_range = (TR_MIN.get(zmodel, 1.05), MODEL_RANGES[zmodel]['Tr'][1])
+        if n_Pr < 2 or n_Tr < 2:
+            raise ValueError("A ZTable needs at least 2 grid points along each axis")
+
+        table = cls.__new__(cls)
+        table.zmodel = zmodel
+        table.calc_z_kwargs = kwargs
+        table.Pr = np.linspace(Pr_range[0], Pr_range[1], n_Pr)
+        table.Tr = np.linspace(Tr_range[0], Tr_range[1], n_Tr)
+
+        for refinement in range(max_refinements + 1):
+            errors = table._build()
+            table.converged = bool(table.max_error <= tol)
+            if table.converged or refinement == max_refinements:
+                break
+
+            # per cell: largest error on its Pr edges, on its Tr edges, and inside it (corner nodes excluded)
+            n = _ERROR_SUBDIVISIONS
+            cells = np.lib.stride_tricks.sliding_window_view(errors, (n + 1, n + 1))[::n, ::n]
+            Pr_edges = cells[:, :, [0, n], 1:n].max(axis=(-2, -1))
+            Tr_edges = cells[:, :, 1:n, [0, n]].max(axis=(-2, -1))
+            center = cells[:, :, 1:n, 1:n].max(axis=(-2, -1))
+            failed = np.maximum(np.maximum(Pr_edges, Tr_edges), center) > tol
+            split_Pr = failed & ((Pr_edges >= Tr_edges) | (center > np.maximum(Pr_edges, Tr_edges)))
+            split_Tr = failed & ((Tr_edges >= Pr_edges) | (center > np.maximum(Pr_edges, Tr_edges)))
+
+            table.Pr = np.sort(np.concatenate([table.Pr, (table.Pr[:-1] + table.Pr[1:])[split_Pr.any(axis=0)] / 2]))
+            table.Tr = np.sort(np.concatenate([table.Tr, (table.Tr[:-1] + table.Tr[1:])[split_Tr.any(axis=1)] / 2]))
+        return table
+
+    @classmethod
+    def from_csv(cls, path, zmodel=None):
+        """
+        Builds a table from a wide z-factor grid CSV file, like ``output/z_factors.csv``, whose header row holds the
+        :math:`P_r` values and whose first column holds the :math:`T_r` values. Both axes must be increasing.
+
+        If ``zmodel`` is given, it is used for points outside of the table and to measure ``max_error``. Otherwise
+        points outside of the table evaluate to ``nan`` and ``max_error`` is ``None``.
+        """
+        Pr, Tr, z = read_csv_grid(path)
+        if not ((np.diff(Pr) > 0).all() and (np.diff(Tr) > 0).all()):
+            raise ValueError("ZTable.from_csv() requires increasing Pr and Tr axes")
+
+        table = cls.__new__(cls)
+        table.zmodel = zmodel
+        table.calc_z_kwargs = {}
+        table.Pr = Pr
+        table.Tr = Tr
+        table.z = z
+        table._build_coefficients()
+        table.converged = None
+        table.max_error = None
+        table.max_error_location = None
+        if zmodel is not None:
+            _get_z_model(model=zmodel)
+            table._measure_error()
+        return table
+
+    def save(self, path):
+        """
+        Writes the table to a binary grid file (see :func:`zgrid.write_grid`): the tabulated z-factors, their
+        derivatives and the bicubic coefficients, so that :meth:`load` does not rebuild anything.
+        """
+        metadata = {
+            'zmodel': self.zmodel,
+            'calc_z_kwargs': self.calc_z_kwargs,
+            'max_error': None if self.max_error is None else float(self.max_error),
+            'converged': self.converged,
+            'max_error_location': None if self.max_error_location is None else
+            [float(x) for x in self.max_error_location],
+        }
+        write_grid(path, self.Pr, self.Tr, {
+            'z': self.z,
+            'dz_dTr': self.dz_dTr,
+            'dz_dPr': self.dz_dPr,
+            'd2z_dTrdPr': self.d2z_dTrdPr,
+            'coefficients': self.coefficients.reshape(self.Tr.size - 1, self.Pr.size - 1, 16),
+        }, metadata=metadata)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Reads a table written by :meth:`save`. With ``mmap=True`` (default) the arrays are memory-mapped read-only:
+        worker processes loading the same file share one copy of the table, and loading is instantaneous whatever
+        its size.
+        """
+        grid = read_grid(path, mmap=mmap)
+        metadata = grid['metadata']
+
+        table = cls.__new__(cls)
+        table.zmodel = metadata.get('zmodel')
+        table.calc_z_kwargs = metadata.get('calc_z_kwargs') or {}
+        table.Pr = np.asarray(grid['Pr'])
+        table.Tr = np.asarray(grid['Tr'])
+        table.z = grid['z']
+        table.dz_dTr = grid['dz_dTr']
+        table.dz_dPr = grid['dz_dPr']
+        table.d2z_dTrdPr = grid['d2z_dTrdPr']
+        table._set_spacing()
+        table.coefficients = grid['coefficients'].reshape(table.Tr.size - 1, table.Pr.size - 1, 4, 4)
+        # views of the stored cell-major coefficients, no copy
+        table._coefficients_by_term = grid['coefficients'].reshape(-1, 16).T
+        table.max_error = metadata.get('max_error')
+        table.converged = metadata.get('converged')
+        location = metadata.get('max_error_location')
+        table.max_error_location = None if location is None else tuple(location)
+        return table
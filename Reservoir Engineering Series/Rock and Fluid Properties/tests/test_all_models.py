@@ -0,0 +1,36 @@
+import warnings
+import numpy as np
+import pytest
+from function.z_corellation_function import value as gc
+
+ZMODELS = ['DAK', 'hall_yarborough', 'londono', 'kareem', 'papay', 'beggs_brill']
+
+
+@pytest.mark.parametrize('Tr', [1.0, 1.02, 1.05, 1.06, 1.5, 2.5])
+def test_all_models_match_calc_z(Tr):
+    # includes near-critical isotherms, where a first guess can lead to a non-physical root
+    Pr = np.linspace(0.2, 30, 299)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # the explicit models out of their range
+        res = gc.calc_z_all_models(Pr=Pr, Tr=Tr, zmodels=ZMODELS)
+        for i, zmodel in enumerate(res['models']):
+            np.testing.assert_allclose(res['z'][i], gc.calc_z(Pr=Pr, Tr=Tr, zmodel=zmodel), rtol=0, atol=1e-8)
+    for i, zmodel in enumerate(ZMODELS[:3]):
+        assert (res['z'][i] > 0).all()
+
+
+def test_all_models_statistics():
+    Pr, Tr = np.meshgrid(np.linspace(0.2, 15, 20), np.linspace(1.05, 3, 5))
+    res = gc.calc_z_all_models(Pr=Pr, Tr=Tr)
+    assert res['models'] == ['DAK', 'hall_yarborough', 'londono', 'kareem']
+    assert res['z'].shape == (4,) + Pr.shape
+    np.testing.assert_allclose(res['mean'], res['z'].mean(axis=0))
+    np.testing.assert_allclose(res['spread'], res['z'].max(axis=0) - res['z'].min(axis=0))
+    assert not res['out_of_range'].any()
+
+
+def test_all_models_gas_state():
+    res = gc.calc_z_all_models(sg=0.7, T=75, P=2010, zmodels=['DAK'])
+    assert res['z'][0] == pytest.approx(gc.calc_z(sg=0.7, T=75, P=2010), abs=1e-12)
+    with pytest.raises(KeyError):
+        gc.calc_z_all_models(Pr=1.5, Tr=1.5, zmodels=['bogus'])
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+from function.z_corellation_function import value as gc
+
+
+@pytest.fixture(scope='module')
+def grid():
+    return np.meshgrid(np.linspace(0.2, 15, 300), np.linspace(1.05, 3, 100))
+
+
+@pytest.mark.parametrize('zmodel', ['DAK', 'hall_yarborough'])
+def test_bracketed_matches_newton(grid, zmodel):
+    Pr, Tr = grid
+    res = gc.calc_z_bracketed(Pr=Pr, Tr=Tr, zmodel=zmodel)
+    assert (res['status'] == 0).all()
+    np.testing.assert_allclose(res['z'], gc.calc_z(Pr=Pr, Tr=Tr, zmodel=zmodel), rtol=0, atol=1e-12)
+    assert np.abs(res['residual']).max() < 1e-12
+
+
+@pytest.mark.parametrize('zmodel', ['DAK', 'hall_yarborough', 'londono'])
+def test_bracketed_iterations(grid, zmodel):
+    # converged Newton/Halley steps must not fall back to bisection
+    Pr, Tr = grid
+    iterations = gc.calc_z_bracketed(Pr=Pr, Tr=Tr, zmodel=zmodel)['iterations']
+    assert iterations.mean() < 2.5
+    assert (iterations > 8).mean() < 1e-3
+
+
+def test_bracketed_explicit_model():
+    res = gc.calc_z_bracketed(Pr=np.array([1.5, 3.0]), Tr=np.array([1.5, 1.3]), zmodel='kareem')
+    np.testing.assert_array_equal(res['iterations'], 0)
+    np.testing.assert_array_equal(res['status'], 0)
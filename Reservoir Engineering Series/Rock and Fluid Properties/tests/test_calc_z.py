@@ -0,0 +1,79 @@
+import warnings
+import numpy as np
+import pytest
+from function.z_corellation_function import value as gc
+
+
+def test_array_matches_scalar():
+    Pr = np.array([0.5, 1.5, 3.0, 8.0, 20.0])
+    Tr = np.array([1.1, 1.5, 1.3, 2.0, 1.5])
+    np.testing.assert_allclose(gc.calc_z(Pr=Pr, Tr=Tr), [gc.calc_z(Pr=p, Tr=t) for p, t in zip(Pr, Tr)],
+                               rtol=0, atol=1e-10)
+
+
+def test_smart_guess_outside_its_range_is_silent():
+    # the smart guess model is only evaluated where (Pr, Tr) is in its range
+    Pr, Tr = np.meshgrid(np.linspace(0.01, 40, 200), np.linspace(1.0, 3.5, 100))
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', RuntimeWarning)
+        Z = gc.calc_z(Pr=Pr, Tr=Tr)
+    assert np.isfinite(Z).all()
+
+
+def test_fast_accuracy_within_tolerance():
+    rng = np.random.default_rng(0)
+    Pr = rng.uniform(0.2, 15, 5000)
+    Tr = rng.uniform(1.05, 3, 5000)
+    for fast_tol in [0.002, 0.005, 0.02]:
+        Z = gc.calc_z(Pr=Pr, Tr=Tr, accuracy='fast', fast_tol=fast_tol)
+        assert np.abs(Z - gc.calc_z(Pr=Pr, Tr=Tr)).max() <= fast_tol
+
+
+def test_fast_accuracy_requires_DAK():
+    # the accuracy envelopes are measured against DAK only
+    for zmodel in ['hall_yarborough', 'londono', 'kareem']:
+        with pytest.raises(KeyError):
+            gc.calc_z(Pr=1.5, Tr=1.5, zmodel=zmodel, accuracy='fast')
+    with pytest.raises(KeyError):
+        gc.calc_z(Pr=1.5, Tr=1.5, accuracy='bogus')
+
+
+@pytest.mark.parametrize('zmodel, Pr, z', [
+    # physical roots of the baseline secant solve, which the Halley iterations used to miss for negative roots
+    ('DAK', 1.196655518394649, 0.2025267879),
+    ('londono', 1.2963, 0.1987139280),
+    ('hall_yarborough', 1.09699, 0.2098840834),
+])
+def test_near_critical_scalar_roots(zmodel, Pr, z):
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', RuntimeWarning)
+        assert gc.calc_z(Pr=Pr, Tr=1.0, zmodel=zmodel) == pytest.approx(z, abs=1e-9)
+
+
+@pytest.mark.parametrize('zmodel', ['DAK', 'hall_yarborough', 'londono'])
+@pytest.mark.parametrize('Tr', [1.0, 1.02, 1.05, 1.06])
+def test_near_critical_isotherms_are_physical(zmodel, Tr):
+    # the vectorized and scalar solvers find the physical root found by the bracketed solver
+    Pr = np.linspace(0.2, 30, 3000)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', RuntimeWarning)
+        Z = gc.calc_z(Pr=Pr, Tr=Tr, zmodel=zmodel)
+    assert (Z > gc._z_lower_bound(zmodel, Pr, np.full(Pr.size, Tr))).all()
+    np.testing.assert_allclose(Z, gc.calc_z_bracketed(Pr=Pr, Tr=Tr, zmodel=zmodel)['z'], rtol=0, atol=1e-8)
+    np.testing.assert_allclose(Z[::100], [gc.calc_z(Pr=p, Tr=Tr, zmodel=zmodel) for p in Pr[::100]], rtol=0,
+                               atol=1e-8)
+
+
+@pytest.mark.parametrize('zmodel', ['DAK', 'hall_yarborough', 'londono'])
+@pytest.mark.parametrize('Pr_range, Tr_range', [
+    ((0.2, 14.9), (3.05, 4)),  # above the working range of the smart guess in Tr
+    ((0.01, 0.19), (1, 3)),  # below it in Pr
+    ((0.2, 14.9), (0.9, 0.99)),  # below the critical temperature
+])
+def test_out_of_range_guess_below_high_pressure(zmodel, Pr_range, Tr_range):
+    # these points start from z = 0.9, and must reach the same root as the bracketed solver
+    Pr, Tr = np.meshgrid(np.linspace(*Pr_range, 30), np.linspace(*Tr_range, 5))
+    np.testing.assert_allclose(gc.calc_z(Pr=Pr, Tr=Tr, zmodel=zmodel),
+                               gc.calc_z_bracketed(Pr=Pr, Tr=Tr, zmodel=zmodel)['z'], rtol=0, atol=1e-8)
+    np.testing.assert_allclose(gc.calc_z(Pr=Pr[0, 7], Tr=Tr[2, 0], zmodel=zmodel),
+                               gc.calc_z_bracketed(Pr=Pr[0, 7], Tr=Tr[2, 0], zmodel=zmodel)['z'], rtol=0, atol=1e-8)
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from function.z_corellation_function import value as gc
+
+
+@pytest.mark.parametrize('zmodel', ['DAK', 'hall_yarborough', 'londono'])
+def test_solvers_match_without_coefficients(monkeypatch, zmodel):
+    # precomputed temperature-only terms must not change the solution of any solver
+    Pr, Tr = np.meshgrid(np.linspace(0.2, 15, 60), np.linspace(1.05, 3, 20))
+
+    def solve():
+        return (gc.calc_z(Pr=Pr, Tr=Tr, zmodel=zmodel),
+                gc.calc_z_bracketed(Pr=Pr, Tr=Tr, zmodel=zmodel)['z'],
+                gc.calc_z_sweep(Pr=Pr[0], Tr=Tr[:, :1], zmodel=zmodel))
+
+    with_coeffs = solve()
+    monkeypatch.setattr(gc, '_model_args', lambda zmodel_str, Pr, Tr: (Pr, Tr))
+    for z, z_ref in zip(with_coeffs, solve()):
+        np.testing.assert_allclose(z, z_ref, rtol=0, atol=1e-14)
+
+
+@pytest.mark.parametrize('zmodel', ['DAK', 'hall_yarborough', 'londono'])
+def test_residuals_match_without_coefficients(zmodel):
+    z = np.linspace(0.3, 2, 50)
+    Pr = np.linspace(0.2, 15, 50)
+    Tr = np.linspace(1.05, 3, 50)
+    coeffs = gc.MODEL_COEFFICIENTS[zmodel](Tr)
+    for func in [gc.models[zmodel], gc.MODEL_DERIVATIVES[zmodel]['fprime'], gc.MODEL_DERIVATIVES[zmodel]['fprime2']]:
+        np.testing.assert_allclose(func(z, Pr, Tr, coeffs), func(z, Pr, Tr), rtol=1e-13, atol=1e-14)
+
+
+def test_londono_residual():
+    # the londono equation (SPE 75721), written out term by term
+    z = np.linspace(0.3, 2, 50)
+    Pr = np.linspace(0.2, 15, 50)
+    Tr = np.linspace(1.05, 3, 50)
+    A = [None, 0.3024696, -1.046964, -0.1078916, -0.7694186, 0.1965439, 0.6527819, -1.118884, 0.3951957, 0.09313593,
+         0.8483081, 0.7880011]
+    rho = 0.27 * Pr / (z * Tr)
+    rhs = 1 + (A[1] + A[2] / Tr + A[3] / Tr ** 3 + A[4] / Tr ** 4 + A[5] / Tr ** 5) * rho + \
+        (A[6] + A[7] / Tr + A[8] / Tr ** 2) * rho ** 2 - A[9] * (A[7] / Tr + A[8] / Tr ** 2) * rho ** 5 + \
+        A[10] * (1 + A[11] * rho ** 2) * rho ** 2 / Tr ** 3 * np.exp(-A[11] * rho ** 2)
+    np.testing.assert_allclose(gc.models['londono'](z, Pr, Tr), rhs - z, rtol=1e-12, atol=1e-13)
+
+
+@pytest.mark.parametrize('zmodel', ['DAK', 'hall_yarborough', 'londono'])
+def test_derivatives(zmodel):
+    z = np.linspace(0.3, 2, 50)
+    Pr = np.linspace(0.2, 15, 50)
+    Tr = np.linspace(1.05, 3, 50)
+    func, derivatives = gc.models[zmodel], gc.MODEL_DERIVATIVES[zmodel]
+    h = 1e-6
+    np.testing.assert_allclose(derivatives['fprime'](z, Pr, Tr), (func(z + h, Pr, Tr) - func(z - h, Pr, Tr)) / (2 * h),
+                               rtol=1e-6, atol=1e-7)
+    np.testing.assert_allclose(derivatives['fprime2'](z, Pr, Tr),
+                               (derivatives['fprime'](z + h, Pr, Tr) - derivatives['fprime'](z - h, Pr, Tr)) / (2 * h),
+                               rtol=1e-6, atol=1e-6)
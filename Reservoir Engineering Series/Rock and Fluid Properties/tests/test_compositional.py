@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from function.pseudocritical.compositional import calc_pseudo_critical, COMPONENT_PROPERTIES
+from function.pseudocritical.sutton_new import Sutton
+from function.z_corellation_function import value as gc
+
+COMPOSITION = np.array([
+    # N2,  CO2,  H2S,  C1,   C2,   C3,   iC4,  nC4,  iC5,  nC5,  C6,   C7+
+    [0.01, 0.02, 0.00, 0.85, 0.06, 0.03, 0.01, 0.01, 0.005, 0.003, 0.001, 0.001],
+    [0.02, 0.10, 0.07, 0.70, 0.06, 0.03, 0.01, 0.005, 0.002, 0.002, 0.001, 0.0],
+])
+
+
+@pytest.mark.parametrize('mixing', ['SBV', 'kay'])
+def test_pure_component(mixing):
+    Tc, Pc, MW = COMPONENT_PROPERTIES['C1']
+    props = calc_pseudo_critical([1.0], components=['C1'], mixing=mixing)
+    assert props['Tpc'] == pytest.approx(Tc, rel=1e-12)
+    assert props['Ppc'] == pytest.approx(Pc, rel=1e-12)
+    assert props['sg'] == pytest.approx(MW / 28.97, rel=1e-12)
+
+
+def test_kay_mixing():
+    X = np.array([0.2, 0.8])
+    props = calc_pseudo_critical(X, components=['C2', 'C1'], mixing='kay', acid_correction=False)
+    Tc, Pc, MW = np.array([COMPONENT_PROPERTIES['C2'], COMPONENT_PROPERTIES['C1']]).T
+    assert props['Tpc'] == pytest.approx(X @ Tc, rel=1e-12)
+    assert props['Ppc'] == pytest.approx(X @ Pc, rel=1e-12)
+    assert props['MW'] == pytest.approx(X @ MW, rel=1e-12)
+    assert props['Tpc_corrected'] == props['Tpc'] and props['e_correction'] == 0
+
+
+def test_samples_and_normalization():
+    props = calc_pseudo_critical(COMPOSITION, MW_plus=110, SG_plus=0.75)
+    for i, sample in enumerate(COMPOSITION):
+        single = calc_pseudo_critical(sample * 100, MW_plus=110, SG_plus=0.75)  # mol%
+        for key, value in single.items():
+            assert value == pytest.approx(props[key][i], rel=1e-12)
+
+    with pytest.raises(ValueError):
+        calc_pseudo_critical(COMPOSITION * 100, MW_plus=110, SG_plus=0.75, normalize=False)
+
+
+def test_acid_correction():
+    # Wichert-Aziz correction, as in the Sutton method
+    props = calc_pseudo_critical(COMPOSITION, MW_plus=110, SG_plus=0.75)
+    for i in range(len(COMPOSITION)):
+        expected = Sutton().calc_e_correction(H2S=COMPOSITION[i, 2], CO2=COMPOSITION[i, 1])
+        assert props['e_correction'][i] == pytest.approx(expected, rel=1e-12)
+
+
+def test_arguments():
+    with pytest.raises(TypeError):
+        calc_pseudo_critical(COMPOSITION)  # C7+ without MW_plus and SG_plus
+    with pytest.raises(KeyError):
+        calc_pseudo_critical([1.0], components=['C20'])
+    with pytest.raises(KeyError):
+        calc_pseudo_critical(COMPOSITION, MW_plus=110, SG_plus=0.75, mixing='bogus')
+    with pytest.raises(ValueError):
+        calc_pseudo_critical(COMPOSITION[:, :-1], MW_plus=110, SG_plus=0.75)
+
+
+def test_calc_z_compositional():
+    P = np.array([2000, 3500])
+    T = 180
+    props = calc_pseudo_critical(COMPOSITION, MW_plus=110, SG_plus=0.75)
+    Pr = (P + 14.7) / props['Ppc_corrected']
+    Tr = (T + 459.67) / props['Tpc_corrected']
+    Z = gc.calc_z_compositional(COMPOSITION, P=P, T=T, MW_plus=110, SG_plus=0.75)
+    np.testing.assert_allclose(Z, gc.calc_z(Pr=Pr, Tr=Tr), rtol=1e-12)
@@ -0,0 +1,22 @@
+import warnings
+import numpy as np
+import pytest
+from function.z_corellation_function import value as gc
+
+
+@pytest.mark.parametrize('zmodel', ['DAK', 'hall_yarborough', 'londono'])
+@pytest.mark.parametrize('Tr', [1.0, 1.02, 1.05, 1.5, 3.0])
+def test_density_solver_matches_newton(zmodel, Tr):
+    Pr = np.linspace(0.2, 30, 299)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', RuntimeWarning)
+        Z = gc.calc_z(Pr=Pr, Tr=Tr, zmodel=zmodel, solver='density')
+    assert (Z > 0).all()
+    np.testing.assert_allclose(Z, gc.calc_z(Pr=Pr, Tr=Tr, zmodel=zmodel), rtol=0, atol=1e-8)
+    assert gc.calc_z(Pr=Pr[150], Tr=Tr, zmodel=zmodel, solver='density') == pytest.approx(Z[150], abs=1e-8)
+
+
+def test_density_solver_arguments():
+    with pytest.raises(KeyError):
+        gc.calc_z(Pr=1.5, Tr=1.5, solver='secant')
+    assert gc.calc_z(Pr=1.5, Tr=1.5, zmodel='kareem', solver='density') == gc.calc_z(Pr=1.5, Tr=1.5, zmodel='kareem')
@@ -0,0 +1,59 @@
+import json
+import numpy as np
+from function.z_corellation_function import value as gc
+
+
+def test_instrument_counters():
+    with gc.instrument() as stats:
+        gc.calc_z(Pr=np.array([1.5, 3.0, 20.0]), Tr=np.array([1.5, 1.2, 4.0]))
+        gc.calc_z(Pr=1.5, Tr=1.5)
+        gc.calc_z(sg=0.7, P=2010, T=75)
+        gc.calc_z(Pr=1.5, Tr=1.5, zmodel='kareem')
+
+    models = stats.to_dict()['models']
+    dak = models['DAK']
+    counts = (dak['calls'], dak['points'], dak['smart_guess'], dak['out_of_range'], dak['extrapolated'])
+    assert counts == (3, 5, 4, 1, 1)
+    assert dak['failed'] == 0 and dak['iterations'] > 0
+    assert dak['mean_iterations'] == dak['iterations'] / dak['points']
+    assert dak['regions']['Pr[15, inf) Tr[2, inf)']['extrapolated'] == 1
+    assert sum(region['points'] for region in dak['regions'].values()) == 5
+    assert models['kareem']['points'] == 1 and models['kareem']['iterations'] == 0
+    assert 'pseudo_critical' in stats.to_dict()['timers']
+
+
+def test_instrument_scalar_and_array_agree():
+    Pr = np.linspace(0.5, 12, 20)
+    with gc.instrument() as vectorized:
+        gc.calc_z(Pr=Pr, Tr=1.3)
+    with gc.instrument() as scalar:
+        for Pr_ in Pr:
+            gc.calc_z(Pr=Pr_, Tr=1.3)
+    for name in ['points', 'smart_guess', 'out_of_range', 'failed']:
+        assert vectorized.to_dict()['models']['DAK'][name] == scalar.to_dict()['models']['DAK'][name]
+
+
+def test_instrument_retries_near_critical():
+    # near Tr = 1 some first guesses reach non-physical roots and are retried
+    with gc.instrument() as stats:
+        gc.calc_z(Pr=np.linspace(0.2, 30, 299), Tr=1.0)
+    assert stats.to_dict()['models']['DAK']['retries'] > 0
+    assert stats.to_dict()['models']['DAK']['failed'] == 0
+
+
+def test_instrument_scope(tmp_path):
+    stats = gc.ZSolverStats()
+    with gc.instrument(stats):
+        with gc.instrument() as inner:
+            gc.calc_z(Pr=1.5, Tr=1.5)
+        gc.calc_z(Pr=2.5, Tr=1.5)
+    gc.calc_z(Pr=3.5, Tr=1.5)  # not collected
+
+    assert inner.to_dict()['models']['DAK']['points'] == 1
+    assert stats.to_dict()['models']['DAK']['points'] == 1
+    assert gc._active_stats is None
+
+    text = stats.to_json(str(tmp_path / 'stats.json'))
+    assert json.loads(open(str(tmp_path / 'stats.json')).read()) == json.loads(text)
+    stats.reset()
+    assert stats.to_dict() == {'models': {}, 'timers': {}}
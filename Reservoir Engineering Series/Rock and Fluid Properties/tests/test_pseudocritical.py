@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from function.pseudocritical.piper_new import Piper, piper_reduced
+from function.pseudocritical.sutton_new import Sutton, sutton_reduced
+
+STATES = [
+    {'sg': 0.7, 'P': 2010, 'T': 75},
+    {'sg': 0.7, 'P': 2010, 'T': 75, 'H2S': 0.07, 'CO2': 0.1},
+    {'sg': 0.85, 'P': 5000, 'T': 220, 'H2S': 0.02, 'CO2': 0.05},
+]
+
+
+@pytest.mark.parametrize('state', STATES)
+def test_piper_reduced_matches_class(state):
+    impurities = {key: state[key] for key in ['H2S', 'CO2'] if key in state}
+    assert piper_reduced(**state)['Pr'] == pytest.approx(
+        Piper().calc_Pr(P=state['P'], sg=state['sg'], **impurities), rel=1e-14)
+    assert piper_reduced(**state)['Tr'] == pytest.approx(
+        Piper().calc_Tr(T=state['T'], sg=state['sg'], **impurities), rel=1e-14)
+
+
+@pytest.mark.parametrize('state', STATES)
+def test_sutton_reduced_matches_class(state):
+    impurities = {key: state[key] for key in ['H2S', 'CO2'] if key in state}
+    assert sutton_reduced(**state)['Pr'] == pytest.approx(
+        Sutton().calc_Pr(P=state['P'], sg=state['sg'], **impurities), rel=1e-14)
+    assert sutton_reduced(**state)['Tr'] == pytest.approx(
+        Sutton().calc_Tr(T=state['T'], sg=state['sg'], **impurities), rel=1e-14)
+
+
+def test_reduced_arrays():
+    sg = np.array([0.6, 0.7, 0.8])
+    P = np.array([[1000], [3000]])
+    for func in [piper_reduced, sutton_reduced]:
+        props = func(sg=sg, P=P, T=150, H2S=0.05, CO2=0.02)
+        assert props['Pr'].shape == (2, 3)
+        for i in range(2):
+            for j in range(3):
+                assert props['Pr'][i, j] == func(sg=sg[j], P=P[i, 0], T=150, H2S=0.05, CO2=0.02)['Pr']
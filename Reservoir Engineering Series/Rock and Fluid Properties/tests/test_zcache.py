@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from function.z_corellation_function import value as gc
+from function.z_corellation_function.zcache import ZCache, PseudoCriticalCache
+
+SOLVER_OPTIONS = [
+    {},
+    {'solver': 'bracketed'},
+    {'solver': 'density'},
+    {'accuracy': 'fast'},
+    {'accuracy': 'fast', 'fast_tol': 0.02},
+    {'solver': 'bracketed', 'accuracy': 'fast', 'fast_tol': 0.02},
+]
+
+
+@pytest.mark.parametrize('options', SOLVER_OPTIONS)
+def test_zcache_matches_calc_z(options):
+    cache = ZCache()
+    for Pr, Tr in [(0.3, 1.3), (1.5, 1.5), (3.0, 2.0), (8.0, 1.2), (20.0, 1.5)]:
+        assert cache.calc_z(Pr=Pr, Tr=Tr, **options) == gc.calc_z(Pr=Pr, Tr=Tr, **options)
+    for P in [500, 2010, 6000]:
+        state = dict(sg=0.7, P=P, T=75, H2S=0.07, CO2=0.1)
+        assert cache.calc_z(**state, **options) == gc.calc_z(**state, **options)
+    P = np.array([500, 2010, 6000])
+    np.testing.assert_array_equal(cache.calc_z(sg=0.7, P=P, T=75, **options), gc.calc_z(sg=0.7, P=P, T=75, **options))
+
+
+def test_zcache_keys_on_solver_options():
+    cache = ZCache()
+    assert cache.calc_z(Pr=0.3, Tr=1.3) == gc.calc_z(Pr=0.3, Tr=1.3)
+    assert cache.calc_z(Pr=0.3, Tr=1.3, accuracy='fast') == gc.calc_z(Pr=0.3, Tr=1.3, accuracy='fast')
+    assert cache.stats()['z']['hits'] == 0
+    with pytest.raises(KeyError):
+        cache.calc_z(Pr=0.3, Tr=1.3, solver='bogus')
+    with pytest.raises(KeyError):
+        cache.calc_z(sg=0.7, P=2010, T=75, accuracy='bogus')
+
+
+def test_zcache_hits():
+    cache = ZCache()
+    Z = cache.calc_z(sg=0.7, P=2010, T=75, solver='bracketed')
+    assert cache.calc_z(sg=0.7, P=2010, T=75, solver='bracketed') == Z
+    stats = cache.stats()
+    assert stats['pseudo_critical']['hits'] == 1 and stats['z']['hits'] == 1
+
+
+@pytest.mark.parametrize('options', SOLVER_OPTIONS)
+def test_pseudo_critical_cache_matches_calc_z(options):
+    cache = PseudoCriticalCache()
+    P = np.array([1000, 2000, 3000, 4000])
+    np.testing.assert_allclose(cache.calc_z(sg=0.7, P=P, T=180, H2S=0.07, CO2=0.1, **options),
+                               gc.calc_z(sg=0.7, P=P, T=180, H2S=0.07, CO2=0.1, **options), rtol=1e-12)
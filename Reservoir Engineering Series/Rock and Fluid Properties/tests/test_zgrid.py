@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from function.z_corellation_function.zgrid import read_grid, write_grid, read_csv_grid, convert_csv_grid
+from function.z_corellation_function.ztable import ZTable
+
+
+@pytest.fixture
+def grid_path(tmp_path):
+    Pr = np.linspace(0.2, 15, 40)
+    Tr = np.linspace(1.05, 3, 10)
+    grids = {'z': np.outer(Tr, Pr), 'cells': np.arange(9 * 39 * 2, dtype=float).reshape(9, 39, 2)}
+    path = str(tmp_path / 'grid.npz')
+    write_grid(path, Pr, Tr, grids, metadata={'zmodel': 'DAK'})
+    return path, Pr, Tr, grids
+
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_grid_round_trip(grid_path, mmap):
+    path, Pr, Tr, grids = grid_path
+    grid = read_grid(path, mmap=mmap)
+    np.testing.assert_array_equal(grid['Pr'], Pr)
+    np.testing.assert_array_equal(grid['Tr'], Tr)
+    for name, values in grids.items():
+        np.testing.assert_array_equal(grid[name], values)
+        assert isinstance(grid[name], np.memmap) == mmap
+    assert grid['metadata']['zmodel'] == 'DAK'
+    assert grid['metadata']['grids'] == ['z', 'cells']
+    # the file is also a plain .npz archive
+    with np.load(path) as data:
+        np.testing.assert_array_equal(data['z'], grids['z'])
+
+
+def test_grid_checks(tmp_path):
+    Pr = np.linspace(0.2, 15, 4)
+    Tr = np.linspace(1.05, 3, 3)
+    with pytest.raises(ValueError):
+        write_grid(str(tmp_path / 'g.npz'), Pr, Tr, {'z': np.zeros((4, 3))})
+    with pytest.raises(KeyError):
+        write_grid(str(tmp_path / 'g.npz'), Pr, Tr, {'Pr': np.zeros((3, 4))})
+    with pytest.raises(ValueError):
+        write_grid(str(tmp_path / 'g.npz'), Pr[:, None], Tr, {'z': np.zeros((3, 4))})
+
+
+def test_csv_grid(tmp_path):
+    Pr = np.array([0.5, 1.0, 2.0])
+    Tr = np.array([1.2, 1.5])
+    z = np.array([[0.9, 0.8, 0.7], [0.95, 0.9, 0.85]])
+    path = str(tmp_path / 'grid.csv')
+    np.savetxt(path, np.vstack([np.concatenate([[np.nan], Pr]), np.column_stack([Tr, z])]), delimiter=',')
+
+    Pr_, Tr_, z_ = read_csv_grid(path)
+    np.testing.assert_array_equal(Pr_, Pr)
+    np.testing.assert_array_equal(Tr_, Tr)
+    np.testing.assert_array_equal(z_, z)
+
+    convert_csv_grid(path, str(tmp_path / 'grid.npz'), metadata={'zmodel': 'DAK'})
+    grid = read_grid(str(tmp_path / 'grid.npz'))
+    np.testing.assert_array_equal(grid['z'], z)
+    assert grid['metadata']['source'] == path
+
+
+def test_table_save_load(tmp_path):
+    table = ZTable(zmodel='DAK', n_Pr=100, n_Tr=30)
+    table.save(str(tmp_path / 'z.npz'))
+    Pr = np.linspace(0.2, 30, 500)
+    Tr = np.linspace(1.05, 3, 500)
+    for mmap in [True, False]:
+        loaded = ZTable.load(str(tmp_path / 'z.npz'), mmap=mmap)
+        np.testing.assert_array_equal(loaded(Pr, Tr), table(Pr, Tr))
+        assert (loaded.zmodel, loaded.max_error) == (table.zmodel, table.max_error)
+    # points outside of the table go through calc_z
+    assert loaded(0.1, 1.5) == table(0.1, 1.5)
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from function.z_corellation_function import value as gc
+from function.z_corellation_function import zinverse
+
+
+def _random_states(zmodel, n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    ranges = gc.MODEL_RANGES[zmodel]
+    return rng.uniform(*ranges['Pr'], n), rng.uniform(*ranges['Tr'], n)
+
+
+@pytest.mark.parametrize('zmodel', ['DAK', 'hall_yarborough', 'londono'])
+def test_round_trip_implicit_models(zmodel):
+    Pr, Tr = _random_states(zmodel)
+    Z = gc.calc_z(Pr=Pr, Tr=Tr, zmodel=zmodel)
+    Pr_back, Z_back = zinverse.calc_Pr_from_Pr_over_z(Pr / Z, Tr, zmodel=zmodel)
+    np.testing.assert_allclose(Pr_back, Pr, rtol=1e-7)
+    np.testing.assert_allclose(Z_back, Z, rtol=1e-7)
+
+
+@pytest.mark.parametrize('zmodel', ['kareem', 'papay', 'beggs_brill'])
+def test_round_trip_explicit_models(zmodel):
+    # targets reached at more than one Pr of an isotherm are nan, every other one is solved back
+    Pr, Tr = _random_states(zmodel)
+    Z = gc.models[zmodel](Pr=Pr, Tr=Tr)
+    Pr_back, Z_back = zinverse.calc_Pr_from_Pr_over_z(Pr / Z, Tr, zmodel=zmodel)
+    solved = np.isfinite(Pr_back)
+    np.testing.assert_allclose(Pr_back[solved], Pr[solved], rtol=1e-9)
+    np.testing.assert_allclose(Z_back[solved], Z[solved], rtol=1e-9)
+    assert solved.mean() > 0.5
+
+
+def test_ambiguous_targets_are_nan():
+    # papay reaches Pr / z = 6 twice on the isotherm Tr = 1.5 (below and above its maximum of ~7.29)
+    Pr, Z = zinverse.calc_Pr_from_Pr_over_z(np.array([0, 2.0, 6.0]), 1.5, zmodel='papay')
+    np.testing.assert_allclose(Pr[:2], [0, 2.0 * gc.papay(Pr=Pr[1], Tr=1.5)])
+    assert np.isnan(Pr[2]) and np.isnan(Z[2])
+
+
+def test_explicit_model_failures_are_nan():
+    # this kareem target used to abort the whole batch
+    Pr_z = np.array([2.245 / gc.kareem(Pr=2.245, Tr=1.017), 3.0])
+    Pr, Z = zinverse.calc_Pr_from_Pr_over_z(Pr_z, np.array([1.017, 1.5]), zmodel='kareem')
+    np.testing.assert_allclose(Pr, [2.245, Pr_z[1] * gc.kareem(Pr=Pr[1], Tr=1.5)])
+
+    Pr, Z = zinverse.calc_Pr_from_Pr_over_z(Pr_z, np.array([1.017, 1.5]), zmodel='kareem',
+                                            newton_kwargs={'maxiter': 1})
+    assert np.isnan(Pr).all() and np.isnan(Z).all()
+
+
+def test_p_over_z_round_trip():
+    P = np.array([500., 1750., 3000., 6000.])
+    Z = gc.calc_z(sg=0.7, P=P, T=180, H2S=0.07, CO2=0.1)
+    res = zinverse.calc_P_from_p_over_z((P + 14.7) / Z, sg=0.7, T=180, H2S=0.07, CO2=0.1)
+    np.testing.assert_allclose(res['P'], P, rtol=1e-9)
+    np.testing.assert_allclose(res['z'], Z, rtol=1e-9)
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from function.z_corellation_function import value as gc
+from function.z_corellation_function.zparallel import calc_z_parallel
+
+
+@pytest.fixture(scope='module')
+def grid():
+    return np.meshgrid(np.linspace(0.2, 15, 100), np.linspace(1.05, 3, 60))
+
+
+@pytest.mark.parametrize('options', [
+    {},
+    {'zmodel': 'hall_yarborough', 'solver': 'bracketed'},
+    {'zmodel': 'londono', 'solver': 'density', 'newton_kwargs': {'maxiter': 100}},
+    {'accuracy': 'fast', 'fast_tol': 0.02},
+    {'zmodel': 'kareem'},
+])
+def test_parallel_matches_serial(grid, options):
+    # small shards, so that the pool is used for this grid
+    Pr, Tr = grid
+    np.testing.assert_array_equal(calc_z_parallel(Pr=Pr, Tr=Tr, n_jobs=2, shard_size=1000, **options),
+                                  gc.calc_z(Pr=Pr, Tr=Tr, **options))
+
+
+def test_parallel_gas_state():
+    P = np.linspace(100, 8000, 3000)
+    np.testing.assert_array_equal(
+        calc_z_parallel(sg=0.7, P=P, T=180, H2S=0.07, CO2=0.1, n_jobs=2, shard_size=1000, solver='bracketed'),
+        gc.calc_z(sg=0.7, P=P, T=180, H2S=0.07, CO2=0.1, solver='bracketed'))
+
+
+def test_parallel_rejects_unsupported_options(grid):
+    Pr, Tr = grid
+    with pytest.raises(KeyError):
+        calc_z_parallel(Pr=Pr, Tr=Tr, n_jobs=2, solver='bogus')
+    with pytest.raises(KeyError):
+        calc_z_parallel(Pr=Pr, Tr=Tr, n_jobs=2, zmodel='londono', accuracy='fast')
+    with pytest.raises(TypeError):
+        calc_z_parallel(Pr=Pr, Tr=Tr, n_jobs=2, ps_props=True)
+    with pytest.raises(KeyError):
+        gc.calc_z_isotherms(n_jobs=2, solver='bogus')
+
+
+def test_isotherms_parallel_matches_serial():
+    Trs = np.linspace(1.05, 3, 40)
+    serial = gc.calc_z_isotherms(Trs=Trs, solver='bracketed')
+    parallel = gc.calc_z_isotherms(Trs=Trs, n_jobs=2, solver='bracketed')
+    for Tr in Trs:
+        np.testing.assert_array_equal(parallel[Tr]['Z'], serial[Tr]['Z'])
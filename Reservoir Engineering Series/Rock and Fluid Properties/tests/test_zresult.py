@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from function.z_corellation_function import value as gc
+from function.z_corellation_function.zresult import ZResult, Z_RESULT_DTYPE, Z_RESULT_FIELDS, make_z_result
+
+
+@pytest.mark.parametrize('pmodel', ['piper', 'sutton'])
+def test_scalar_record(pmodel):
+    res = gc.calc_z(sg=0.7, T=75, P=2010, H2S=0.07, CO2=0.1, pmodel=pmodel, ps_props='record')
+    props = gc.calc_z(sg=0.7, T=75, P=2010, H2S=0.07, CO2=0.1, pmodel=pmodel, ps_props=True)
+    assert isinstance(res, ZResult)
+    assert not hasattr(res, '__dict__')
+    for name in Z_RESULT_FIELDS:
+        expected = props.get(name)
+        if expected is None:
+            assert np.isnan(getattr(res, name))
+        else:
+            assert getattr(res, name) == pytest.approx(expected, rel=1e-14)
+    assert res.to_dict()['z'] == res.z
+    assert res == ZResult(**res.to_dict())
+
+
+def test_batch_record():
+    P = np.array([[1000, 2010, 5000]])
+    T = np.array([[75], [150]])
+    res = gc.calc_z(sg=0.7, T=T, P=P, ps_props='record')
+    props = gc.calc_z(sg=0.7, T=T, P=P, ps_props=True)
+    assert res.dtype == Z_RESULT_DTYPE
+    assert res.shape == (2, 3)
+    # the record broadcasts every property to the shape of z
+    for name in ['z', 'Tpc', 'Ppc', 'Tr', 'Pr']:
+        np.testing.assert_allclose(res[name], np.broadcast_to(props[name], (2, 3)), rtol=1e-14)
+    assert np.isnan(res['e_correction']).all()
+
+
+def test_make_z_result():
+    res = make_z_result(0.9, {'Tr': 1.5, 'Pr': 2.0, 'Tpc_corrected': 350.0, 'J': None})
+    assert (res.z, res.Tr, res.Pr) == (0.9, 1.5, 2.0)
+    assert np.isnan(res.J) and np.isnan(res.Tpc)
+    assert res != make_z_result(0.8, {'Tr': 1.5, 'Pr': 2.0})
+
+    batch = make_z_result(np.array([0.9, 0.8]), {'Tpc': 350.0})
+    np.testing.assert_array_equal(batch['Tpc'], [350.0, 350.0])
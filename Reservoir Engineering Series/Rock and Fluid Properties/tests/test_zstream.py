@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+from function.z_corellation_function import value as gc
+from function.z_corellation_function.zstream import calc_z_stream
+
+
+@pytest.fixture
+def gas_states(tmp_path):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'sg': rng.uniform(0.6, 0.9, 250),
+        'whp_psig': rng.uniform(100, 8000, 250),
+        'T': rng.uniform(60, 300, 250),
+        'H2S': rng.uniform(0, 0.1, 250),
+        'CO2': rng.uniform(0, 0.1, 250),
+    })
+    path = str(tmp_path / 'states.csv')
+    df.to_csv(path, index=False)
+    return df, path
+
+
+def test_stream_matches_calc_z(gas_states, tmp_path):
+    df, path = gas_states
+    output = str(tmp_path / 'z.csv')
+    summary = calc_z_stream(path, output, chunksize=100, columns={'P': 'whp_psig'}, ps_props=True)
+    assert summary == {'rows': 250, 'chunks': 3, 'failed': 0}
+
+    out = pd.read_csv(output)
+    expected = gc.calc_z(sg=df['sg'].to_numpy(), P=df['whp_psig'].to_numpy(), T=df['T'].to_numpy(),
+                         H2S=df['H2S'].to_numpy(), CO2=df['CO2'].to_numpy(), ps_props=True)
+    np.testing.assert_allclose(out['z'], expected['z'], rtol=1e-14)
+    for key in ['Tpc', 'Ppc', 'Tr', 'Pr']:
+        np.testing.assert_allclose(out[key], expected[key], rtol=1e-14)
+    assert list(out.columns[:5]) == list(df.columns)
+
+
+def test_stream_errors(gas_states, tmp_path):
+    df, path = gas_states
+    df.loc[120, 'T'] = np.nan
+    df.to_csv(path, index=False)
+
+    with pytest.raises(RuntimeError, match='in rows 100 to 199'):
+        calc_z_stream(path, str(tmp_path / 'z.csv'), chunksize=100, columns={'P': 'whp_psig'})
+
+    summary = calc_z_stream(path, str(tmp_path / 'z.csv'), chunksize=100, columns={'P': 'whp_psig'},
+                            keep_columns=False, errors='coerce')
+    assert summary['failed'] == 1
+    out = pd.read_csv(str(tmp_path / 'z.csv'))
+    assert list(out.columns) == ['z']
+    assert np.isnan(out['z'][120]) and np.isfinite(out['z'].drop(120)).all()
+
+
+def test_stream_arguments(gas_states, tmp_path):
+    _, path = gas_states
+    with pytest.raises(KeyError):
+        calc_z_stream(path, str(tmp_path / 'z.csv'), errors='ignore')
+    with pytest.raises(KeyError):
+        calc_z_stream(path, str(tmp_path / 'z.csv'), columns={'pressure': 'whp_psig'})
+    with pytest.raises(ValueError):
+        calc_z_stream(path, str(tmp_path / 'z.xlsx'), columns={'P': 'whp_psig'})
+
+
+def test_stream_parquet(gas_states, tmp_path):
+    pytest.importorskip('pyarrow')
+    _, path = gas_states
+    calc_z_stream(path, str(tmp_path / 'z.parquet'), chunksize=100, columns={'P': 'whp_psig'})
+    summary = calc_z_stream(str(tmp_path / 'z.parquet'), str(tmp_path / 'z2.csv'), chunksize=60,
+                            columns={'P': 'whp_psig'})
+    assert summary['chunks'] == 5
+    np.testing.assert_allclose(pd.read_csv(str(tmp_path / 'z2.csv'))['z'],
+                               pd.read_parquet(str(tmp_path / 'z.parquet'))['z'])
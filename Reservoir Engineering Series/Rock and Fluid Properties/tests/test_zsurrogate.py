@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from function.z_corellation_function import value as gc
+from function.z_corellation_function.zsurrogate import ZSurrogate, TR_MIN
+
+
+@pytest.mark.parametrize('zmodel', ['DAK', 'hall_yarborough', 'londono'])
+def test_surrogate_meets_tol(zmodel):
+    surrogate = ZSurrogate(zmodel=zmodel, tol=1e-5)
+    assert surrogate.converged
+    assert surrogate.max_error <= 1e-5
+    assert surrogate.Tr_breaks[0] == TR_MIN[zmodel]
+
+    rng = np.random.default_rng(0)
+    Pr = rng.uniform(surrogate.Pr_breaks[0], surrogate.Pr_breaks[-1], 50000)
+    Tr = rng.uniform(surrogate.Tr_breaks[0], surrogate.Tr_breaks[-1], 50000)
+    assert np.abs(surrogate(Pr, Tr) - gc.calc_z(Pr=Pr, Tr=Tr, zmodel=zmodel)).max() <= 1e-5
+
+
+def test_surrogate_evaluate():
+    surrogate = ZSurrogate(zmodel='DAK', tol=1e-4)
+    Pr, Tr = np.meshgrid(np.linspace(0.2, 30, 7), np.array([1.5, 2.5]))
+    assert surrogate(Pr, Tr).shape == Pr.shape
+    assert np.ndim(surrogate(1.5, 1.5)) == 0
+    # points outside of the fitted domain go through calc_z
+    assert surrogate(1.5, 1.0) == gc.calc_z(Pr=1.5, Tr=1.0)
+    assert surrogate(35.0, 1.5) == gc.calc_z(Pr=35.0, Tr=1.5)
+
+
+def test_surrogate_not_converged():
+    surrogate = ZSurrogate(zmodel='DAK', tol=1e-10, max_refinements=1)
+    assert not surrogate.converged
+    assert surrogate.max_error > 1e-10
+
+
+def test_surrogate_arguments():
+    with pytest.raises(KeyError):
+        ZSurrogate(zmodel='kareem')
+    with pytest.raises(KeyError):
+        ZSurrogate(zmodel='bogus')
+    with pytest.raises(ValueError):
+        ZSurrogate(degree=0)
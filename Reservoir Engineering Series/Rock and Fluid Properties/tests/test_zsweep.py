@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from function.z_corellation_function import value as gc
+
+
+@pytest.mark.parametrize('zmodel', ['DAK', 'hall_yarborough', 'londono'])
+@pytest.mark.parametrize('Tr', [1.0, 1.02, 1.05])
+@pytest.mark.parametrize('extrapolate', [True, False])
+def test_near_critical_sweep(zmodel, Tr, extrapolate):
+    # a non-physical root must not be carried down the isotherm as the warm start
+    Pr = np.linspace(0.2, 30, 299)
+    Z = gc.calc_z_sweep(Pr=Pr, Tr=Tr, zmodel=zmodel, extrapolate=extrapolate)
+    assert (Z > 0).all()
+    np.testing.assert_allclose(Z, gc.calc_z_bracketed(Pr=Pr, Tr=Tr, zmodel=zmodel)['z'], rtol=0, atol=1e-8)
+
+
+def test_sweep_matches_calc_z():
+    Pr = np.linspace(0.2, 30, 299)
+    Tr = gc.QUICKSTART_TRS[:, None]
+    np.testing.assert_allclose(gc.calc_z_sweep(Pr=Pr, Tr=Tr), gc.calc_z(Pr=Pr, Tr=Tr), rtol=0, atol=1e-8)
+
+
+def test_isobar_sweep():
+    Tr = np.linspace(3, 1.05, 100)
+    np.testing.assert_allclose(gc.calc_z_sweep(Pr=2.5, Tr=Tr, zmodel='londono'),
+                               gc.calc_z(Pr=2.5, Tr=Tr, zmodel='londono'), rtol=0, atol=1e-8)
+
+
+def test_sweep_gas_state():
+    P = np.linspace(500, 8000, 4)
+    np.testing.assert_allclose(gc.calc_z_sweep(sg=0.7, T=180, P=P), gc.calc_z(sg=0.7, T=180, P=P), rtol=0, atol=1e-8)
+
+
+def test_sweep_explicit_model():
+    Pr = np.linspace(0.2, 15, 50)
+    np.testing.assert_array_equal(gc.calc_z_sweep(Pr=Pr, Tr=1.5, zmodel='kareem'), gc.kareem(Pr=Pr, Tr=1.5))
+    with pytest.raises(KeyError):
+        gc.calc_z_sweep(Pr=Pr, Tr=1.5, zmodel='kareem', newton_kwargs={'maxiter': 10})
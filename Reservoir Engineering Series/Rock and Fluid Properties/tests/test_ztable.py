@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from function.z_corellation_function import value as gc
+from function.z_corellation_function import ztable
+from function.z_corellation_function.ztable import ZTable
+
+
+@pytest.mark.parametrize('zmodel', ['DAK', 'hall_yarborough', 'londono', 'kareem'])
+def test_default_table(zmodel):
+    table = ZTable(zmodel=zmodel, n_Pr=300, n_Tr=100)
+    assert (table.z > 0).all()
+    assert table.max_error < 0.01
+
+    rng = np.random.default_rng(0)
+    Pr = rng.uniform(table.Pr[0], table.Pr[-1], 1000)
+    Tr = rng.uniform(table.Tr[0], table.Tr[-1], 1000)
+    np.testing.assert_allclose(table(Pr, Tr), gc.calc_z(Pr=Pr, Tr=Tr, zmodel=zmodel), rtol=0, atol=table.max_error * 2)
+
+
+def test_non_physical_table(monkeypatch):
+    def calc_z(Pr, Tr, **kwargs):
+        z = np.ones(np.shape(Pr))
+        z[0, 0] = -0.1
+        return z
+
+    monkeypatch.setattr(ztable, 'calc_z', calc_z)
+    with pytest.raises(ValueError):
+        ZTable(n_Pr=10, n_Tr=5)
+
+
+@pytest.mark.parametrize('zmodel', ['DAK', 'hall_yarborough', 'londono'])
+def test_adaptive_table_meets_tol(zmodel):
+    table = ZTable.adaptive(zmodel=zmodel, tol=1e-4)
+    assert table.converged
+    assert table.max_error <= 1e-4
+
+    # the error is measured at the quarter points of the cells: it holds between them too
+    rng = np.random.default_rng(1)
+    Pr = rng.uniform(table.Pr[0], table.Pr[-1], 100000)
+    Tr = rng.uniform(table.Tr[0], table.Tr[-1], 100000)
+    assert np.abs(table(Pr, Tr) - gc.calc_z(Pr=Pr, Tr=Tr, zmodel=zmodel)).max() <= 1e-4
+
+
+def test_adaptive_table_not_converged(tmp_path):
+    table = ZTable.adaptive(zmodel='londono', tol=1e-6, max_refinements=2)
+    assert not table.converged
+    assert table.max_error > 1e-6
+
+    table.save(str(tmp_path / 'z.npz'))
+    assert ZTable.load(str(tmp_path / 'z.npz')).converged is False
+    assert ZTable(n_Pr=10, n_Tr=5).converged is None